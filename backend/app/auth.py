@@ -1,5 +1,4 @@
 from functools import lru_cache
-from threading import Lock
 import time
 from typing import Any
 
@@ -7,14 +6,14 @@ import jwt
 from fastapi import Header
 from jwt import PyJWKClient
 
+from app.cache import TTLCache
 from app.config import settings
 from app.exceptions import AuthenticationRequiredError
 
 _TOKEN_CACHE_MAX_SIZE = 512
 _TOKEN_CACHE_MAX_TTL_SECONDS = 60
 _TOKEN_CACHE_EXP_SKEW_SECONDS = 15
-_token_claims_cache: dict[str, tuple[dict[str, Any], float]] = {}
-_token_claims_cache_lock = Lock()
+_token_claims_cache = TTLCache("auth_token_claims", _TOKEN_CACHE_MAX_SIZE)
 
 
 def _extract_bearer_token(authorization: str | None) -> str:
@@ -44,18 +43,15 @@ def _configured_issuer() -> str:
 
 
 def _get_cached_claims(token: str) -> dict[str, Any] | None:
-    now = time.time()
-    with _token_claims_cache_lock:
-        cached = _token_claims_cache.get(token)
-        if not cached:
-            return None
-        claims, cache_expiry = cached
-        token_exp = claims.get("exp")
-        token_exp_ts = float(token_exp) if isinstance(token_exp, (int, float)) else 0.0
-        if now >= cache_expiry or (token_exp_ts and now >= token_exp_ts):
-            _token_claims_cache.pop(token, None)
-            return None
-        return claims
+    claims = _token_claims_cache.get(token)
+    if not claims:
+        return None
+    token_exp = claims.get("exp")
+    token_exp_ts = float(token_exp) if isinstance(token_exp, (int, float)) else 0.0
+    if token_exp_ts and time.time() >= token_exp_ts:
+        _token_claims_cache.invalidate(token)
+        return None
+    return claims
 
 
 def _cache_claims(token: str, claims: dict[str, Any]) -> None:
@@ -71,13 +67,7 @@ def _cache_claims(token: str, claims: dict[str, Any]) -> None:
     if ttl <= 0:
         return
 
-    with _token_claims_cache_lock:
-        if len(_token_claims_cache) >= _TOKEN_CACHE_MAX_SIZE:
-            # Simple FIFO-like eviction from insertion order.
-            oldest_key = next(iter(_token_claims_cache), None)
-            if oldest_key:
-                _token_claims_cache.pop(oldest_key, None)
-        _token_claims_cache[token] = (claims, now + ttl)
+    _token_claims_cache.set(token, claims, ttl)
 
 
 def _verified_claims(token: str) -> dict[str, Any]:
@@ -8,17 +8,39 @@ _BACKEND_DIR = Path(__file__).resolve().parents[1]
 class Settings(BaseSettings):
     clerk_issuer: str | None = None
     clerk_audience: str | None = None
+    store_backend: str = "convex"  # "convex" or "sqlite"
+    store_sqlite_path: str = "escrow_store.db"
+    store_escrow_cache_ttl_seconds: float = 1.0
+    store_escrow_cache_max_entries: int = 10000
     convex_internal_api_key: str | None = None
     escrow_secret_key_encryption_key: str | None = None
     solana_rpc_url: str = "https://api.devnet.solana.com"
+    solana_rpc_urls: list[str] = []
+    solana_rpc_probe_interval_seconds: float = 10.0
+    solana_rpc_max_slot_lag: int = 50
+    solana_rpc_send_fanout: int = 3
+    solana_ws_url: str | None = None
+    solana_subscriptions_enabled: bool = False
+    solana_ws_max_account_subscriptions: int = 1000
     solana_network_guard_enabled: bool = True
     allow_mainnet: bool = False
     escrow_funding_min_lamports: int = 1
     funding_signature_scan_limit: int = 10
+    funding_signature_scan_max_pages: int = 20
     funding_signature_rescan_cooldown_seconds: float = 4.0
+    deposit_watcher_enabled: bool = True
+    deposit_watcher_interval_seconds: float = 5.0
+    long_poll_max_wait_seconds: float = 25.0
+    long_poll_recheck_seconds: float = 3.0
     solana_balance_cache_ttl_seconds: float = 2.0
     solana_tx_status_cache_ttl_seconds: float = 2.0
     solana_signatures_cache_ttl_seconds: float = 3.0
+    solana_balance_cache_max_entries: int = 10000
+    solana_tx_status_cache_max_entries: int = 20000
+    solana_signatures_cache_max_entries: int = 5000
+    solana_tx_facts_cache_path: str = "solana_tx_facts.db"
+    solana_tx_facts_cache_max_entries: int = 50000
+    settlement_confirm_timeout_seconds: float = 90.0
     escrow_join_ttl_minutes: int = 7 * 24 * 60
     escrow_invite_ttl_minutes: int = 24 * 60
     app_title: str = "Secure Shuttle Escrow API"
@@ -4,6 +4,13 @@ class EscrowNotFoundError(Exception):
         self.detail = f"Escrow {escrow_id} not found"
 
 
+class EscrowVersionConflictError(Exception):
+    def __init__(self, escrow_id: str, expected_version: int):
+        self.escrow_id = escrow_id
+        self.expected_version = expected_version
+        self.detail = f"Escrow {escrow_id} was changed by another request; reload and retry"
+
+
 class SolanaRPCError(Exception):
     def __init__(self, message: str):
         self.detail = f"Solana RPC error: {message}"
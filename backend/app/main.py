@@ -1,3 +1,4 @@
+import asyncio
 from contextlib import asynccontextmanager
 import logging
 
@@ -5,11 +6,13 @@ from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
 
+from app import cache, store
 from app.config import settings
 from app.exceptions import (
     AuthenticationRequiredError,
     EscrowCancelledError,
     EscrowNotFoundError,
+    EscrowVersionConflictError,
     ForbiddenActionError,
     InsufficientFundsError,
     InvalidAddressError,
@@ -18,7 +21,7 @@ from app.exceptions import (
     SolanaRPCError,
 )
 from app.routers import escrows, transactions
-from app.services import solana_service
+from app.services import escrow_service, solana_rpc_pool, solana_service, solana_subscriptions
 
 logger = logging.getLogger(__name__)
 
@@ -26,7 +29,29 @@ logger = logging.getLogger(__name__)
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     _enforce_network_guard()
+    solana_service.start_rpc_probes()
+    await solana_service.start_subscriptions()
+    await escrow_service.start_settlement_confirmers()
+    escrow_service.start_deposit_watcher()
+    derived_backfill = asyncio.create_task(_backfill_escrow_derived())
     yield
+    derived_backfill.cancel()
+    await escrow_service.stop_deposit_watcher()
+    await escrow_service.stop_settlement_confirmers()
+    await solana_subscriptions.stop()
+    await solana_service.aclose()
+    await store.aclose()
+
+
+async def _backfill_escrow_derived() -> None:
+    """Index and count escrows created before participant rows and counters existed."""
+    try:
+        written = await store.backfill_escrow_derived()
+    except Exception as exc:
+        logger.warning("Escrow participant/count backfill failed: %s", exc)
+        return
+    if written:
+        logger.info("Backfilled %d escrow participant/count rows", written)
 
 
 app = FastAPI(
@@ -55,6 +80,11 @@ async def escrow_not_found_handler(request: Request, exc: EscrowNotFoundError):
     return JSONResponse(status_code=404, content={"detail": exc.detail})
 
 
+@app.exception_handler(EscrowVersionConflictError)
+async def escrow_version_conflict_handler(request: Request, exc: EscrowVersionConflictError):
+    return JSONResponse(status_code=409, content={"detail": exc.detail})
+
+
 @app.exception_handler(SolanaRPCError)
 async def solana_rpc_error_handler(request: Request, exc: SolanaRPCError):
     return JSONResponse(status_code=502, content={"detail": exc.detail})
@@ -104,11 +134,13 @@ async def runtime_error_handler(request: Request, exc: RuntimeError):
 
 # Health check
 @app.get("/api/v1/health")
-def health():
+async def health():
     return {
         "status": "ok",
-        "solana_rpc": settings.solana_rpc_url,
+        "solana_rpc": solana_rpc_pool.redact_url(settings.solana_rpc_url),
         "cluster": solana_service.cluster_from_rpc_url(settings.solana_rpc_url),
+        "solana_rpc_endpoints": solana_service.rpc_endpoints(),
+        "caches": cache.stats(),
     }
 
 
@@ -116,8 +148,11 @@ def _enforce_network_guard() -> None:
     if not settings.solana_network_guard_enabled:
         return
 
-    cluster = solana_service.cluster_from_rpc_url(settings.solana_rpc_url)
-    if cluster == "mainnet" and not settings.allow_mainnet:
+    clusters = {
+        solana_service.cluster_from_rpc_url(url)
+        for url in solana_service.rpc_endpoint_urls()
+    }
+    if "mainnet" in clusters and not settings.allow_mainnet:
         raise RuntimeError(
             "Refusing startup with mainnet RPC while allow_mainnet is false."
         )
@@ -1,6 +1,7 @@
 from typing import Optional
 
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Response
+from fastapi.responses import StreamingResponse
 
 from app.auth import get_actor_is_admin, get_actor_user_id
 from app.exceptions import ForbiddenActionError
@@ -22,6 +23,7 @@ from app.schemas.escrow import (
     EscrowCreate,
     EscrowListOut,
     EscrowOut,
+    EscrowSummaryOut,
     FundingSyncOut,
     FundingSyncRequest,
     InviteAcceptRequest,
@@ -32,6 +34,7 @@ from app.schemas.escrow import (
     ServiceCompleteRequest,
     ReleaseOut,
     ReleaseRequest,
+    SettlementJobOut,
 )
 from app.schemas.transaction import TransactionOut
 from app.services import escrow_service, solana_service
@@ -40,16 +43,18 @@ router = APIRouter(prefix="/escrows", tags=["Escrows"])
 
 
 @router.post("/", response_model=EscrowOut, status_code=201)
-def create_escrow(data: EscrowCreate, actor_user_id: str = Depends(get_actor_user_id)):
-    return escrow_service.create_escrow(data, actor_user_id)
+async def create_escrow(data: EscrowCreate, actor_user_id: str = Depends(get_actor_user_id)):
+    return await escrow_service.create_escrow(data, actor_user_id)
 
 
 @router.get("/", response_model=EscrowListOut)
-def list_escrows(
+async def list_escrows(
     status: Optional[str] = Query(None),
     scope: str = Query("mine", pattern="^(mine|all)$"),
     limit: int = Query(50, ge=1, le=200),
-    offset: int = Query(0, ge=0),
+    cursor: Optional[str] = Query(None),
+    include_balances: bool = Query(False),
+    include_total: bool = Query(True),
     actor_user_id: str = Depends(get_actor_user_id),
     actor_is_admin: bool = Depends(get_actor_is_admin),
 ):
@@ -57,49 +62,104 @@ def list_escrows(
         raise ForbiddenActionError("Only admins can request all escrows.")
 
     mine_only = scope != "all"
-    total, items = escrow_service.list_escrows(
-        status,
-        limit,
-        offset,
-        actor_user_id,
-        mine_only,
-    )
-    return EscrowListOut(total=total, items=items)
+    try:
+        page = await escrow_service.list_escrows(
+            status,
+            limit,
+            cursor,
+            actor_user_id,
+            mine_only,
+            include_balances,
+            include_total,
+        )
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+    return EscrowListOut(**page)
+
+
+@router.get("/summary", response_model=EscrowSummaryOut)
+async def get_escrow_summary(
+    scope: str = Query("mine", pattern="^(mine|all)$"),
+    actor_user_id: str = Depends(get_actor_user_id),
+    actor_is_admin: bool = Depends(get_actor_is_admin),
+):
+    if scope == "all" and not actor_is_admin:
+        raise ForbiddenActionError("Only admins can request all escrows.")
+    return await escrow_service.get_escrow_summary(actor_user_id, mine_only=scope != "all")
 
 
 @router.get("/{escrow_id}", response_model=EscrowOut)
-def get_escrow(escrow_id: str, actor_user_id: str = Depends(get_actor_user_id)):
-    return escrow_service.get_escrow(escrow_id, actor_user_id)
+async def get_escrow(escrow_id: str, actor_user_id: str = Depends(get_actor_user_id)):
+    return await escrow_service.get_escrow(escrow_id, actor_user_id)
 
 
 @router.get("/public/{public_id}", response_model=EscrowOut)
-def get_escrow_by_public_id(
+async def get_escrow_by_public_id(
     public_id: str,
     actor_user_id: str = Depends(get_actor_user_id),
 ):
-    return escrow_service.get_escrow_by_public_id(public_id, actor_user_id)
+    return await escrow_service.get_escrow_by_public_id(public_id, actor_user_id)
+
+
+_EVENT_SCHEMAS = {
+    "escrow": EscrowOut,
+    "transaction": TransactionOut,
+    "dispute_message": DisputeMessageOut,
+}
+
+
+@router.get("/public/{public_id}/events")
+async def stream_escrow_events(
+    public_id: str,
+    last_event_id: Optional[str] = Header(None),
+    actor_user_id: str = Depends(get_actor_user_id),
+    actor_is_admin: bool = Depends(get_actor_is_admin),
+):
+    events = await escrow_service.open_escrow_event_stream(
+        public_id,
+        actor_user_id,
+        actor_is_admin,
+        last_event_id,
+    )
+
+    async def _sse():
+        yield "retry: 3000\n\n"
+        async for event in events:
+            if event is None:
+                yield ": keepalive\n\n"
+                continue
+            payload = _EVENT_SCHEMAS[event.kind].model_validate(event.data).model_dump_json()
+            yield f"id: {event.id}\nevent: {event.kind}\ndata: {payload}\n\n"
+
+    return StreamingResponse(
+        _sse(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
 
 
 @router.patch("/{escrow_id}", response_model=EscrowOut)
-def update_escrow(
+async def update_escrow(
     escrow_id: str,
     data: EscrowUpdate,
     actor_user_id: str = Depends(get_actor_user_id),
 ):
-    return escrow_service.update_escrow(escrow_id, data, actor_user_id)
+    return await escrow_service.update_escrow(escrow_id, data, actor_user_id)
 
 
 @router.delete("/{escrow_id}", response_model=CancelOut)
-def cancel_escrow(
+async def cancel_escrow(
     escrow_id: str,
+    response: Response,
     return_funds: bool = Query(False),
     refund_address: Optional[str] = Query(None),
     settlement: str = Query("none", pattern="^(none|refund_sender|pay_recipient)$"),
     payout_address: Optional[str] = Query(None),
+    async_settlement: bool = Query(False),
     actor_user_id: str = Depends(get_actor_user_id),
     actor_is_admin: bool = Depends(get_actor_is_admin),
 ):
-    escrow, refund_sig = escrow_service.cancel_escrow(
+    escrow, refund_sig = await escrow_service.cancel_escrow(
         escrow_id,
         actor_user_id,
         return_funds,
@@ -107,21 +167,24 @@ def cancel_escrow(
         settlement,
         payout_address,
         actor_is_admin,
+        async_settlement,
     )
-    return CancelOut(cancelled=True, refund_signature=refund_sig, escrow=escrow)
+    return _cancel_out(escrow, refund_sig, response)
 
 
 @router.delete("/public/{public_id}/cancel", response_model=CancelOut)
-def cancel_escrow_by_public_id(
+async def cancel_escrow_by_public_id(
     public_id: str,
+    response: Response,
     return_funds: bool = Query(False),
     refund_address: Optional[str] = Query(None),
     settlement: str = Query("none", pattern="^(none|refund_sender|pay_recipient)$"),
     payout_address: Optional[str] = Query(None),
+    async_settlement: bool = Query(False),
     actor_user_id: str = Depends(get_actor_user_id),
     actor_is_admin: bool = Depends(get_actor_is_admin),
 ):
-    escrow, refund_sig = escrow_service.cancel_escrow_by_public_id(
+    escrow, refund_sig = await escrow_service.cancel_escrow_by_public_id(
         public_id,
         actor_user_id,
         return_funds,
@@ -129,14 +192,15 @@ def cancel_escrow_by_public_id(
         settlement,
         payout_address,
         actor_is_admin,
+        async_settlement,
     )
-    return CancelOut(cancelled=True, refund_signature=refund_sig, escrow=escrow)
+    return _cancel_out(escrow, refund_sig, response)
 
 
 @router.get("/{escrow_id}/balance", response_model=BalanceOut)
-def get_balance(escrow_id: str, actor_user_id: str = Depends(get_actor_user_id)):
-    escrow = escrow_service.get_escrow(escrow_id, actor_user_id)
-    lamports = solana_service.get_balance(escrow["public_key"])
+async def get_balance(escrow_id: str, actor_user_id: str = Depends(get_actor_user_id)):
+    escrow = await escrow_service.get_escrow(escrow_id, actor_user_id)
+    lamports = await solana_service.get_balance(escrow["public_key"])
     return BalanceOut(
         public_key=escrow["public_key"],
         balance_lamports=lamports,
@@ -145,37 +209,41 @@ def get_balance(escrow_id: str, actor_user_id: str = Depends(get_actor_user_id))
 
 
 @router.post("/{escrow_id}/release", response_model=ReleaseOut)
-def release_funds(
+async def release_funds(
     escrow_id: str,
     data: ReleaseRequest,
+    response: Response,
     actor_user_id: str = Depends(get_actor_user_id),
 ):
-    result = escrow_service.release_funds(
+    result = await escrow_service.release_funds(
         escrow_id,
         actor_user_id,
         data.recipient_address,
         data.amount_lamports,
         data.idempotency_key,
+        data.async_settlement,
     )
+    if result.get("job_id"):
+        response.status_code = 202
     return ReleaseOut(**result)
 
 
 @router.post("/public/{public_id}/claim-role", response_model=EscrowOut)
-def claim_role(
+async def claim_role(
     public_id: str,
     data: ClaimRoleRequest,
     actor_user_id: str = Depends(get_actor_user_id),
 ):
-    return escrow_service.claim_role(public_id, actor_user_id, data.role, data.join_token)
+    return await escrow_service.claim_role(public_id, actor_user_id, data.role, data.join_token)
 
 
 @router.post("/public/{public_id}/recipient-address", response_model=EscrowOut)
-def set_recipient_address(
+async def set_recipient_address(
     public_id: str,
     data: RecipientAddressRequest,
     actor_user_id: str = Depends(get_actor_user_id),
 ):
-    return escrow_service.set_recipient_address(
+    return await escrow_service.set_recipient_address(
         public_id,
         actor_user_id,
         data.join_token,
@@ -184,39 +252,46 @@ def set_recipient_address(
 
 
 @router.post("/public/{public_id}/sync-funding", response_model=FundingSyncOut)
-def sync_funding(
+async def sync_funding(
     public_id: str,
     data: FundingSyncRequest,
     actor_user_id: str = Depends(get_actor_user_id),
 ):
-    return escrow_service.sync_funding(public_id, actor_user_id, data.join_token)
+    return await escrow_service.sync_funding(
+        public_id,
+        actor_user_id,
+        data.join_token,
+        wait_seconds=data.wait_seconds,
+        known_version=data.known_version,
+        known_status=data.known_status,
+    )
 
 
 @router.post("/public/{public_id}/service-complete", response_model=EscrowOut)
-def mark_service_complete(
+async def mark_service_complete(
     public_id: str,
     data: ServiceCompleteRequest,
     actor_user_id: str = Depends(get_actor_user_id),
 ):
-    return escrow_service.mark_service_complete(public_id, actor_user_id, data.join_token)
+    return await escrow_service.mark_service_complete(public_id, actor_user_id, data.join_token)
 
 
 @router.post("/public/{public_id}/dispute", response_model=EscrowOut)
-def open_dispute(
+async def open_dispute(
     public_id: str,
     data: DisputeRequest,
     actor_user_id: str = Depends(get_actor_user_id),
 ):
-    return escrow_service.open_dispute(public_id, actor_user_id, data.join_token, data.reason)
+    return await escrow_service.open_dispute(public_id, actor_user_id, data.join_token, data.reason)
 
 
 @router.get("/public/{public_id}/dispute/messages", response_model=list[DisputeMessageOut])
-def list_dispute_messages(
+async def list_dispute_messages(
     public_id: str,
     actor_user_id: str = Depends(get_actor_user_id),
     actor_is_admin: bool = Depends(get_actor_is_admin),
 ):
-    return escrow_service.list_dispute_messages_by_public_id(
+    return await escrow_service.list_dispute_messages_by_public_id(
         public_id,
         actor_user_id,
         actor_is_admin,
@@ -224,13 +299,13 @@ def list_dispute_messages(
 
 
 @router.post("/public/{public_id}/dispute/messages", response_model=DisputeMessageOut)
-def create_dispute_message(
+async def create_dispute_message(
     public_id: str,
     data: DisputeMessageCreate,
     actor_user_id: str = Depends(get_actor_user_id),
     actor_is_admin: bool = Depends(get_actor_is_admin),
 ):
-    return escrow_service.create_dispute_message_by_public_id(
+    return await escrow_service.create_dispute_message_by_public_id(
         public_id,
         actor_user_id,
         data.body,
@@ -240,12 +315,12 @@ def create_dispute_message(
 
 
 @router.post("/public/{public_id}/dispute/upload-url", response_model=DisputeUploadUrlOut)
-def create_dispute_upload_url(
+async def create_dispute_upload_url(
     public_id: str,
     actor_user_id: str = Depends(get_actor_user_id),
     actor_is_admin: bool = Depends(get_actor_is_admin),
 ):
-    upload_url = escrow_service.create_dispute_upload_url_by_public_id(
+    upload_url = await escrow_service.create_dispute_upload_url_by_public_id(
         public_id,
         actor_user_id,
         actor_is_admin,
@@ -254,20 +329,20 @@ def create_dispute_upload_url(
 
 
 @router.get("/public/{public_id}/ratings", response_model=EscrowRatingStateOut)
-def get_rating_state(
+async def get_rating_state(
     public_id: str,
     actor_user_id: str = Depends(get_actor_user_id),
 ):
-    return escrow_service.get_rating_state_by_public_id(public_id, actor_user_id)
+    return await escrow_service.get_rating_state_by_public_id(public_id, actor_user_id)
 
 
 @router.post("/public/{public_id}/ratings", response_model=EscrowRatingOut)
-def submit_rating(
+async def submit_rating(
     public_id: str,
     data: EscrowRatingCreateRequest,
     actor_user_id: str = Depends(get_actor_user_id),
 ):
-    return escrow_service.submit_rating_by_public_id(
+    return await escrow_service.submit_rating_by_public_id(
         public_id,
         actor_user_id,
         data.score,
@@ -276,48 +351,76 @@ def submit_rating(
 
 
 @router.post("/public/{public_id}/release", response_model=ReleaseOut)
-def release_funds_by_public_id(
+async def release_funds_by_public_id(
     public_id: str,
     data: ReleaseRequest,
+    response: Response,
     actor_user_id: str = Depends(get_actor_user_id),
 ):
-    result = escrow_service.release_funds_by_public_id(
+    result = await escrow_service.release_funds_by_public_id(
         public_id,
         actor_user_id,
         data.recipient_address,
         data.amount_lamports,
         data.idempotency_key,
+        data.async_settlement,
     )
+    if result.get("job_id"):
+        response.status_code = 202
     return ReleaseOut(**result)
 
 
 @router.post("/public/{public_id}/invite", response_model=InviteCreateOut)
-def create_invite(public_id: str, actor_user_id: str = Depends(get_actor_user_id)):
-    return escrow_service.create_invite(public_id, actor_user_id)
+async def create_invite(public_id: str, actor_user_id: str = Depends(get_actor_user_id)):
+    return await escrow_service.create_invite(public_id, actor_user_id)
 
 
 @router.post("/accept-invite", response_model=EscrowOut)
-def accept_invite(
+async def accept_invite(
     data: InviteAcceptRequest,
     actor_user_id: str = Depends(get_actor_user_id),
 ):
-    return escrow_service.accept_invite(data.invite_token, actor_user_id)
+    return await escrow_service.accept_invite(data.invite_token, actor_user_id)
 
 
 @router.post("/public/{public_id}/mark-funded", response_model=EscrowOut)
-def mark_funded(public_id: str, actor_user_id: str = Depends(get_actor_user_id)):
-    return escrow_service.mark_funded(public_id, actor_user_id)
+async def mark_funded(public_id: str, actor_user_id: str = Depends(get_actor_user_id)):
+    return await escrow_service.mark_funded(public_id, actor_user_id)
 
 
 @router.get("/{escrow_id}/transactions", response_model=list[TransactionOut])
-def get_escrow_transactions(
+async def get_escrow_transactions(
     escrow_id: str,
     actor_user_id: str = Depends(get_actor_user_id),
 ):
-    escrow_service.get_escrow(escrow_id, actor_user_id)  # verify exists and access
-    return escrow_service.list_transactions(escrow_id, actor_user_id)
+    # list_transactions checks that the escrow exists and the actor can view it.
+    return await escrow_service.list_transactions(escrow_id, actor_user_id)
 
 
 @router.post("/{escrow_id}/reconcile", response_model=ReconcileOut)
-def reconcile_escrow(escrow_id: str, actor_user_id: str = Depends(get_actor_user_id)):
-    return escrow_service.reconcile_escrow(escrow_id, actor_user_id)
+async def reconcile_escrow(escrow_id: str, actor_user_id: str = Depends(get_actor_user_id)):
+    return await escrow_service.reconcile_escrow(escrow_id, actor_user_id)
+
+
+@router.get("/{escrow_id}/settlements/{job_id}", response_model=SettlementJobOut)
+async def get_settlement_job(
+    escrow_id: str,
+    job_id: str,
+    actor_user_id: str = Depends(get_actor_user_id),
+):
+    job = await escrow_service.get_settlement_job(escrow_id, job_id, actor_user_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Settlement job not found")
+    return job
+
+
+def _cancel_out(escrow: dict, refund_sig: Optional[str], response: Response) -> CancelOut:
+    if escrow["status"] in escrow_service.PENDING_SETTLEMENT_STATES and refund_sig:
+        response.status_code = 202
+        return CancelOut(
+            cancelled=False,
+            refund_signature=refund_sig,
+            escrow=escrow,
+            job_id=refund_sig,
+        )
+    return CancelOut(cancelled=True, refund_signature=refund_sig, escrow=escrow)
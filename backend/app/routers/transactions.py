@@ -1,36 +1,44 @@
 from fastapi import APIRouter, Depends, HTTPException
 
 from app.auth import get_actor_user_id
+from app.config import settings
 from app.exceptions import ForbiddenActionError
 from app.schemas.transaction import (
     TransactionCreate,
     TransactionOut,
+    TransactionStatusBatchRequest,
     TransactionStatusOut,
     TransactionStatusRequest,
 )
 from app.services import escrow_service, solana_service
-from app import store
 
 router = APIRouter(prefix="/transactions", tags=["Transactions"])
 
 
 @router.post("/status", response_model=TransactionStatusOut)
-def check_transaction_status(
+async def check_transaction_status(
     data: TransactionStatusRequest,
     actor_user_id: str = Depends(get_actor_user_id),
 ):
-    result = solana_service.get_transaction_status(data.signature)
+    if data.wait_seconds > 0 and data.known_status:
+        result = await solana_service.wait_for_status_change(
+            data.signature,
+            data.known_status,
+            min(data.wait_seconds, settings.long_poll_max_wait_seconds),
+        )
+    else:
+        result = await solana_service.get_transaction_status(data.signature)
 
     # If an escrow_id was provided, update the local record if it exists
     if data.escrow_id:
-        escrow_service.get_escrow(data.escrow_id, actor_user_id)
-        tx = escrow_service.get_transaction_by_signature(data.signature)
+        await escrow_service.get_escrow(data.escrow_id, actor_user_id)
+        tx = await escrow_service.get_transaction_by_signature(data.signature)
         if tx:
             if tx.get("escrow_id") != data.escrow_id:
                 raise ForbiddenActionError(
                     "Signature does not belong to the provided escrow."
                 )
-            store.update_transaction(
+            await escrow_service.update_transaction(
                 data.signature,
                 {
                     "status": result["status"],
@@ -38,29 +46,63 @@ def check_transaction_status(
                 },
             )
 
-    return TransactionStatusOut(
-        signature=data.signature,
-        status=result["status"],
-        slot=result["slot"],
-        confirmations=result["confirmations"],
-        err=result["err"],
-    )
+    return _status_out(data.signature, result)
+
+
+@router.post("/statuses", response_model=list[TransactionStatusOut])
+async def check_transaction_statuses(
+    data: TransactionStatusBatchRequest,
+    actor_user_id: str = Depends(get_actor_user_id),
+):
+    results = await solana_service.get_transaction_statuses(data.signatures)
+
+    # If an escrow_id was provided, refresh the escrow's local records in one pass
+    if data.escrow_id:
+        local_by_signature = {
+            tx["signature"]: tx
+            for tx in await escrow_service.list_transactions(data.escrow_id, actor_user_id)
+        }
+        for signature, result in results.items():
+            tx = local_by_signature.get(signature)
+            if not tx or result["status"] == "not_found":
+                continue
+            if tx.get("status") == result["status"] and tx.get("raw_error") == result["err"]:
+                continue
+            await escrow_service.update_transaction(
+                signature,
+                {
+                    "status": result["status"],
+                    "raw_error": result["err"],
+                },
+            )
+
+    return [_status_out(signature, results[signature]) for signature in data.signatures]
 
 
 @router.post("/record", response_model=TransactionOut, status_code=201)
-def record_transaction(
+async def record_transaction(
     data: TransactionCreate,
     actor_user_id: str = Depends(get_actor_user_id),
 ):
     # Verify the escrow exists
-    escrow_service.get_escrow(data.escrow_id, actor_user_id)
-    return escrow_service.record_transaction(data)
+    await escrow_service.get_escrow(data.escrow_id, actor_user_id)
+    return await escrow_service.record_transaction(data)
 
 
 @router.get("/{signature}", response_model=TransactionOut)
-def get_transaction(signature: str, actor_user_id: str = Depends(get_actor_user_id)):
-    tx = escrow_service.get_transaction_by_signature(signature)
+async def get_transaction(signature: str, actor_user_id: str = Depends(get_actor_user_id)):
+    tx = await escrow_service.get_transaction_by_signature(signature)
     if not tx:
         raise HTTPException(status_code=404, detail="Transaction not found in local database")
-    escrow_service.get_escrow(tx["escrow_id"], actor_user_id)
+    await escrow_service.get_escrow(tx["escrow_id"], actor_user_id)
     return tx
+
+
+def _status_out(signature: str, result: dict) -> TransactionStatusOut:
+    return TransactionStatusOut(
+        signature=signature,
+        status=result["status"],
+        slot=result["slot"],
+        confirmations=result["confirmations"],
+        err=result["err"],
+    )
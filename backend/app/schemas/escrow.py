@@ -1,7 +1,7 @@
 from datetime import datetime
 from typing import Literal, Optional
 
-from pydantic import BaseModel, ConfigDict
+from pydantic import BaseModel, ConfigDict, Field
 
 
 class EscrowCreate(BaseModel):
@@ -47,13 +47,24 @@ class EscrowOut(BaseModel):
     updated_at: datetime
     join_token: Optional[str] = None
     claim_link: Optional[str] = None
+    balance_lamports: Optional[int] = None
 
     model_config = ConfigDict(from_attributes=True)
 
 
 class EscrowListOut(BaseModel):
-    total: int
     items: list[EscrowOut]
+    # Pass back as ?cursor= for the next page; None on the last page.
+    next_cursor: Optional[str] = None
+    # Counted up to a cap; total_exact is False when the cap was reached.
+    total: Optional[int] = None
+    total_exact: bool = True
+
+
+class EscrowSummaryOut(BaseModel):
+    scope: Literal["mine", "all"]
+    total: int
+    by_status: dict[str, int]
 
 
 class BalanceOut(BaseModel):
@@ -66,6 +77,7 @@ class ReleaseRequest(BaseModel):
     recipient_address: Optional[str] = None
     amount_lamports: Optional[int] = None
     idempotency_key: Optional[str] = None
+    async_settlement: bool = False
 
 
 class ReleaseOut(BaseModel):
@@ -75,12 +87,25 @@ class ReleaseOut(BaseModel):
     amount_lamports: int
     status: str
     commitment_target: Optional[str] = None
+    job_id: Optional[str] = None
 
 
 class CancelOut(BaseModel):
     cancelled: bool
     refund_signature: Optional[str]
     escrow: EscrowOut
+    job_id: Optional[str] = None
+
+
+class SettlementJobOut(BaseModel):
+    job_id: str
+    escrow_id: str
+    tx_type: str
+    state: Literal["pending", "confirmed", "failed"]
+    transaction_status: str
+    escrow_status: str
+    last_valid_block_height: Optional[int] = None
+    error: Optional[str] = None
 
 
 class ReconcileOut(BaseModel):
@@ -111,6 +136,10 @@ class RecipientAddressRequest(BaseModel):
 
 class FundingSyncRequest(BaseModel):
     join_token: Optional[str] = None
+    # Long-poll: hold the request until the escrow differs from what the client has.
+    wait_seconds: float = Field(default=0.0, ge=0)
+    known_version: Optional[int] = None
+    known_status: Optional[str] = None
 
 
 class FundingSyncOut(BaseModel):
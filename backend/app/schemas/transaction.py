@@ -1,7 +1,7 @@
 from datetime import datetime
 from typing import Optional
 
-from pydantic import BaseModel, ConfigDict
+from pydantic import BaseModel, ConfigDict, Field
 
 
 class TransactionCreate(BaseModel):
@@ -43,6 +43,14 @@ class TransactionOut(BaseModel):
 class TransactionStatusRequest(BaseModel):
     signature: str
     escrow_id: Optional[str] = None
+    # Long-poll: hold the request until the status differs from known_status.
+    wait_seconds: float = Field(default=0.0, ge=0)
+    known_status: Optional[str] = None
+
+
+class TransactionStatusBatchRequest(BaseModel):
+    signatures: list[str] = Field(min_length=1, max_length=256)
+    escrow_id: Optional[str] = None
 
 
 class TransactionStatusOut(BaseModel):
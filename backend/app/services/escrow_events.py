@@ -0,0 +1,163 @@
+"""
+In-process publish/subscribe for escrow changes.
+
+escrow_service publishes every escrow update, transaction write and dispute
+message here; the SSE endpoint subscribes per escrow. Each escrow keeps a short
+history so a reconnecting client can resume from its Last-Event-ID, and
+long-poll requests can wait for the next event on an escrow. Event ids
+embed a per-process boot token, so ids from before a restart are recognised as
+unknown and the client gets a fresh snapshot instead.
+"""
+
+import asyncio
+from collections import OrderedDict, deque
+import itertools
+import secrets
+from typing import Optional
+
+_HISTORY_PER_ESCROW = 100
+_MAX_ESCROW_HISTORIES = 5000
+_SUBSCRIBER_QUEUE_SIZE = 256
+
+
+class EscrowEvent:
+    __slots__ = ("seq", "id", "kind", "data")
+
+    def __init__(self, seq: int, event_id: str, kind: str, data: dict):
+        self.seq = seq
+        self.id = event_id
+        self.kind = kind
+        self.data = data
+
+
+class Subscription:
+    def __init__(self, escrow_id: str):
+        self.escrow_id = escrow_id
+        self.queue: asyncio.Queue[EscrowEvent] = asyncio.Queue(maxsize=_SUBSCRIBER_QUEUE_SIZE)
+        # Set when the consumer fell too far behind; it should reconnect and resume.
+        self.overflowed = False
+
+
+class _History:
+    def __init__(self):
+        self.events: deque[EscrowEvent] = deque(maxlen=_HISTORY_PER_ESCROW)
+        self.dropped_through = 0
+
+
+class EscrowEventBus:
+    def __init__(self):
+        self._boot = secrets.token_hex(4)
+        self._seq = itertools.count(1)
+        self._last_seq = 0
+        self._histories: OrderedDict[str, _History] = OrderedDict()
+        self._subscribers: dict[str, set[Subscription]] = {}
+        # One future per escrow shared by every long-poll waiter; resolved on publish.
+        self._waiters: dict[str, asyncio.Future] = {}
+        self._waiter_counts: dict[str, int] = {}
+        # Newest seq among histories evicted to bound memory.
+        self._evicted_through = 0
+
+    def publish(self, escrow_id: str, kind: str, data: dict) -> EscrowEvent:
+        seq = self._last_seq = next(self._seq)
+        event = EscrowEvent(seq, f"{self._boot}-{seq}", kind, data)
+
+        history = self._histories.get(escrow_id)
+        if history is None:
+            history = self._histories[escrow_id] = _History()
+            while len(self._histories) > _MAX_ESCROW_HISTORIES:
+                _, evicted = self._histories.popitem(last=False)
+                if evicted.events:
+                    self._evicted_through = max(self._evicted_through, evicted.events[-1].seq)
+        else:
+            self._histories.move_to_end(escrow_id)
+        if len(history.events) == history.events.maxlen:
+            history.dropped_through = history.events[0].seq
+        history.events.append(event)
+
+        for subscription in self._subscribers.get(escrow_id, ()):
+            if subscription.overflowed:
+                continue
+            try:
+                subscription.queue.put_nowait(event)
+            except asyncio.QueueFull:
+                subscription.overflowed = True
+        waiter = self._waiters.pop(escrow_id, None)
+        self._waiter_counts.pop(escrow_id, None)
+        if waiter is not None and not waiter.done():
+            waiter.set_result(event)
+        return event
+
+    def latest_seq(self, escrow_id: str) -> int:
+        """Seq of the newest event kept for the escrow, or 0 if none is kept."""
+        history = self._histories.get(escrow_id)
+        return history.events[-1].seq if history and history.events else 0
+
+    async def wait(self, escrow_id: str, after_seq: int, timeout: float) -> bool:
+        """
+        Wait until an event newer than after_seq is published for the escrow.
+        Returns False on timeout.
+        """
+        if self.latest_seq(escrow_id) > after_seq:
+            return True
+        loop = asyncio.get_running_loop()
+        waiter = self._waiters.get(escrow_id)
+        if waiter is None or waiter.done() or waiter.get_loop() is not loop:
+            waiter = self._waiters[escrow_id] = loop.create_future()
+            self._waiter_counts[escrow_id] = 0
+        self._waiter_counts[escrow_id] += 1
+        try:
+            await asyncio.wait_for(asyncio.shield(waiter), timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
+        finally:
+            if self._waiters.get(escrow_id) is waiter:
+                self._waiter_counts[escrow_id] -= 1
+                if self._waiter_counts[escrow_id] <= 0:
+                    del self._waiters[escrow_id]
+                    del self._waiter_counts[escrow_id]
+
+    def subscribe(self, escrow_id: str) -> Subscription:
+        subscription = Subscription(escrow_id)
+        self._subscribers.setdefault(escrow_id, set()).add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        subscribers = self._subscribers.get(subscription.escrow_id)
+        if subscribers is None:
+            return
+        subscribers.discard(subscription)
+        if not subscribers:
+            self._subscribers.pop(subscription.escrow_id, None)
+
+    def replay(self, escrow_id: str, last_event_id: Optional[str]) -> Optional[list[EscrowEvent]]:
+        """
+        Events for the escrow after last_event_id, or None when the id is unknown
+        (another process, before a restart, or already trimmed from history).
+        """
+        last_seq = self._parse_event_id(last_event_id)
+        if last_seq is None:
+            return None
+        history = self._histories.get(escrow_id)
+        if history is None:
+            # Nothing published yet, or the history was evicted; eviction only
+            # loses events up to _evicted_through.
+            return [] if last_seq >= self._evicted_through else None
+        if last_seq < history.dropped_through:
+            return None
+        return [event for event in history.events if event.seq > last_seq]
+
+    def snapshot(self, kind: str, data: dict) -> EscrowEvent:
+        """An unpublished event stamped with the newest id, for sending current state."""
+        return EscrowEvent(self._last_seq, f"{self._boot}-{self._last_seq}", kind, data)
+
+    def _parse_event_id(self, event_id: Optional[str]) -> Optional[int]:
+        if not event_id:
+            return None
+        boot, _, seq = event_id.strip().partition("-")
+        if boot != self._boot or not seq.isdigit():
+            return None
+        return int(seq)
+
+
+bus = EscrowEventBus()
@@ -1,11 +1,14 @@
+import asyncio
+import functools
 import hashlib
+import logging
 import secrets
 from datetime import datetime, timedelta, timezone
-from threading import Lock
 import time
-from typing import Optional
+from typing import AsyncIterator, Optional
 
 from app import store
+from app.cache import SingleFlight, TTLCache
 from app.config import settings
 from app.exceptions import (
     EscrowCancelledError,
@@ -15,18 +18,72 @@ from app.exceptions import (
     InvalidAddressError,
     InvalidEscrowStateError,
     InviteTokenError,
+    SolanaRPCError,
 )
 from app.secret_crypto import decrypt_escrow_secret, encrypt_escrow_secret
 from app.schemas.escrow import EscrowCreate, EscrowUpdate
 from app.schemas.transaction import TransactionCreate
-from app.services import solana_service
+from app.services import escrow_events, solana_service
+
+logger = logging.getLogger(__name__)
 
 TERMINAL_ESCROW_STATES = {"released", "cancelled"}
-_funding_signature_scan_last_at: dict[str, float] = {}
-_funding_signature_scan_lock = Lock()
+PENDING_SETTLEMENT_STATES = {"release_pending", "refund_pending"}
+_FUNDING_SCAN_STATE_MAX_ENTRIES = 10000
+_FUNDING_SCAN_MARKER_TTL_SECONDS = 3600
+# Presence of an entry means the escrow's address was scanned within the cooldown.
+_funding_signature_scan_last_at = TTLCache(
+    "funding_signature_scan_cooldown",
+    _FUNDING_SCAN_STATE_MAX_ENTRIES,
+    settings.funding_signature_rescan_cooldown_seconds,
+)
+# Account change counter (from solana_service.watch_account) seen at each escrow's last full scan.
+_funding_signature_scan_marker = TTLCache(
+    "funding_signature_scan_marker",
+    _FUNDING_SCAN_STATE_MAX_ENTRIES,
+    _FUNDING_SCAN_MARKER_TTL_SECONDS,
+)
+_settlement_tasks: dict[str, asyncio.Task] = {}
+# States where a deposit can still land and funding is tracked by the deposit watcher.
+DEPOSIT_WATCH_STATES = (
+    "open",
+    "roles_pending",
+    "roles_claimed",
+    "funded",
+    "service_complete",
+    "disputed",
+)
+_DEPOSIT_WATCHER_CONCURRENCY = 8
+# A pending settlement with no recorded transfer after this long is from a crashed request.
+_SETTLEMENT_CLAIM_STALE_SECONDS = 120.0
+_EVENT_STREAM_KEEPALIVE_SECONDS = 15.0
+_deposit_watcher_task: Optional[asyncio.Task] = None
+# Concurrent long-polls on one escrow share each funding refresh.
+_funding_sync_flights = SingleFlight("funding_sync")
+# Balance the deposit watcher saw for each escrow on its latest tick.
+_watched_balances = TTLCache(
+    "deposit_watcher_balances",
+    _FUNDING_SCAN_STATE_MAX_ENTRIES,
+    3 * settings.deposit_watcher_interval_seconds,
+)
+
 
+def _publish_escrow(escrow: dict) -> None:
+    escrow_events.bus.publish(escrow["id"], "escrow", escrow)
 
-def create_escrow(data: EscrowCreate, actor_user_id: str) -> dict:
+
+def _in_store_session(func):
+    """Run the coroutine function in a request-scoped store session (see store.session)."""
+
+    @functools.wraps(func)
+    async def wrapper(*args, **kwargs):
+        async with store.session(on_escrow_flushed=_publish_escrow):
+            return await func(*args, **kwargs)
+
+    return wrapper
+
+
+async def create_escrow(data: EscrowCreate, actor_user_id: str) -> dict:
     public_key, secret_key = solana_service.generate_keypair()
     encrypted_secret_key = encrypt_escrow_secret(secret_key)
     join_token = secrets.token_urlsafe(32)
@@ -35,7 +92,7 @@ def create_escrow(data: EscrowCreate, actor_user_id: str) -> dict:
         minutes=settings.escrow_join_ttl_minutes
     )
 
-    escrow = store.insert_escrow(
+    escrow = await store.insert_escrow(
         {
             "public_key": public_key,
             "secret_key": encrypted_secret_key,
@@ -55,24 +112,48 @@ def create_escrow(data: EscrowCreate, actor_user_id: str) -> dict:
     return escrow
 
 
-def list_escrows(
+async def list_escrows(
     status_filter: Optional[str] = None,
     limit: int = 50,
-    offset: int = 0,
+    cursor: Optional[str] = None,
     actor_user_id: Optional[str] = None,
     mine_only: bool = True,
-) -> tuple[int, list[dict]]:
-    return store.list_escrows(
+    include_balances: bool = False,
+    include_total: bool = True,
+) -> dict:
+    page = await store.list_escrows(
         status_filter=status_filter,
         limit=limit,
-        offset=offset,
+        cursor=cursor,
         actor_user_id=actor_user_id,
         mine_only=mine_only,
+        include_total=include_total,
     )
+    items = page["items"]
+    if include_balances and items:
+        balances = await solana_service.get_balances([item["public_key"] for item in items])
+        for item in items:
+            item["balance_lamports"] = balances.get(item["public_key"])
+    return page
 
 
-def get_escrow(escrow_id: str, actor_user_id: Optional[str] = None) -> dict:
-    escrow = store.get_escrow(escrow_id)
+async def get_escrow_summary(actor_user_id: str, mine_only: bool = True) -> dict:
+    """Escrow counts by status for the actor's escrows, or for all escrows."""
+    by_status = await store.get_escrow_status_counts(actor_user_id if mine_only else None)
+    return {
+        "scope": "mine" if mine_only else "all",
+        "total": sum(by_status.values()),
+        "by_status": by_status,
+    }
+
+
+async def get_escrow(
+    escrow_id: str,
+    actor_user_id: Optional[str] = None,
+    fresh: bool = False,
+    projection: str = "view",
+) -> dict:
+    escrow = await store.get_escrow(escrow_id, fresh=fresh, projection=projection)
     if not escrow:
         raise EscrowNotFoundError(escrow_id)
     if actor_user_id:
@@ -80,8 +161,8 @@ def get_escrow(escrow_id: str, actor_user_id: Optional[str] = None) -> dict:
     return escrow
 
 
-def get_escrow_by_public_id(public_id: str, actor_user_id: Optional[str] = None) -> dict:
-    escrow = store.get_escrow_by_public_id(public_id)
+async def get_escrow_by_public_id(public_id: str, actor_user_id: Optional[str] = None) -> dict:
+    escrow = await store.get_escrow_by_public_id(public_id, projection="view")
     if not escrow:
         raise EscrowNotFoundError(public_id)
     if actor_user_id:
@@ -89,27 +170,27 @@ def get_escrow_by_public_id(public_id: str, actor_user_id: Optional[str] = None)
     return escrow
 
 
-def update_escrow(escrow_id: str, data: EscrowUpdate, actor_user_id: str) -> dict:
-    escrow = get_escrow(escrow_id)
+async def update_escrow(escrow_id: str, data: EscrowUpdate, actor_user_id: str) -> dict:
+    escrow = await get_escrow(escrow_id, fresh=True)
     _require_sender_or_creator(escrow, actor_user_id)
     _ensure_not_terminal(escrow)
 
     allowed = {"label", "expected_amount_lamports"}
     update_data = data.model_dump(exclude_unset=True)
     updates = {k: v for k, v in update_data.items() if k in allowed}
-    updated = store.update_escrow(escrow_id, updates)
+    updated = await _update_escrow(escrow_id, updates)
     if not updated:
         raise EscrowNotFoundError(escrow_id)
     return updated
 
 
-def claim_role(
+async def claim_role(
     public_id: str,
     actor_user_id: str,
     role: str,
     join_token: str,
 ) -> dict:
-    escrow = _get_escrow_by_public_id(public_id)
+    escrow = await _get_escrow_by_public_id(public_id, fresh=True)
     _ensure_not_terminal(escrow)
     _verify_join_token(escrow, join_token)
 
@@ -141,25 +222,25 @@ def claim_role(
     if next_sender and next_recipient and escrow.get("status") in {"open", "roles_pending"}:
         updates["status"] = "roles_claimed"
 
-    updated = store.update_escrow(escrow["id"], updates)
+    updated = await _update_escrow(escrow["id"], updates)
     if not updated:
         raise EscrowNotFoundError(public_id)
     return updated
 
 
-def set_recipient_address(
+async def set_recipient_address(
     public_id: str,
     actor_user_id: str,
     join_token: str,
     recipient_address: str,
 ) -> dict:
-    escrow = _get_escrow_by_public_id(public_id)
+    escrow = await _get_escrow_by_public_id(public_id, fresh=True)
     _ensure_not_terminal(escrow)
     _verify_join_token(escrow, join_token)
     _require_recipient(escrow, actor_user_id)
     solana_service.validate_address(recipient_address)
 
-    updated = store.update_escrow(
+    updated = await _update_escrow(
         escrow["id"],
         {
             "recipient_address": recipient_address,
@@ -171,12 +252,22 @@ def set_recipient_address(
     return updated
 
 
-def sync_funding(
+async def sync_funding(
     public_id: str,
     actor_user_id: str,
     join_token: Optional[str] = None,
+    *,
+    wait_seconds: float = 0.0,
+    known_version: Optional[int] = None,
+    known_status: Optional[str] = None,
 ) -> dict:
-    escrow = _get_escrow_by_public_id(public_id)
+    """
+    Refresh the escrow's funding state. With wait_seconds, hold the request until
+    the escrow's version or status differs from known_version/known_status, or
+    the wait runs out. An escrow released or cancelled during the wait is
+    returned as it now is.
+    """
+    escrow = await _get_escrow_by_public_id(public_id)
     _ensure_not_terminal(escrow)
 
     if join_token:
@@ -184,8 +275,51 @@ def sync_funding(
     else:
         _require_view_access(escrow, actor_user_id)
 
-    latest_funding_tx = _sync_recent_address_signatures(escrow)
-    balance = solana_service.get_balance(escrow["public_key"])
+    if known_version is None and known_status is None:
+        wait_seconds = 0.0
+    deadline = time.monotonic() + min(max(wait_seconds, 0.0), settings.long_poll_max_wait_seconds)
+    while True:
+        after_seq = escrow_events.bus.latest_seq(escrow["id"])
+        result = await _funding_sync_flights.do(escrow["id"], lambda: _sync_funding_state(escrow))
+        current = result["escrow"]
+        if known_version is not None and current.get("version", 0) != known_version:
+            return result
+        if known_status is not None and current.get("status") != known_status:
+            return result
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            return result
+        # Wake on the next change to this escrow, re-checking the chain now and then
+        # for deposits that arrive while the deposit watcher is off.
+        await escrow_events.bus.wait(
+            escrow["id"],
+            after_seq,
+            min(remaining, settings.long_poll_recheck_seconds),
+        )
+        escrow = await _get_escrow_by_public_id(public_id)
+        if escrow.get("status") in TERMINAL_ESCROW_STATES:
+            # Nothing left to fund; the settlement is the change the client waits for.
+            return {**result, "escrow": escrow}
+
+
+async def _sync_funding_state(escrow: dict) -> dict:
+    watched_balance = _watched_balances.get(escrow["id"]) if _deposit_watcher_running() else None
+    if watched_balance is not None:
+        # The deposit watcher keeps signatures and funded_at current; serve stored state.
+        latest_funding_tx = await store.latest_transaction_of_type(escrow["id"], "deposit")
+        return await _apply_funding_state(escrow, latest_funding_tx, watched_balance)
+
+    latest_funding_tx = await _sync_recent_address_signatures(escrow)
+    balance = await solana_service.get_balance(escrow["public_key"])
+    return await _apply_funding_state(escrow, latest_funding_tx, balance)
+
+
+async def _apply_funding_state(
+    escrow: dict,
+    latest_funding_tx: Optional[dict],
+    balance: int,
+) -> dict:
+    """Mark the escrow funded once its balance and deposit confirmation allow it."""
     minimum_required = _minimum_required_funding_lamports(escrow)
     funding_tx_confirmed = False
     if latest_funding_tx and not latest_funding_tx.get("raw_error"):
@@ -201,6 +335,9 @@ def sync_funding(
     funding_eligible = has_required_balance and funding_tx_confirmed
     updated_escrow = escrow
 
+    if funding_eligible and not escrow.get("funded_at"):
+        # Polls may have read the escrow from the cache; decide the write on the latest copy.
+        updated_escrow = escrow = await store.get_escrow(escrow["id"], fresh=True) or escrow
     if funding_eligible and not escrow.get("funded_at"):
         updates = {
             "funded_at": datetime.now(timezone.utc),
@@ -208,7 +345,7 @@ def sync_funding(
         }
         if escrow.get("status") in {"open", "roles_pending", "roles_claimed"}:
             updates["status"] = "funded"
-        updated_escrow = store.update_escrow(escrow["id"], updates) or escrow
+        updated_escrow = await _update_escrow(escrow["id"], updates) or escrow
 
     return {
         "escrow": updated_escrow,
@@ -221,12 +358,12 @@ def sync_funding(
     }
 
 
-def mark_service_complete(
+async def mark_service_complete(
     public_id: str,
     actor_user_id: str,
     join_token: str,
 ) -> dict:
-    escrow = _get_escrow_by_public_id(public_id)
+    escrow = await _get_escrow_by_public_id(public_id, fresh=True)
     _ensure_not_terminal(escrow)
     _verify_join_token(escrow, join_token)
     _require_recipient(escrow, actor_user_id)
@@ -241,24 +378,24 @@ def mark_service_complete(
     if escrow.get("status") not in {"released", "cancelled"}:
         updates["status"] = "service_complete"
 
-    updated = store.update_escrow(escrow["id"], updates)
+    updated = await _update_escrow(escrow["id"], updates)
     if not updated:
         raise EscrowNotFoundError(public_id)
     return updated
 
 
-def open_dispute(
+async def open_dispute(
     public_id: str,
     actor_user_id: str,
     join_token: str,
     reason: Optional[str] = None,
 ) -> dict:
-    escrow = _get_escrow_by_public_id(public_id)
+    escrow = await _get_escrow_by_public_id(public_id, fresh=True)
     _ensure_not_terminal(escrow)
     _verify_join_token(escrow, join_token)
     _require_view_access(escrow, actor_user_id)
 
-    updated = store.update_escrow(
+    updated = await _update_escrow(
         escrow["id"],
         {
             "disputed_at": datetime.now(timezone.utc),
@@ -271,14 +408,70 @@ def open_dispute(
     return updated
 
 
-def list_dispute_messages_by_public_id(
+async def open_escrow_event_stream(
+    public_id: str,
+    actor_user_id: str,
+    actor_is_admin: bool = False,
+    last_event_id: Optional[str] = None,
+) -> AsyncIterator[Optional[escrow_events.EscrowEvent]]:
+    """
+    Check access, then return a stream of escrow events for the escrow.
+    The stream yields None when nothing happened for keepalive_seconds.
+    """
+    escrow = await _get_escrow_by_public_id(public_id, projection="view")
+    if not actor_is_admin:
+        _require_view_access(escrow, actor_user_id)
+    can_read_chat = actor_is_admin or actor_user_id in {
+        escrow.get("payer_user_id"),
+        escrow.get("payee_user_id"),
+    }
+    return _escrow_event_stream(escrow["id"], can_read_chat, last_event_id)
+
+
+async def _escrow_event_stream(
+    escrow_id: str,
+    can_read_chat: bool,
+    last_event_id: Optional[str],
+    keepalive_seconds: float = _EVENT_STREAM_KEEPALIVE_SECONDS,
+) -> AsyncIterator[Optional[escrow_events.EscrowEvent]]:
+    bus = escrow_events.bus
+    subscription = bus.subscribe(escrow_id)
+    try:
+        backlog = bus.replay(escrow_id, last_event_id)
+        if backlog is None:
+            # Unknown or stale resume point: start from the current state instead.
+            escrow = await store.get_escrow(escrow_id, projection="view")
+            backlog = [bus.snapshot("escrow", escrow)] if escrow else []
+
+        delivered = 0
+        for event in backlog:
+            delivered = max(delivered, event.seq)
+            if event.kind != "dispute_message" or can_read_chat:
+                yield event
+
+        while not subscription.overflowed:
+            try:
+                event = await asyncio.wait_for(subscription.queue.get(), keepalive_seconds)
+            except asyncio.TimeoutError:
+                yield None
+                continue
+            if event.seq <= delivered:
+                continue
+            delivered = event.seq
+            if event.kind != "dispute_message" or can_read_chat:
+                yield event
+    finally:
+        bus.unsubscribe(subscription)
+
+
+async def list_dispute_messages_by_public_id(
     public_id: str,
     actor_user_id: str,
     actor_is_admin: bool = False,
 ) -> list[dict]:
-    escrow = _get_escrow_by_public_id(public_id)
+    escrow = await _get_escrow_by_public_id(public_id, projection="view")
     _require_dispute_chat_access(escrow, actor_user_id, actor_is_admin)
-    messages = store.list_dispute_messages(escrow["id"])
+    messages = await store.list_dispute_messages(escrow["id"])
     for message in messages:
         sender_user_id = message.get("sender_user_id")
         if sender_user_id == escrow.get("payer_user_id"):
@@ -290,14 +483,14 @@ def list_dispute_messages_by_public_id(
     return messages
 
 
-def create_dispute_message_by_public_id(
+async def create_dispute_message_by_public_id(
     public_id: str,
     actor_user_id: str,
     body: Optional[str],
     attachments: Optional[list[dict]] = None,
     actor_is_admin: bool = False,
 ) -> dict:
-    escrow = _get_escrow_by_public_id(public_id)
+    escrow = await _get_escrow_by_public_id(public_id, fresh=True)
     _require_dispute_chat_access(escrow, actor_user_id, actor_is_admin)
 
     clean_body = body.strip() if body else None
@@ -305,7 +498,7 @@ def create_dispute_message_by_public_id(
     if not clean_body and not clean_attachments:
         raise InvalidEscrowStateError("Message body or attachments are required.")
 
-    return store.insert_dispute_message(
+    message = await store.insert_dispute_message(
         {
             "escrow_id": escrow["id"],
             "sender_user_id": actor_user_id,
@@ -314,20 +507,22 @@ def create_dispute_message_by_public_id(
             "attachments": clean_attachments,
         }
     )
+    escrow_events.bus.publish(escrow["id"], "dispute_message", message)
+    return message
 
 
-def create_dispute_upload_url_by_public_id(
+async def create_dispute_upload_url_by_public_id(
     public_id: str,
     actor_user_id: str,
     actor_is_admin: bool = False,
 ) -> str:
-    escrow = _get_escrow_by_public_id(public_id)
+    escrow = await _get_escrow_by_public_id(public_id, fresh=True)
     _require_dispute_chat_access(escrow, actor_user_id, actor_is_admin)
-    return store.generate_dispute_upload_url()
+    return await store.generate_dispute_upload_url()
 
 
-def get_rating_state_by_public_id(public_id: str, actor_user_id: str) -> dict:
-    escrow = _get_escrow_by_public_id(public_id)
+async def get_rating_state_by_public_id(public_id: str, actor_user_id: str) -> dict:
+    escrow = await _get_escrow_by_public_id(public_id, projection="view")
     counterpart_user_id = _rating_counterpart_user_id(escrow, actor_user_id)
     terminal = _is_terminal_for_ratings(escrow)
 
@@ -336,10 +531,10 @@ def get_rating_state_by_public_id(public_id: str, actor_user_id: str) -> dict:
     can_rate = False
 
     if terminal and counterpart_user_id:
-        my_rating = store.get_rating_by_users(
+        my_rating = await store.get_rating_by_users(
             escrow["id"], actor_user_id, counterpart_user_id
         )
-        received_rating = store.get_rating_by_users(
+        received_rating = await store.get_rating_by_users(
             escrow["id"], counterpart_user_id, actor_user_id
         )
         can_rate = True
@@ -354,13 +549,13 @@ def get_rating_state_by_public_id(public_id: str, actor_user_id: str) -> dict:
     }
 
 
-def submit_rating_by_public_id(
+async def submit_rating_by_public_id(
     public_id: str,
     actor_user_id: str,
     score: int,
     comment: Optional[str] = None,
 ) -> dict:
-    escrow = _get_escrow_by_public_id(public_id)
+    escrow = await _get_escrow_by_public_id(public_id, fresh=True)
     if not _is_terminal_for_ratings(escrow):
         raise InvalidEscrowStateError(
             "Ratings are available only after escrow is released or cancelled."
@@ -374,7 +569,7 @@ def submit_rating_by_public_id(
         raise InvalidEscrowStateError("Rating score must be between 1 and 5.")
 
     clean_comment = comment.strip() if comment else None
-    return store.upsert_rating(
+    return await store.upsert_rating(
         escrow_id=escrow["id"],
         from_user_id=actor_user_id,
         to_user_id=counterpart_user_id,
@@ -383,8 +578,8 @@ def submit_rating_by_public_id(
     )
 
 
-def create_invite(public_id: str, actor_user_id: str) -> dict:
-    escrow = _get_escrow_by_public_id_for_write(public_id, actor_user_id)
+async def create_invite(public_id: str, actor_user_id: str) -> dict:
+    escrow = await _get_escrow_by_public_id_for_write(public_id, actor_user_id)
     _ensure_not_terminal(escrow)
 
     token = secrets.token_urlsafe(32)
@@ -393,7 +588,7 @@ def create_invite(public_id: str, actor_user_id: str) -> dict:
         minutes=settings.escrow_invite_ttl_minutes
     )
 
-    store.update_escrow(
+    await _update_escrow(
         escrow["id"],
         {
             "join_token_hash": token_hash,
@@ -411,9 +606,9 @@ def create_invite(public_id: str, actor_user_id: str) -> dict:
     }
 
 
-def accept_invite(invite_token: str, actor_user_id: str) -> dict:
+async def accept_invite(invite_token: str, actor_user_id: str) -> dict:
     token_hash = _hash_token(invite_token)
-    escrow = store.get_escrow_by_invite_hash(token_hash)
+    escrow = await store.get_escrow_by_invite_hash(token_hash, fresh=True)
     if not escrow:
         raise InviteTokenError("Invite token is invalid.")
 
@@ -422,28 +617,29 @@ def accept_invite(invite_token: str, actor_user_id: str) -> dict:
     if not expires_at or expires_at < now:
         raise InviteTokenError("Invite token is expired.")
 
-    updated = claim_role(
+    updated = await claim_role(
         escrow["public_id"],
         actor_user_id,
         "recipient",
         invite_token,
     )
-    store.update_escrow(
+    await _update_escrow(
         updated["id"],
         {
             "invite_used_at": now,
             "accepted_at": now,
         },
     )
-    return get_escrow(updated["id"], actor_user_id)
+    return await get_escrow(updated["id"], actor_user_id)
 
 
-def mark_funded(public_id: str, actor_user_id: str) -> dict:
-    result = sync_funding(public_id, actor_user_id, None)
+async def mark_funded(public_id: str, actor_user_id: str) -> dict:
+    result = await sync_funding(public_id, actor_user_id, None)
     return result["escrow"]
 
 
-def cancel_escrow(
+@_in_store_session
+async def cancel_escrow(
     escrow_id: str,
     actor_user_id: str,
     return_funds: bool = False,
@@ -451,8 +647,9 @@ def cancel_escrow(
     settlement: str = "none",
     payout_address: Optional[str] = None,
     actor_is_admin: bool = False,
+    async_settlement: bool = False,
 ) -> tuple[dict, Optional[str]]:
-    escrow = get_escrow(escrow_id)
+    escrow = await get_escrow(escrow_id, fresh=True)
     _require_sender_or_creator(escrow, actor_user_id, actor_is_admin)
 
     if escrow["status"] == "cancelled":
@@ -460,6 +657,13 @@ def cancel_escrow(
     if escrow["status"] == "released":
         raise InvalidEscrowStateError("Released escrow cannot be cancelled.")
 
+    in_flight = await _pending_settlement_transaction(escrow)
+    if in_flight:
+        return escrow, in_flight["signature"]
+    # A synchronous settlement claims the escrow before its transfer is recorded;
+    # cancelling under it would be overwritten once that transfer lands.
+    _ensure_no_settlement_in_progress(escrow)
+
     # Backward compatibility with existing query params.
     if return_funds and settlement == "none":
         settlement = "refund_sender"
@@ -478,9 +682,9 @@ def cancel_escrow(
     if settlement == "refund_sender":
         target_address = payout_address or escrow.get("sender_address")
         if not target_address:
-            target_address = _resolve_refund_sender_address(escrow)
+            target_address = await _resolve_refund_sender_address(escrow)
             if target_address:
-                store.update_escrow(escrow_id, {"sender_address": target_address})
+                await _defer_escrow_update(escrow_id, {"sender_address": target_address})
         tx_type = "refund"
         pending_status = "refund_pending"
         final_status = "cancelled"
@@ -501,7 +705,7 @@ def cancel_escrow(
     refund_sig = None
     if target_address:
         solana_service.validate_address(target_address)
-        balance = solana_service.get_balance(escrow["public_key"])
+        balance = await solana_service.get_balance(escrow["public_key"])
         fee = solana_service.TRANSFER_FEE_LAMPORTS
         if balance > fee:
             refund_amount = balance - fee
@@ -512,8 +716,8 @@ def cancel_escrow(
                 idempotency_key=f"{intent_prefix}:{escrow['finalize_nonce'] + 1}",
             )
 
-            store.update_escrow(
-                escrow_id,
+            await _claim_settlement(
+                escrow,
                 {
                     "status": pending_status,
                     "last_intent_hash": intent_hash,
@@ -522,13 +726,14 @@ def cancel_escrow(
             )
 
             try:
-                transfer_result = solana_service.send_transfer_with_confirmation(
-                    decrypt_escrow_secret(escrow["secret_key"]),
+                transfer_result = await _send_settlement_transfer(
+                    escrow,
                     target_address,
                     refund_amount,
+                    async_settlement,
                 )
             except Exception as exc:
-                store.update_escrow(
+                await _update_escrow(
                     escrow_id,
                     {
                         "status": _derive_non_terminal_status(escrow),
@@ -538,40 +743,44 @@ def cancel_escrow(
                 raise
 
             refund_sig = transfer_result["signature"]
-            record_transaction(
-                TransactionCreate(
-                    escrow_id=escrow["id"],
-                    signature=refund_sig,
-                    tx_type=tx_type,
-                    amount_lamports=refund_amount,
-                    from_address=escrow["public_key"],
-                    to_address=target_address,
-                    status=transfer_result["status"],
-                    intent_hash=intent_hash,
-                    commitment_target=transfer_result["commitment_target"],
-                    last_valid_block_height=transfer_result["last_valid_block_height"],
-                    rpc_endpoint=transfer_result["rpc_endpoint"],
-                )
-            )
-            store.update_escrow(
-                escrow_id,
-                {
-                    "settled_signature": refund_sig,
-                    "finalize_nonce": escrow["finalize_nonce"] + 1,
-                },
+            refund_record = TransactionCreate(
+                escrow_id=escrow["id"],
+                signature=refund_sig,
+                tx_type=tx_type,
+                amount_lamports=refund_amount,
+                from_address=escrow["public_key"],
+                to_address=target_address,
+                status=transfer_result["status"],
+                intent_hash=intent_hash,
+                commitment_target=transfer_result["commitment_target"],
+                last_valid_block_height=transfer_result["last_valid_block_height"],
+                rpc_endpoint=transfer_result["rpc_endpoint"],
             )
+            if async_settlement:
+                transaction = await record_transaction(refund_record)
+                _spawn_settlement_confirmer(escrow_id, transaction)
+                return await get_escrow(escrow_id), refund_sig
 
-    result = store.update_escrow(
-        escrow_id,
-        {
-            "status": final_status if (refund_sig or settlement == "none") else "cancelled",
-            "failure_reason": None,
-        },
-    )
+    updates = {
+        "status": final_status if (refund_sig or settlement == "none") else "cancelled",
+        "failure_reason": None,
+    }
+    if refund_sig:
+        # The transfer went out, so this write must land, and it records the transfer too.
+        updates["settled_signature"] = refund_sig
+        updates["finalize_nonce"] = escrow["finalize_nonce"] + 1
+        result, _ = await _update_escrow_and_transaction(
+            escrow_id,
+            updates,
+            new_transaction=_transaction_fields(refund_record),
+        )
+    else:
+        result = await _update_escrow(escrow_id, updates, expected_version=escrow["version"])
     return result or escrow, refund_sig
 
 
-def cancel_escrow_by_public_id(
+@_in_store_session
+async def cancel_escrow_by_public_id(
     public_id: str,
     actor_user_id: str,
     return_funds: bool = False,
@@ -579,9 +788,10 @@ def cancel_escrow_by_public_id(
     settlement: str = "none",
     payout_address: Optional[str] = None,
     actor_is_admin: bool = False,
+    async_settlement: bool = False,
 ) -> tuple[dict, Optional[str]]:
-    escrow = _get_escrow_by_public_id(public_id)
-    return cancel_escrow(
+    escrow = await _get_escrow_by_public_id(public_id, fresh=True)
+    return await cancel_escrow(
         escrow_id=escrow["id"],
         actor_user_id=actor_user_id,
         return_funds=return_funds,
@@ -589,22 +799,29 @@ def cancel_escrow_by_public_id(
         settlement=settlement,
         payout_address=payout_address,
         actor_is_admin=actor_is_admin,
+        async_settlement=async_settlement,
     )
 
 
-def release_funds(
+@_in_store_session
+async def release_funds(
     escrow_id: str,
     actor_user_id: str,
     recipient_override: Optional[str] = None,
     amount_override: Optional[int] = None,
     idempotency_key: Optional[str] = None,
+    async_settlement: bool = False,
 ) -> dict:
-    escrow = get_escrow(escrow_id)
+    escrow = await get_escrow(escrow_id, fresh=True)
     _require_sender(escrow, actor_user_id)
     _ensure_release_allowed(escrow)
 
+    in_flight = await _pending_settlement_transaction(escrow)
+    if in_flight:
+        return _settlement_result(escrow, in_flight)
+
     if escrow["status"] == "released":
-        latest_release = _latest_transaction_for_type(escrow["id"], "release")
+        latest_release = await store.latest_transaction_of_type(escrow["id"], "release")
         if latest_release:
             return {
                 "signature": latest_release["signature"],
@@ -632,7 +849,7 @@ def release_funds(
     ):
         raise ForbiddenActionError("Cannot override recipient payout address.")
 
-    balance = solana_service.get_balance(escrow["public_key"])
+    balance = await solana_service.get_balance(escrow["public_key"])
     fee = solana_service.TRANSFER_FEE_LAMPORTS
 
     if amount_override is not None:
@@ -651,7 +868,7 @@ def release_funds(
         idempotency_key=idempotency_key or f"release:{escrow['finalize_nonce'] + 1}",
     )
     if escrow["last_intent_hash"] == intent_hash and escrow["settled_signature"]:
-        existing = get_transaction_by_signature(escrow["settled_signature"])
+        existing = await get_transaction_by_signature(escrow["settled_signature"])
         if existing:
             return {
                 "signature": existing["signature"],
@@ -662,9 +879,11 @@ def release_funds(
                 "commitment_target": existing.get("commitment_target"),
             }
 
-    previous = _find_transaction_by_intent(escrow["id"], "release", intent_hash)
+    previous = await store.get_transaction_by_intent(escrow["id"], "release", intent_hash)
+    if previous and _settlement_state(previous) == "failed":
+        previous = None
     if previous:
-        store.update_escrow(
+        await _update_escrow(
             escrow_id,
             {
                 "status": "released",
@@ -681,8 +900,8 @@ def release_funds(
             "commitment_target": previous.get("commitment_target"),
         }
 
-    store.update_escrow(
-        escrow_id,
+    await _claim_settlement(
+        escrow,
         {
             "status": "release_pending",
             "last_intent_hash": intent_hash,
@@ -691,13 +910,14 @@ def release_funds(
     )
 
     try:
-        transfer_result = solana_service.send_transfer_with_confirmation(
-            decrypt_escrow_secret(escrow["secret_key"]),
+        transfer_result = await _send_settlement_transfer(
+            escrow,
             recipient,
             amount,
+            async_settlement,
         )
     except Exception as exc:
-        store.update_escrow(
+        await _update_escrow(
             escrow_id,
             {
                 "status": _derive_non_terminal_status(escrow),
@@ -706,23 +926,26 @@ def release_funds(
         )
         raise
 
-    record_transaction(
-        TransactionCreate(
-            escrow_id=escrow["id"],
-            signature=transfer_result["signature"],
-            tx_type="release",
-            amount_lamports=amount,
-            from_address=escrow["public_key"],
-            to_address=recipient,
-            status=transfer_result["status"],
-            intent_hash=intent_hash,
-            commitment_target=transfer_result["commitment_target"],
-            last_valid_block_height=transfer_result["last_valid_block_height"],
-            rpc_endpoint=transfer_result["rpc_endpoint"],
-        )
+    release_record = TransactionCreate(
+        escrow_id=escrow["id"],
+        signature=transfer_result["signature"],
+        tx_type="release",
+        amount_lamports=amount,
+        from_address=escrow["public_key"],
+        to_address=recipient,
+        status=transfer_result["status"],
+        intent_hash=intent_hash,
+        commitment_target=transfer_result["commitment_target"],
+        last_valid_block_height=transfer_result["last_valid_block_height"],
+        rpc_endpoint=transfer_result["rpc_endpoint"],
     )
+    if async_settlement:
+        transaction = await record_transaction(release_record)
+        _spawn_settlement_confirmer(escrow_id, transaction)
+        return _settlement_result(escrow, transaction)
 
-    store.update_escrow(
+    # The escrow is released by the same write that records the transfer.
+    await _update_escrow_and_transaction(
         escrow_id,
         {
             "status": "released",
@@ -730,9 +953,10 @@ def release_funds(
             "settled_signature": transfer_result["signature"],
             "failure_reason": None,
         },
+        new_transaction=_transaction_fields(release_record),
     )
 
-    escrow = get_escrow(escrow_id)
+    escrow = await get_escrow(escrow_id)
     return {
         "signature": transfer_result["signature"],
         "from_address": escrow["public_key"],
@@ -743,67 +967,263 @@ def release_funds(
     }
 
 
-def release_funds_by_public_id(
+@_in_store_session
+async def release_funds_by_public_id(
     public_id: str,
     actor_user_id: str,
     recipient_override: Optional[str] = None,
     amount_override: Optional[int] = None,
     idempotency_key: Optional[str] = None,
+    async_settlement: bool = False,
 ) -> dict:
-    escrow = _get_escrow_by_public_id(public_id)
+    escrow = await _get_escrow_by_public_id(public_id, fresh=True)
     _require_sender(escrow, actor_user_id)
-    return release_funds(
+    return await release_funds(
         escrow["id"],
         actor_user_id,
         recipient_override,
         amount_override,
         idempotency_key,
+        async_settlement,
     )
 
 
-def record_transaction(data: TransactionCreate) -> dict:
-    return store.insert_transaction(
-        {
-            "escrow_id": data.escrow_id,
-            "signature": data.signature,
-            "tx_type": data.tx_type,
-            "amount_lamports": data.amount_lamports,
-            "from_address": data.from_address,
-            "to_address": data.to_address,
-            "status": data.status or "pending",
-            "intent_hash": data.intent_hash,
-            "commitment_target": data.commitment_target,
-            "last_valid_block_height": data.last_valid_block_height,
-            "rpc_endpoint": data.rpc_endpoint,
-            "raw_error": data.raw_error,
-            "memo": data.memo,
-        }
+async def get_settlement_job(
+    escrow_id: str,
+    job_id: str,
+    actor_user_id: str,
+) -> Optional[dict]:
+    escrow = await get_escrow(escrow_id, actor_user_id)
+    tx = await store.get_transaction_by_signature(job_id)
+    if not tx or tx.get("tx_type") not in {"release", "refund"}:
+        return None
+    if tx.get("escrow_id") != escrow["id"]:
+        raise ForbiddenActionError("Settlement job does not belong to this escrow.")
+
+    return {
+        "job_id": tx["signature"],
+        "escrow_id": escrow["id"],
+        "tx_type": tx["tx_type"],
+        "state": _settlement_state(tx),
+        "transaction_status": tx["status"],
+        "escrow_status": escrow["status"],
+        "last_valid_block_height": tx.get("last_valid_block_height"),
+        "error": tx.get("raw_error") or (
+            escrow.get("failure_reason") if _settlement_state(tx) == "failed" else None
+        ),
+    }
+
+
+async def start_settlement_confirmers() -> None:
+    """Resume background confirmation for settlements left pending by a previous process."""
+    for status in sorted(PENDING_SETTLEMENT_STATES):
+        try:
+            escrows = await _list_escrows_in_states((status,))
+        except Exception as exc:
+            logger.warning("Could not list %s escrows for confirmation: %s", status, exc)
+            continue
+
+        for escrow in escrows:
+            tx = await _pending_settlement_transaction(escrow)
+            if tx:
+                _spawn_settlement_confirmer(escrow["id"], tx)
+
+
+def _deposit_watcher_running() -> bool:
+    return _deposit_watcher_task is not None and not _deposit_watcher_task.done()
+
+
+def start_deposit_watcher() -> None:
+    """Start the background loop that detects deposits for every non-terminal escrow."""
+    global _deposit_watcher_task
+    if settings.deposit_watcher_enabled and not _deposit_watcher_running():
+        _deposit_watcher_task = asyncio.create_task(_run_deposit_watcher())
+
+
+async def stop_deposit_watcher() -> None:
+    global _deposit_watcher_task
+    if _deposit_watcher_task is not None:
+        _deposit_watcher_task.cancel()
+        await asyncio.gather(_deposit_watcher_task, return_exceptions=True)
+        _deposit_watcher_task = None
+
+
+async def _run_deposit_watcher() -> None:
+    interval = max(0.5, float(settings.deposit_watcher_interval_seconds))
+    while True:
+        try:
+            await _watch_deposits_once()
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            logger.exception("Deposit watcher tick failed")
+        await asyncio.sleep(interval)
+
+
+async def _watch_deposits_once() -> None:
+    escrows = await _list_escrows_in_states(DEPOSIT_WATCH_STATES)
+    if not escrows:
+        return
+    # One getMultipleAccounts per 100 escrows; signature scans only where something moved.
+    balances = await solana_service.get_balances([escrow["public_key"] for escrow in escrows])
+    semaphore = asyncio.Semaphore(_DEPOSIT_WATCHER_CONCURRENCY)
+
+    async def _refresh(escrow: dict) -> None:
+        balance = balances[escrow["public_key"]]
+        previous = _watched_balances.get(escrow["id"])
+        awaiting_confirmation = (
+            not escrow.get("funded_at")
+            and balance >= _minimum_required_funding_lamports(escrow)
+        )
+        if previous is None or previous != balance or awaiting_confirmation:
+            async with semaphore:
+                try:
+                    await _refresh_escrow_funding(escrow["id"], balance)
+                except Exception as exc:
+                    logger.warning("Deposit watcher could not refresh escrow %s: %s", escrow["id"], exc)
+                    return
+        _watched_balances.set(escrow["id"], balance)
+
+    await asyncio.gather(*(_refresh(escrow) for escrow in escrows))
+
+
+async def _refresh_escrow_funding(escrow_id: str, balance: int) -> None:
+    # Re-read so a state change made since the listing is not overwritten.
+    escrow = await store.get_escrow(escrow_id, fresh=True)
+    if not escrow or escrow.get("status") not in DEPOSIT_WATCH_STATES:
+        return
+    _funding_signature_scan_last_at.invalidate(escrow_id)
+    latest_funding_tx = await _sync_recent_address_signatures(escrow)
+    await _apply_funding_state(escrow, latest_funding_tx, balance)
+
+
+async def _list_escrows_in_states(states: tuple[str, ...]) -> list[dict]:
+    escrows: list[dict] = []
+    for status in states:
+        cursor = None
+        while True:
+            page = await store.list_escrows(
+                status_filter=status,
+                limit=200,
+                cursor=cursor,
+                mine_only=False,
+                include_total=False,
+            )
+            escrows.extend(page["items"])
+            cursor = page["next_cursor"]
+            if not cursor:
+                break
+    return escrows
+
+
+async def stop_settlement_confirmers() -> None:
+    tasks = list(_settlement_tasks.values())
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+    _settlement_tasks.clear()
+
+
+async def _update_escrow(
+    escrow_id: str,
+    updates: dict,
+    expected_version: Optional[int] = None,
+) -> Optional[dict]:
+    """store.update_escrow plus an "escrow" event for live subscribers."""
+    updated = await store.update_escrow(escrow_id, updates, expected_version)
+    if updated:
+        _publish_escrow(updated)
+    return updated
+
+
+async def _update_escrow_and_transaction(
+    escrow_id: str,
+    updates: dict,
+    *,
+    new_transaction: Optional[dict] = None,
+    transaction_signature: Optional[str] = None,
+    transaction_updates: Optional[dict] = None,
+) -> tuple[Optional[dict], Optional[dict]]:
+    """store.update_escrow_and_transaction plus events for live subscribers."""
+    escrow, transaction = await store.update_escrow_and_transaction(
+        escrow_id,
+        updates,
+        new_transaction=new_transaction,
+        transaction_signature=transaction_signature,
+        transaction_updates=transaction_updates,
     )
+    if escrow:
+        _publish_escrow(escrow)
+    if transaction:
+        escrow_events.bus.publish(escrow_id, "transaction", transaction)
+    return escrow, transaction
+
+
+async def _defer_escrow_update(escrow_id: str, updates: dict) -> None:
+    """Queue a patch to ride along with the escrow's next write in this request."""
+    if not store.defer_escrow_update(escrow_id, updates):
+        await _update_escrow(escrow_id, updates)
+
+
+async def update_transaction(signature: str, updates: dict) -> Optional[dict]:
+    updated = await store.update_transaction(signature, updates)
+    if updated:
+        escrow_events.bus.publish(updated["escrow_id"], "transaction", updated)
+    return updated
+
+
+async def record_transaction(data: TransactionCreate) -> dict:
+    transaction = await store.insert_transaction(_transaction_fields(data))
+    escrow_events.bus.publish(transaction["escrow_id"], "transaction", transaction)
+    return transaction
+
+
+def _transaction_fields(data: TransactionCreate) -> dict:
+    return {
+        "escrow_id": data.escrow_id,
+        "signature": data.signature,
+        "tx_type": data.tx_type,
+        "amount_lamports": data.amount_lamports,
+        "from_address": data.from_address,
+        "to_address": data.to_address,
+        "status": data.status or "pending",
+        "intent_hash": data.intent_hash,
+        "commitment_target": data.commitment_target,
+        "last_valid_block_height": data.last_valid_block_height,
+        "rpc_endpoint": data.rpc_endpoint,
+        "raw_error": data.raw_error,
+        "memo": data.memo,
+    }
 
 
-def list_transactions(escrow_id: str, actor_user_id: Optional[str] = None) -> list[dict]:
-    escrow = get_escrow(escrow_id)
+@_in_store_session
+async def list_transactions(escrow_id: str, actor_user_id: Optional[str] = None) -> list[dict]:
+    escrow = await get_escrow(escrow_id)
     if actor_user_id:
         _require_view_access(escrow, actor_user_id)
-    return store.list_transactions(escrow_id)
+    return await store.list_transactions(escrow_id)
 
 
-def get_transaction_by_signature(signature: str) -> Optional[dict]:
-    return store.get_transaction_by_signature(signature)
+async def get_transaction_by_signature(signature: str) -> Optional[dict]:
+    return await store.get_transaction_by_signature(signature)
 
 
-def reconcile_escrow(escrow_id: str, actor_user_id: str) -> dict:
-    escrow = get_escrow(escrow_id)
+@_in_store_session
+async def reconcile_escrow(escrow_id: str, actor_user_id: str) -> dict:
+    escrow = await get_escrow(escrow_id, fresh=True)
     _require_sender_or_creator(escrow, actor_user_id)
 
-    txs = store.list_transactions(escrow["id"])
+    txs = await store.list_transactions(escrow["id"])
+    chain_by_signature = await solana_service.get_transaction_statuses(
+        [tx["signature"] for tx in txs]
+    )
     updated = 0
     for tx in txs:
-        chain = solana_service.get_transaction_status(tx["signature"])
+        chain = chain_by_signature[tx["signature"]]
         if chain["status"] == "not_found":
             continue
 
-        store.update_transaction(
+        await update_transaction(
             tx["signature"],
             {
                 "status": chain["status"],
@@ -817,7 +1237,7 @@ def reconcile_escrow(escrow_id: str, actor_user_id: str) -> dict:
             and tx["tx_type"] == "release"
             and solana_service.commitment_satisfied(chain["status"], "confirmed")
         ):
-            store.update_escrow(
+            await _update_escrow(
                 escrow_id,
                 {
                     "status": "released",
@@ -830,7 +1250,7 @@ def reconcile_escrow(escrow_id: str, actor_user_id: str) -> dict:
             and tx["tx_type"] == "refund"
             and solana_service.commitment_satisfied(chain["status"], "confirmed")
         ):
-            store.update_escrow(
+            await _update_escrow(
                 escrow_id,
                 {
                     "status": "cancelled",
@@ -839,7 +1259,7 @@ def reconcile_escrow(escrow_id: str, actor_user_id: str) -> dict:
                 },
             )
 
-    escrow = get_escrow(escrow_id)
+    escrow = await get_escrow(escrow_id)
     return {
         "escrow_id": escrow["id"],
         "escrow_status": escrow["status"],
@@ -847,22 +1267,158 @@ def reconcile_escrow(escrow_id: str, actor_user_id: str) -> dict:
     }
 
 
-def _latest_transaction_for_type(escrow_id: str, tx_type: str) -> Optional[dict]:
-    txs = store.list_transactions(escrow_id)
-    for tx in txs:  # already sorted by recorded_at desc
-        if tx["tx_type"] == tx_type:
-            return tx
-    return None
+async def _send_settlement_transfer(
+    escrow: dict,
+    destination: str,
+    amount_lamports: int,
+    async_settlement: bool,
+) -> dict:
+    encrypted_secret_key = await store.get_escrow_signing_key(escrow["id"])
+    if encrypted_secret_key is None:
+        raise EscrowNotFoundError(escrow["id"])
+    secret_key = decrypt_escrow_secret(encrypted_secret_key)
+    if async_settlement:
+        return await solana_service.submit_transfer(secret_key, destination, amount_lamports)
+    return await solana_service.send_transfer_with_confirmation(
+        secret_key,
+        destination,
+        amount_lamports,
+    )
 
 
-def _find_transaction_by_intent(escrow_id: str, tx_type: str, intent_hash: str) -> Optional[dict]:
-    txs = store.list_transactions(escrow_id)
-    for tx in txs:
-        if tx["tx_type"] == tx_type and tx.get("intent_hash") == intent_hash:
-            return tx
+async def _claim_settlement(escrow: dict, updates: dict) -> dict:
+    """
+    Move the escrow into a pending settlement state, compare-and-swap on the
+    version it was read at, so only one request in any worker sends the transfer.
+    """
+    _ensure_no_settlement_in_progress(escrow)
+    return await _update_escrow(escrow["id"], updates, expected_version=escrow["version"]) or escrow
+
+
+def _ensure_no_settlement_in_progress(escrow: dict) -> None:
+    """Reject a pending settlement claim unless it is old enough to count as abandoned."""
+    if escrow.get("status") in PENDING_SETTLEMENT_STATES:
+        claimed_for = (datetime.now(timezone.utc) - escrow["updated_at"]).total_seconds()
+        if claimed_for < _SETTLEMENT_CLAIM_STALE_SECONDS:
+            raise InvalidEscrowStateError("A settlement for this escrow is already in progress.")
+
+
+async def _pending_settlement_transaction(escrow: dict) -> Optional[dict]:
+    """Return the in-flight release/refund for the escrow's current intent, if any."""
+    if escrow.get("status") not in PENDING_SETTLEMENT_STATES or not escrow.get("last_intent_hash"):
+        return None
+    tx_type = "release" if escrow["status"] == "release_pending" else "refund"
+    tx = await store.get_transaction_by_intent(escrow["id"], tx_type, escrow["last_intent_hash"])
+    if tx and _settlement_state(tx) == "pending":
+        return tx
     return None
 
 
+def _settlement_state(tx: dict) -> str:
+    if tx.get("status") == "failed" or tx.get("raw_error"):
+        return "failed"
+    if tx.get("status") != "pending" and solana_service.commitment_satisfied(
+        tx.get("status"),
+        tx.get("commitment_target") or solana_service.DEFAULT_COMMITMENT,
+    ):
+        return "confirmed"
+    return "pending"
+
+
+def _settlement_result(escrow: dict, tx: dict) -> dict:
+    return {
+        "signature": tx["signature"],
+        "from_address": tx.get("from_address") or escrow["public_key"],
+        "to_address": tx.get("to_address") or "",
+        "amount_lamports": tx.get("amount_lamports") or 0,
+        "status": tx["status"],
+        "commitment_target": tx.get("commitment_target"),
+        "job_id": tx["signature"] if _settlement_state(tx) == "pending" else None,
+    }
+
+
+def _spawn_settlement_confirmer(escrow_id: str, tx: dict) -> None:
+    signature = tx["signature"]
+    existing = _settlement_tasks.get(signature)
+    if existing and not existing.done():
+        return
+    task = asyncio.create_task(_confirm_settlement(escrow_id, tx))
+    _settlement_tasks[signature] = task
+    task.add_done_callback(lambda _: _settlement_tasks.pop(signature, None))
+
+
+async def _confirm_settlement(escrow_id: str, tx: dict) -> None:
+    """
+    Drive a submitted release/refund to its terminal escrow state. The transfer
+    is only marked failed on proof: an on-chain error or an expired blockhash.
+    Otherwise it stays pending for the next confirmer or reconcile pass, since
+    reverting the escrow would let a second settlement go out while this one
+    can still land.
+    """
+    signature = tx["signature"]
+    last_valid_block_height = tx.get("last_valid_block_height")
+    confirmation: Optional[dict] = None
+    failure: Optional[str] = None
+    try:
+        confirmation = await solana_service.wait_for_confirmation(
+            signature,
+            last_valid_block_height,
+            commitment_target=tx.get("commitment_target") or solana_service.DEFAULT_COMMITMENT,
+            timeout_seconds=max(1.0, float(settings.settlement_confirm_timeout_seconds)),
+        )
+        if not confirmation:
+            if not await solana_service.blockhash_expired(last_valid_block_height):
+                logger.warning("Settlement %s is still unconfirmed; leaving it pending", signature)
+                return
+            failure = (
+                f"Transaction {signature} did not reach its commitment target before "
+                "its blockhash expired"
+            )
+    except SolanaRPCError as exc:
+        failure = exc.detail
+    except Exception:
+        logger.exception("Settlement confirmer for %s crashed; leaving it pending", signature)
+        return
+
+    try:
+        escrow = await store.get_escrow(escrow_id, fresh=True)
+        if not escrow:
+            return
+
+        if confirmation:
+            if escrow["status"] in TERMINAL_ESCROW_STATES:
+                await update_transaction(signature, {"status": confirmation["status"]})
+                return
+            await _update_escrow_and_transaction(
+                escrow_id,
+                {
+                    "status": "released" if tx["tx_type"] == "release" else "cancelled",
+                    "finalize_nonce": escrow["finalize_nonce"] + 1,
+                    "settled_signature": signature,
+                    "failure_reason": None,
+                },
+                transaction_signature=signature,
+                transaction_updates={"status": confirmation["status"]},
+            )
+            return
+
+        failed = {"status": "failed", "raw_error": failure}
+        if escrow["status"] not in PENDING_SETTLEMENT_STATES:
+            await update_transaction(signature, failed)
+            return
+        await _update_escrow_and_transaction(
+            escrow_id,
+            {
+                "status": _derive_non_terminal_status(escrow),
+                "failure_reason": failure,
+            },
+            transaction_signature=signature,
+            transaction_updates=failed,
+        )
+    except Exception:
+        logger.exception("Failed to persist settlement outcome for %s", signature)
+
+
 def _build_intent_hash(
     *,
     escrow_id: str,
@@ -881,9 +1437,9 @@ def _minimum_required_funding_lamports(escrow: dict) -> int:
     return max(1, int(settings.escrow_funding_min_lamports))
 
 
-def _resolve_refund_sender_address(escrow: dict) -> Optional[str]:
+async def _resolve_refund_sender_address(escrow: dict) -> Optional[str]:
     """Try to infer sender wallet from recorded/latest deposit signatures."""
-    latest_deposit = _latest_transaction_for_type(escrow["id"], "deposit")
+    latest_deposit = await store.latest_transaction_of_type(escrow["id"], "deposit")
     if latest_deposit and latest_deposit.get("from_address"):
         return latest_deposit["from_address"]
 
@@ -893,7 +1449,7 @@ def _resolve_refund_sender_address(escrow: dict) -> Optional[str]:
 
     if not signatures:
         try:
-            recent = solana_service.list_recent_signatures_for_address(
+            recent = await solana_service.list_recent_signatures_for_address(
                 escrow["public_key"],
                 limit=max(1, int(settings.funding_signature_scan_limit)),
             )
@@ -911,96 +1467,159 @@ def _resolve_refund_sender_address(escrow: dict) -> Optional[str]:
             continue
         seen.add(signature)
 
-        source = solana_service.infer_system_transfer_sender(
+        source = await solana_service.infer_system_transfer_sender(
             signature,
             escrow["public_key"],
         )
         if not source:
             continue
 
-        existing = store.get_transaction_by_signature(signature)
+        existing = await store.get_transaction_by_signature(signature)
         if existing and existing.get("escrow_id") == escrow["id"] and not existing.get("from_address"):
-            store.update_transaction(signature, {"from_address": source})
+            await update_transaction(signature, {"from_address": source})
 
         return source
 
     return None
 
 
-def _sync_recent_address_signatures(escrow: dict) -> Optional[dict]:
+async def _sync_recent_address_signatures(escrow: dict) -> Optional[dict]:
     """Upsert recent on-chain signatures for escrow address and return latest deposit tx."""
     escrow_id = escrow["id"]
-    now = time.monotonic()
-    cooldown = max(0.0, float(settings.funding_signature_rescan_cooldown_seconds))
-    if cooldown > 0:
-        with _funding_signature_scan_lock:
-            last_at = _funding_signature_scan_last_at.get(escrow_id)
-            if last_at and (now - last_at) < cooldown:
-                return _latest_transaction_for_type(escrow_id, "deposit")
-            _funding_signature_scan_last_at[escrow_id] = now
+    change_marker = await solana_service.watch_account(escrow["public_key"])
+    if change_marker is not None and _funding_signature_scan_marker.get(escrow_id) == change_marker:
+        # Nothing was pushed for this address since the last settled scan.
+        return await store.latest_transaction_of_type(escrow_id, "deposit")
 
+    now = time.monotonic()
+    if _funding_signature_scan_last_at.get(escrow_id) is not None:
+        return await store.latest_transaction_of_type(escrow_id, "deposit")
+    _funding_signature_scan_last_at.set(escrow_id, now)
+
+    position = (
+        escrow.get("funding_signature_cursor"),
+        escrow.get("funding_signature_resume_before"),
+        escrow.get("funding_signature_resume_cursor"),
+    )
     try:
-        signatures = solana_service.list_recent_signatures_for_address(
-            escrow["public_key"],
-            limit=max(1, int(settings.funding_signature_scan_limit)),
-        )
+        signatures, next_position = await _scan_address_signatures(escrow["public_key"], *position)
     except Exception:
-        if cooldown > 0:
-            with _funding_signature_scan_lock:
-                last_seen = _funding_signature_scan_last_at.get(escrow_id)
-                if last_seen == now:
-                    _funding_signature_scan_last_at.pop(escrow_id, None)
-        return _latest_transaction_for_type(escrow["id"], "deposit")
+        if _funding_signature_scan_last_at.get(escrow_id) == now:
+            _funding_signature_scan_last_at.invalidate(escrow_id)
+        return await store.latest_transaction_of_type(escrow["id"], "deposit")
 
     latest_deposit: Optional[dict] = None
-    existing_by_signature = {
-        tx.get("signature"): tx
-        for tx in store.list_transactions(escrow_id)
-        if tx.get("signature")
-    }
-
-    for sig in signatures:
-        signature = sig["signature"]
-        existing = existing_by_signature.get(signature)
-
-        if existing:
-            updates = {}
-            if sig.get("status") and existing.get("status") != sig["status"]:
-                updates["status"] = sig["status"]
-            if existing.get("raw_error") != sig.get("err"):
-                updates["raw_error"] = sig.get("err")
-            if sig.get("memo") and existing.get("memo") != sig.get("memo"):
-                updates["memo"] = sig.get("memo")
-            if updates:
-                existing = store.update_transaction(signature, updates) or existing
-        else:
-            existing = record_transaction(
-                TransactionCreate(
-                    escrow_id=escrow_id,
-                    signature=signature,
-                    tx_type="deposit",
-                    amount_lamports=None,
-                    from_address=None,
-                    to_address=escrow["public_key"],
-                    status=sig.get("status") or "processed",
-                    commitment_target="confirmed",
-                    rpc_endpoint=settings.solana_rpc_url,
-                    raw_error=sig.get("err"),
-                    memo=sig.get("memo"),
-                )
-            )
-
-        if (
-            existing
-            and existing.get("escrow_id") == escrow_id
-            and existing.get("tx_type") == "deposit"
-            and latest_deposit is None
-        ):
-            latest_deposit = existing
+    if signatures:
+        # Known signatures only take chain-observed changes (status, error, memo),
+        # so a release or refund sent from this address keeps its type.
+        rows, written = await store.upsert_transactions(
+            escrow_id,
+            [
+                {
+                    "signature": sig["signature"],
+                    "tx_type": "deposit",
+                    "to_address": escrow["public_key"],
+                    "status": sig.get("status") or "processed",
+                    "commitment_target": "confirmed",
+                    "rpc_endpoint": sig.get("rpc_endpoint") or settings.solana_rpc_url,
+                    "raw_error": sig.get("err"),
+                    "memo": sig.get("memo"),
+                }
+                for sig in signatures
+            ],
+        )
+        for tx in written:
+            escrow_events.bus.publish(escrow_id, "transaction", tx)
+        latest_deposit = next((tx for tx in rows if tx["tx_type"] == "deposit"), None)
+
+    if next_position != position:
+        await store.set_escrow_funding_scan(escrow_id, *next_position)
+    draining = next_position[1] is not None
+    if draining:
+        logger.info(
+            "Signature backlog for escrow %s exceeds %s pages; resuming below %s next scan",
+            escrow_id,
+            settings.funding_signature_scan_max_pages,
+            next_position[1],
+        )
 
-    if latest_deposit:
-        return latest_deposit
-    return _latest_transaction_for_type(escrow_id, "deposit")
+    if not latest_deposit:
+        latest_deposit = await store.latest_transaction_of_type(escrow_id, "deposit")
+    if change_marker is not None and not draining and (
+        latest_deposit is None
+        or solana_service.commitment_satisfied(latest_deposit.get("status"), "confirmed")
+    ):
+        _funding_signature_scan_marker.set(escrow_id, change_marker)
+    return latest_deposit
+
+
+async def _scan_address_signatures(
+    public_key: str,
+    cursor: Optional[str],
+    resume_before: Optional[str],
+    resume_cursor: Optional[str],
+) -> tuple[list[dict], tuple[Optional[str], Optional[str], Optional[str]]]:
+    """
+    One budgeted scan of the address's signatures above the cursor, newest first.
+    Returns the signatures seen and the next (cursor, resume_before, resume_cursor).
+
+    When the budget runs out the cursor stays put, since nothing older than the
+    scan has been seen, and later scans resume below the oldest signature seen
+    (resume_before) until they reach the cursor. resume_cursor is where the cursor
+    can move once they do. While a backlog drains, each scan still reads one page
+    from the top so new deposits show up.
+    """
+    page_limit = max(1, int(settings.funding_signature_scan_limit))
+    max_pages = max(1, int(settings.funding_signature_scan_max_pages))
+    signatures, complete = await solana_service.list_signatures_since(
+        public_key,
+        cursor,
+        page_limit=page_limit,
+        max_pages=1 if resume_before else max_pages,
+    )
+    if complete:
+        return signatures, (_next_signature_cursor(signatures, cursor), None, None)
+    if not resume_before:
+        resume = (signatures[-1]["signature"], _resume_cursor(signatures, None))
+        return signatures, (cursor, *resume)
+
+    backlog, complete = await solana_service.list_signatures_since(
+        public_key,
+        cursor,
+        before=resume_before,
+        page_limit=page_limit,
+        max_pages=max(1, max_pages - 1),
+    )
+    seen = {sig["signature"] for sig in signatures}
+    signatures += [sig for sig in backlog if sig["signature"] not in seen]
+    resume_cursor = _resume_cursor(backlog, resume_cursor)
+    if complete:
+        # Everything between the cursor and the first incomplete scan has been seen.
+        return signatures, (resume_cursor or cursor, None, None)
+    return signatures, (cursor, backlog[-1]["signature"] if backlog else resume_before, resume_cursor)
+
+
+def _resume_cursor(backlog: list[dict], resume_cursor: Optional[str]) -> Optional[str]:
+    """
+    Where the cursor can move once everything below the backlog (newest first) is
+    seen: the top of its oldest run of finalized signatures, or resume_cursor, the
+    same mark for the signatures just above it, when the whole backlog is finalized.
+    """
+    if all(item.get("status") == "finalized" for item in backlog):
+        return resume_cursor or (backlog[0]["signature"] if backlog else None)
+    return _next_signature_cursor(backlog, None)
+
+
+def _next_signature_cursor(signatures: list[dict], cursor: Optional[str]) -> Optional[str]:
+    """
+    Advance the high-water mark over the oldest run of finalized signatures.
+    Anything newer stays above the cursor so its status keeps being refreshed.
+    """
+    for item in reversed(signatures):
+        if item.get("status") != "finalized":
+            break
+        cursor = item["signature"]
+    return cursor
 
 
 def _hash_token(value: str) -> str:
@@ -1131,14 +1750,18 @@ def _derive_non_terminal_status(escrow: dict) -> str:
     return "open"
 
 
-def _get_escrow_by_public_id(public_id: str) -> dict:
-    escrow = store.get_escrow_by_public_id(public_id)
+async def _get_escrow_by_public_id(
+    public_id: str,
+    fresh: bool = False,
+    projection: str = "full",
+) -> dict:
+    escrow = await store.get_escrow_by_public_id(public_id, fresh=fresh, projection=projection)
     if not escrow:
         raise EscrowNotFoundError(public_id)
     return escrow
 
 
-def _get_escrow_by_public_id_for_write(public_id: str, actor_user_id: str) -> dict:
-    escrow = _get_escrow_by_public_id(public_id)
+async def _get_escrow_by_public_id_for_write(public_id: str, actor_user_id: str) -> dict:
+    escrow = await _get_escrow_by_public_id(public_id, fresh=True)
     _require_sender_or_creator(escrow, actor_user_id)
     return escrow
@@ -0,0 +1,234 @@
+"""
+Pool of Solana JSON-RPC endpoints.
+
+Each endpoint is probed in the background with getHealth and getSlot. Reads go
+to the fastest healthy endpoint and fail over down the ranking on transport
+errors; sendTransaction is fanned out to several healthy endpoints at once.
+"""
+
+import asyncio
+import logging
+import re
+import time
+from typing import Awaitable, Callable, Optional, TypeVar
+from urllib.parse import urlsplit
+
+import httpx
+from solana.exceptions import SolanaRpcException
+from solana.rpc.async_api import AsyncClient
+from solana.rpc.types import TxOpts
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+_LATENCY_SMOOTHING = 0.3  # weight of the newest sample in the latency EWMA
+_UNPROBED_LATENCY_SECONDS = 1.0
+_PROBE_TIMEOUT = httpx.Timeout(timeout=5.0, connect=2.0)
+
+# Errors that say something about the endpoint rather than about the request.
+_TRANSPORT_ERRORS = (SolanaRpcException, httpx.HTTPError, OSError, asyncio.TimeoutError)
+_URL_PATTERN = re.compile(r"\b(?:https?|wss?)://[^\s'\"<>]+")
+
+
+def redact_url(url: str) -> str:
+    """
+    The URL without path, query or credentials. Provider RPC URLs commonly
+    carry an API key in one of those, so only this form is shown to clients.
+    """
+    parts = urlsplit(url)
+    if not parts.scheme or not parts.hostname:
+        return "<redacted>"
+    port = f":{parts.port}" if parts.port else ""
+    return f"{parts.scheme}://{parts.hostname}{port}"
+
+
+def redact_urls(text: str) -> str:
+    """text with every URL in it passed through redact_url."""
+    return _URL_PATTERN.sub(lambda match: redact_url(match.group(0)), text)
+
+
+class RpcEndpoint:
+    def __init__(self, url: str):
+        self.url = url
+        self.client = AsyncClient(url)
+        self.healthy = True
+        self.latency: Optional[float] = None
+        self.slot: Optional[int] = None
+        self.last_error: Optional[str] = None
+
+    def record_latency(self, seconds: float) -> None:
+        if self.latency is None:
+            self.latency = seconds
+        else:
+            self.latency = (1 - _LATENCY_SMOOTHING) * self.latency + _LATENCY_SMOOTHING * seconds
+
+    def mark_failed(self, exc: BaseException) -> None:
+        self.healthy = False
+        self.last_error = str(exc) or exc.__class__.__name__
+
+    def snapshot(self) -> dict:
+        """Health fields safe to show to clients: the URL and errors are redacted."""
+        return {
+            "url": redact_url(self.url),
+            "healthy": self.healthy,
+            "latency_ms": round(self.latency * 1000, 1) if self.latency is not None else None,
+            "slot": self.slot,
+            "last_error": redact_urls(self.last_error) if self.last_error else None,
+        }
+
+
+class RpcPool:
+    def __init__(
+        self,
+        urls: list[str],
+        *,
+        probe_interval_seconds: float = 10.0,
+        max_slot_lag: int = 50,
+        send_fanout: int = 3,
+    ):
+        unique_urls = list(dict.fromkeys(url for url in urls if url))
+        if not unique_urls:
+            raise ValueError("RpcPool needs at least one endpoint URL")
+        self.endpoints = [RpcEndpoint(url) for url in unique_urls]
+        self._probe_interval = max(1.0, probe_interval_seconds)
+        self._max_slot_lag = max(0, max_slot_lag)
+        self._send_fanout = max(1, send_fanout)
+        self._task: Optional[asyncio.Task] = None
+        self._probe_client = httpx.AsyncClient(timeout=_PROBE_TIMEOUT)
+        # Keeps fan-out sends that lost the race alive until they finish.
+        self._background: set[asyncio.Task] = set()
+
+    @property
+    def primary(self) -> RpcEndpoint:
+        return self.ranked()[0]
+
+    def ranked(self) -> list[RpcEndpoint]:
+        """Healthy endpoints fastest first, then unhealthy ones as a last resort."""
+        return sorted(
+            self.endpoints,
+            key=lambda ep: (
+                not ep.healthy,
+                ep.latency if ep.latency is not None else _UNPROBED_LATENCY_SECONDS,
+            ),
+        )
+
+    async def read(self, operation: Callable[[AsyncClient], Awaitable[T]]) -> tuple[T, str]:
+        """Run a read on the best endpoint, failing over on transport errors. Returns (result, url)."""
+        last_error: Optional[BaseException] = None
+        for endpoint in self.ranked():
+            started = time.monotonic()
+            try:
+                result = await operation(endpoint.client)
+            except _TRANSPORT_ERRORS as exc:
+                endpoint.mark_failed(exc)
+                last_error = exc
+                continue
+            endpoint.record_latency(time.monotonic() - started)
+            return result, endpoint.url
+        raise last_error or ConnectionError("No Solana RPC endpoint available")
+
+    async def send_raw_transaction(self, payload: bytes, opts: TxOpts) -> tuple[str, str]:
+        """
+        Broadcast a signed transaction to the fastest healthy endpoints.
+        Returns (signature, url) from the first endpoint that accepts it; the
+        remaining sends keep running in the background.
+        """
+        targets = [ep for ep in self.ranked() if ep.healthy][: self._send_fanout]
+        if not targets:
+            targets = self.ranked()[:1]
+
+        pending: dict[asyncio.Task, RpcEndpoint] = {
+            asyncio.create_task(ep.client.send_raw_transaction(payload, opts=opts)): ep
+            for ep in targets
+        }
+        last_error: Optional[BaseException] = None
+        try:
+            while pending:
+                done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    endpoint = pending.pop(task)
+                    exc = task.exception()
+                    if exc is None:
+                        return str(task.result().value), endpoint.url
+                    if isinstance(exc, _TRANSPORT_ERRORS):
+                        endpoint.mark_failed(exc)
+                    last_error = exc
+            raise last_error or ConnectionError("No Solana RPC endpoint accepted the transaction")
+        finally:
+            for task in pending:
+                self._background.add(task)
+                task.add_done_callback(self._finish_background_send)
+
+    def _finish_background_send(self, task: asyncio.Task) -> None:
+        self._background.discard(task)
+        if not task.cancelled():
+            # Duplicate submissions are expected to fail with "already processed".
+            task.exception()
+
+    async def probe(self) -> None:
+        """Refresh health, latency and slot for every endpoint."""
+        await asyncio.gather(*(self._probe_endpoint(ep) for ep in self.endpoints))
+        slots = [ep.slot for ep in self.endpoints if ep.healthy and ep.slot is not None]
+        if not slots:
+            return
+        tip = max(slots)
+        for endpoint in self.endpoints:
+            if endpoint.slot is None or not endpoint.healthy:
+                continue
+            lag = tip - endpoint.slot
+            if lag > self._max_slot_lag:
+                endpoint.healthy = False
+                endpoint.last_error = f"{lag} slots behind"
+
+    async def _probe_endpoint(self, endpoint: RpcEndpoint) -> None:
+        try:
+            response = await self._probe_client.post(
+                endpoint.url,
+                json={"jsonrpc": "2.0", "id": 1, "method": "getHealth"},
+            )
+            response.raise_for_status()
+            body = response.json()
+            if not isinstance(body, dict) or body.get("result") != "ok":
+                error = body.get("error") if isinstance(body, dict) else None
+                endpoint.mark_failed(ConnectionError(f"getHealth: {error or body}"))
+                return
+            started = time.monotonic()
+            endpoint.slot = (await endpoint.client.get_slot()).value
+            endpoint.record_latency(time.monotonic() - started)
+        except Exception as exc:
+            endpoint.mark_failed(exc)
+            return
+        endpoint.healthy = True
+        endpoint.last_error = None
+
+    def start(self) -> None:
+        # Probe even a single endpoint: a failed read marks it unhealthy, and only
+        # a probe marks it healthy again.
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    async def aclose(self) -> None:
+        await self.stop()
+        for task in list(self._background):
+            task.cancel()
+        await asyncio.gather(*self._background, return_exceptions=True)
+        for endpoint in self.endpoints:
+            await endpoint.client.close()
+        await self._probe_client.aclose()
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await self.probe()
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("Solana RPC probe failed")
+            await asyncio.sleep(self._probe_interval)
@@ -1,10 +1,11 @@
+import asyncio
 import base58
-import httpx
+import itertools
+import json
+import logging
 import time
-from threading import Lock
 from typing import Optional
 
-from solana.rpc.api import Client
 from solana.rpc.types import TxOpts
 from solders.keypair import Keypair
 from solders.message import Message
@@ -13,16 +14,28 @@ from solders.signature import Signature
 from solders.system_program import TransferParams, transfer
 from solders.transaction import Transaction
 
+from app.cache import SingleFlight, TTLCache
 from app.config import settings
 from app.exceptions import InvalidAddressError, SolanaRPCError
+from app.services import solana_rpc_pool, solana_subscriptions, solana_tx_facts
 
-client = Client(settings.solana_rpc_url)
+logger = logging.getLogger(__name__)
+
+_pool = solana_rpc_pool.RpcPool(
+    [settings.solana_rpc_url, *settings.solana_rpc_urls],
+    probe_interval_seconds=settings.solana_rpc_probe_interval_seconds,
+    max_slot_lag=settings.solana_rpc_max_slot_lag,
+    send_fanout=settings.solana_rpc_send_fanout,
+)
 
 TRANSFER_FEE_LAMPORTS = 5000  # standard base fee per signature
 DEFAULT_COMMITMENT = "confirmed"
 DEFAULT_POLL_SECONDS = 1.0
+MAX_POLL_SECONDS = 4.0
 DEFAULT_TIMEOUT_SECONDS = 25.0
 DEFAULT_SEND_RETRIES = 1
+MAX_SIGNATURE_STATUSES_PER_REQUEST = 256  # getSignatureStatuses limit
+MAX_ACCOUNTS_PER_REQUEST = 100  # getMultipleAccounts limit
 
 _COMMITMENT_RANK = {
     "not_found": 0,
@@ -31,13 +44,79 @@ _COMMITMENT_RANK = {
     "finalized": 3,
 }
 
-_balance_cache: dict[str, tuple[int, float]] = {}
-_tx_status_cache: dict[str, tuple[dict, float]] = {}
-_signatures_cache: dict[tuple[str, int], tuple[list[dict], float]] = {}
-_balance_cache_lock = Lock()
-_tx_status_cache_lock = Lock()
-_signatures_cache_lock = Lock()
-_rpc_http_client = httpx.Client(timeout=httpx.Timeout(timeout=8.0, connect=3.0))
+_NEXT_COMMITMENT = {
+    "not_found": "processed",
+    "processed": "confirmed",
+    "confirmed": "finalized",
+}
+
+_balance_cache = TTLCache(
+    "solana_balances",
+    settings.solana_balance_cache_max_entries,
+    settings.solana_balance_cache_ttl_seconds,
+)
+_tx_status_cache = TTLCache(
+    "solana_signature_statuses",
+    settings.solana_tx_status_cache_max_entries,
+    settings.solana_tx_status_cache_ttl_seconds,
+)
+_signatures_cache = TTLCache(
+    "solana_address_signatures",
+    settings.solana_signatures_cache_max_entries,
+    settings.solana_signatures_cache_ttl_seconds,
+)
+_rpc_flights = SingleFlight("solana_rpc_reads")
+_tx_facts: Optional[solana_tx_facts.TransactionFactsCache] = (
+    solana_tx_facts.TransactionFactsCache(
+        settings.solana_tx_facts_cache_path,
+        settings.solana_tx_facts_cache_max_entries,
+    )
+    if settings.solana_tx_facts_cache_path
+    else None
+)
+# Balances pushed by accountSubscribe, with the websocket that pushed them, and
+# a per-address change marker replaced on every push. Markers come from one
+# process-wide sequence, so an address whose entries were dropped never gets
+# back a marker it had before. Entries only exist for watched addresses: an
+# unknown-state push (reconnect, eviction) drops them.
+_pushed_balances: dict[str, tuple[str, int]] = {}
+_account_change_counters: dict[str, int] = {}
+_account_change_sequence = itertools.count(1)
+
+
+def start_rpc_probes() -> None:
+    """Start background health/latency probes for the RPC pool."""
+    _pool.start()
+
+
+async def _coalesced_read(key: tuple, operation):
+    """Run a pool read, sharing it with identical reads already in flight."""
+    return await _rpc_flights.do(key, lambda: _pool.read(operation))
+
+
+async def start_subscriptions() -> None:
+    """Open a subscription websocket per RPC endpoint, when subscriptions are enabled."""
+    await solana_subscriptions.start(
+        rpc_endpoint_urls(),
+        on_account_notification,
+        ranked_rpc_urls=lambda: [endpoint.url for endpoint in _pool.ranked()],
+    )
+
+
+def rpc_endpoint_urls() -> list[str]:
+    return [endpoint.url for endpoint in _pool.endpoints]
+
+
+def rpc_endpoints() -> list[dict]:
+    """Current health, latency and slot per RPC endpoint, best first."""
+    return [endpoint.snapshot() for endpoint in _pool.ranked()]
+
+
+async def aclose() -> None:
+    """Close the shared RPC clients (called from the app lifespan)."""
+    await _pool.aclose()
+    if _tx_facts is not None:
+        await _tx_facts.aclose()
 
 
 def generate_keypair() -> tuple[str, str]:
@@ -67,28 +146,68 @@ def validate_address(address: str) -> bool:
     return True
 
 
-def get_balance(public_key_b58: str) -> int:
+async def get_balance(public_key_b58: str) -> int:
     """Get balance in lamports for a Solana address."""
-    ttl = max(0.0, float(settings.solana_balance_cache_ttl_seconds))
-    if ttl > 0:
-        now = time.monotonic()
-        with _balance_cache_lock:
-            cached = _balance_cache.get(public_key_b58)
-            if cached and cached[1] > now:
-                return cached[0]
+    engine = solana_subscriptions.active_engine()
+    if engine is not None and engine.is_watching(public_key_b58):
+        # Only trust a push from the socket currently serving reads.
+        pushed = _pushed_balances.get(public_key_b58)
+        if pushed is not None and pushed[0] == engine.ws_url:
+            return pushed[1]
+
+    cached = _balance_cache.get(public_key_b58)
+    if cached is not None:
+        return cached
 
     pubkey = _parse_pubkey(public_key_b58)
     try:
-        response = client.get_balance(pubkey)
+        response, _ = await _coalesced_read(
+            ("getBalance", public_key_b58),
+            lambda rpc: rpc.get_balance(pubkey),
+        )
         value = response.value
-        if ttl > 0:
-            with _balance_cache_lock:
-                _balance_cache[public_key_b58] = (value, time.monotonic() + ttl)
+        _balance_cache.set(public_key_b58, value)
         return value
     except Exception as e:
         raise SolanaRPCError(str(e))
 
 
+async def get_balances(public_keys_b58: list[str]) -> dict[str, int]:
+    """Get balances for many addresses, batching uncached lookups with getMultipleAccounts."""
+    balances: dict[str, int] = {}
+    missing: list[str] = []
+    unique_keys = list(dict.fromkeys(public_keys_b58))
+    for public_key_b58 in unique_keys:
+        cached = _balance_cache.get(public_key_b58)
+        if cached is not None:
+            balances[public_key_b58] = cached
+        else:
+            missing.append(public_key_b58)
+
+    pubkeys = [_parse_pubkey(public_key_b58) for public_key_b58 in missing]
+    for start in range(0, len(missing), MAX_ACCOUNTS_PER_REQUEST):
+        chunk = missing[start : start + MAX_ACCOUNTS_PER_REQUEST]
+        try:
+            chunk_pubkeys = pubkeys[start : start + MAX_ACCOUNTS_PER_REQUEST]
+            response, _ = await _coalesced_read(
+                ("getMultipleAccounts", tuple(chunk)),
+                lambda rpc: rpc.get_multiple_accounts(chunk_pubkeys),
+            )
+        except Exception as e:
+            raise SolanaRPCError(str(e))
+
+        # Accounts that do not exist yet come back as None and hold zero lamports.
+        fetched = {
+            public_key_b58: account.lamports if account is not None else 0
+            for public_key_b58, account in zip(chunk, response.value)
+        }
+        balances.update(fetched)
+        for public_key_b58, value in fetched.items():
+            _balance_cache.set(public_key_b58, value)
+
+    return {public_key_b58: balances[public_key_b58] for public_key_b58 in unique_keys}
+
+
 def cluster_from_rpc_url(rpc_url: str) -> str:
     lower = rpc_url.lower()
     if "devnet" in lower:
@@ -120,133 +239,209 @@ def commitment_satisfied(current: Optional[str], target: Optional[str]) -> bool:
     return current_rank >= target_rank
 
 
-def get_transaction_status(signature_b58: str) -> dict:
+async def get_transaction_status(signature_b58: str) -> dict:
     """Check status of a transaction signature on-chain."""
-    ttl = max(0.0, float(settings.solana_tx_status_cache_ttl_seconds))
-    if ttl > 0:
-        now = time.monotonic()
-        with _tx_status_cache_lock:
-            cached = _tx_status_cache.get(signature_b58)
-            if cached and cached[1] > now:
-                return dict(cached[0])
+    statuses = await get_transaction_statuses([signature_b58])
+    return statuses[signature_b58]
+
+
+async def get_transaction_statuses(signatures_b58: list[str]) -> dict[str, dict]:
+    """Check status of many signatures, batching uncached lookups at the RPC limit."""
+    results: dict[str, dict] = {}
+    missing: list[str] = []
+    for signature_b58 in dict.fromkeys(signatures_b58):
+        cached = _tx_status_cache.get(signature_b58)
+        if cached is not None:
+            results[signature_b58] = dict(cached)
+        else:
+            missing.append(signature_b58)
+
+    if missing:
+        results.update(await _fetch_signature_statuses(missing))
+    return {signature_b58: results[signature_b58] for signature_b58 in signatures_b58}
+
+
+async def _fetch_signature_statuses(signatures_b58: list[str]) -> dict[str, dict]:
+    """Fetch statuses from the RPC in chunks, refreshing _tx_status_cache."""
+    parsed: list[Signature] = []
+    for signature_b58 in signatures_b58:
+        try:
+            parsed.append(Signature.from_string(signature_b58))
+        except Exception:
+            raise InvalidAddressError(signature_b58)
 
-    try:
-        sig = Signature.from_string(signature_b58)
-    except Exception:
-        raise InvalidAddressError(signature_b58)
+    results: dict[str, dict] = {}
+    for start in range(0, len(signatures_b58), MAX_SIGNATURE_STATUSES_PER_REQUEST):
+        chunk = signatures_b58[start : start + MAX_SIGNATURE_STATUSES_PER_REQUEST]
+        try:
+            chunk_signatures = parsed[start : start + MAX_SIGNATURE_STATUSES_PER_REQUEST]
+            response, _ = await _coalesced_read(
+                ("getSignatureStatuses", tuple(chunk)),
+                lambda rpc: rpc.get_signature_statuses(chunk_signatures),
+            )
+        except Exception as e:
+            raise SolanaRPCError(str(e))
 
-    try:
-        response = client.get_signature_statuses([sig])
-    except Exception as e:
-        raise SolanaRPCError(str(e))
+        fetched = {
+            signature_b58: _status_from_rpc(status_info)
+            for signature_b58, status_info in zip(chunk, response.value)
+        }
+        results.update(fetched)
+        for signature_b58, result in fetched.items():
+            _tx_status_cache.set(signature_b58, dict(result))
+    return results
 
-    status_info = response.value[0]
+
+def _status_from_rpc(status_info) -> dict:
     if status_info is None:
-        result = {
+        return {
             "status": "not_found",
             "slot": None,
             "confirmations": None,
             "err": None,
         }
-        if ttl > 0:
-            with _tx_status_cache_lock:
-                _tx_status_cache[signature_b58] = (dict(result), time.monotonic() + ttl)
-        return result
-
-    result = {
+    return {
         "status": _normalize_commitment(status_info.confirmation_status),
         "slot": status_info.slot,
         "confirmations": status_info.confirmations,
         "err": str(status_info.err) if status_info.err else None,
     }
-    if ttl > 0:
-        with _tx_status_cache_lock:
-            _tx_status_cache[signature_b58] = (dict(result), time.monotonic() + ttl)
-    return result
 
 
-def list_recent_signatures_for_address(public_key_b58: str, limit: int = 25) -> list[dict]:
+async def list_recent_signatures_for_address(public_key_b58: str, limit: int = 25) -> list[dict]:
     """List recent transaction signatures seen for an address."""
-    ttl = max(0.0, float(settings.solana_signatures_cache_ttl_seconds))
     cache_key = (public_key_b58, int(limit))
-    if ttl > 0:
-        now = time.monotonic()
-        with _signatures_cache_lock:
-            cached = _signatures_cache.get(cache_key)
-            if cached and cached[1] > now:
-                # Return a shallow copy so callers can't mutate the cached list in-place.
-                return [dict(item) for item in cached[0]]
+    cached = _signatures_cache.get(cache_key)
+    if cached is not None:
+        # Return a shallow copy so callers can't mutate the cached list in-place.
+        return [dict(item) for item in cached]
 
     pubkey = _parse_pubkey(public_key_b58)
     try:
-        response = client.get_signatures_for_address(pubkey, limit=limit)
+        response, rpc_endpoint = await _coalesced_read(
+            ("getSignaturesForAddress", public_key_b58, int(limit)),
+            lambda rpc: rpc.get_signatures_for_address(pubkey, limit=limit),
+        )
     except Exception as e:
         raise SolanaRPCError(str(e))
 
-    items = response.value or []
+    signatures = [_signature_info(item, rpc_endpoint) for item in response.value or []]
+    _signatures_cache.set(cache_key, [dict(item) for item in signatures])
+
+    return signatures
+
+
+async def list_signatures_since(
+    public_key_b58: str,
+    until: Optional[str],
+    *,
+    before: Optional[str] = None,
+    page_limit: int = 1000,
+    max_pages: int = 20,
+) -> tuple[list[dict], bool]:
+    """
+    List signatures for an address newer than `until` (all of them when None) and
+    older than `before` (from the newest when None), newest first.
+    Pages backwards with `before` until the backlog is drained or max_pages is hit.
+    Returns (signatures, complete) where complete is False if max_pages cut the scan short.
+    """
+    pubkey = _parse_pubkey(public_key_b58)
+    until_signature = Signature.from_string(until) if until else None
+    page_limit = max(1, min(int(page_limit), 1000))
     signatures: list[dict] = []
-    for item in items:
-        signatures.append(
-            {
-                "signature": str(item.signature),
-                "status": _normalize_commitment(getattr(item, "confirmation_status", None)),
-                "slot": getattr(item, "slot", None),
-                "err": str(item.err) if getattr(item, "err", None) else None,
-                "memo": getattr(item, "memo", None),
-                "block_time": getattr(item, "block_time", None),
-            }
-        )
+    before_signature: Optional[Signature] = Signature.from_string(before) if before else None
 
-    if ttl > 0:
-        with _signatures_cache_lock:
-            _signatures_cache[cache_key] = ([dict(item) for item in signatures], time.monotonic() + ttl)
+    for _ in range(max(1, int(max_pages))):
+        page_before = before_signature
+        try:
+            response, rpc_endpoint = await _coalesced_read(
+                ("getSignaturesForAddress", public_key_b58, page_limit, str(page_before), until),
+                lambda rpc: rpc.get_signatures_for_address(
+                    pubkey,
+                    before=page_before,
+                    until=until_signature,
+                    limit=page_limit,
+                ),
+            )
+        except Exception as e:
+            raise SolanaRPCError(str(e))
+
+        items = response.value or []
+        signatures.extend(_signature_info(item, rpc_endpoint) for item in items)
+        if len(items) < page_limit:
+            return signatures, True
+        before_signature = items[-1].signature
+
+    return signatures, False
+
+
+def _signature_info(item, rpc_endpoint: str) -> dict:
+    return {
+        "signature": str(item.signature),
+        "status": _normalize_commitment(getattr(item, "confirmation_status", None)),
+        "slot": getattr(item, "slot", None),
+        "err": str(item.err) if getattr(item, "err", None) else None,
+        "memo": getattr(item, "memo", None),
+        "block_time": getattr(item, "block_time", None),
+        "rpc_endpoint": rpc_endpoint,
+    }
 
-    return signatures
 
+async def _sign_and_send(
+    from_kp: Keypair,
+    to_pubkey: Pubkey,
+    amount_lamports: int,
+    normalized_target: str,
+) -> tuple[str, int, str]:
+    """
+    Build, sign and broadcast one transfer.
+    Returns (signature, last_valid_block_height, rpc_endpoint that accepted it).
+    """
+    transfer_ix = transfer(
+        TransferParams(
+            from_pubkey=from_kp.pubkey(),
+            to_pubkey=to_pubkey,
+            lamports=amount_lamports,
+        )
+    )
 
-def send_transfer_with_confirmation(
+    latest = (await _pool.read(lambda rpc: rpc.get_latest_blockhash()))[0].value
+    blockhash = latest.blockhash
+    last_valid_block_height = latest.last_valid_block_height
+
+    message = Message([transfer_ix], from_kp.pubkey())
+    transaction = Transaction([from_kp], message, blockhash)
+    signature, rpc_endpoint = await _pool.send_raw_transaction(
+        bytes(transaction),
+        TxOpts(
+            skip_preflight=False,
+            preflight_commitment=normalized_target,
+            max_retries=3,
+            last_valid_block_height=last_valid_block_height,
+        ),
+    )
+    return signature, last_valid_block_height, rpc_endpoint
+
+
+async def submit_transfer(
     from_secret_key_b58: str,
     to_public_key_b58: str,
     amount_lamports: int,
     *,
     commitment_target: str = DEFAULT_COMMITMENT,
-    timeout_seconds: float = DEFAULT_TIMEOUT_SECONDS,
-    poll_seconds: float = DEFAULT_POLL_SECONDS,
     max_send_retries: int = DEFAULT_SEND_RETRIES,
 ) -> dict:
-    """Sign, send, and wait for a transfer to reach a target commitment."""
+    """Sign and send a transfer without waiting for it to confirm."""
     from_kp = _restore_keypair(from_secret_key_b58)
     to_pubkey = _parse_pubkey(to_public_key_b58)
     normalized_target = _normalize_commitment(commitment_target)
 
     last_error: Optional[str] = None
-
     for attempt in range(max_send_retries + 1):
         try:
-            transfer_ix = transfer(
-                TransferParams(
-                    from_pubkey=from_kp.pubkey(),
-                    to_pubkey=to_pubkey,
-                    lamports=amount_lamports,
-                )
-            )
-
-            latest = client.get_latest_blockhash().value
-            blockhash = latest.blockhash
-            last_valid_block_height = latest.last_valid_block_height
-
-            message = Message([transfer_ix], from_kp.pubkey())
-            transaction = Transaction([from_kp], message, blockhash)
-            response = client.send_transaction(
-                transaction,
-                opts=TxOpts(
-                    skip_preflight=False,
-                    preflight_commitment=normalized_target,
-                    max_retries=3,
-                    last_valid_block_height=last_valid_block_height,
-                ),
+            signature, last_valid_block_height, rpc_endpoint = await _sign_and_send(
+                from_kp, to_pubkey, amount_lamports, normalized_target
             )
-            signature = str(response.value)
         except (InvalidAddressError, SolanaRPCError):
             raise
         except Exception as e:
@@ -255,40 +450,387 @@ def send_transfer_with_confirmation(
                 raise SolanaRPCError(last_error)
             continue
 
-        deadline = time.monotonic() + timeout_seconds
-        latest_status: Optional[dict] = None
-        while time.monotonic() < deadline:
-            latest_status = get_transaction_status(signature)
-            if latest_status["err"]:
-                raise SolanaRPCError(
-                    f"Transaction {signature} failed: {latest_status['err']}"
-                )
-            if commitment_satisfied(latest_status["status"], normalized_target):
-                return {
-                    "signature": signature,
-                    "status": latest_status["status"],
-                    "slot": latest_status["slot"],
-                    "confirmations": latest_status["confirmations"],
-                    "err": latest_status["err"],
-                    "commitment_target": normalized_target,
-                    "last_valid_block_height": last_valid_block_height,
-                    "rpc_endpoint": settings.solana_rpc_url,
+        return {
+            "signature": signature,
+            "status": "pending",
+            "commitment_target": normalized_target,
+            "last_valid_block_height": last_valid_block_height,
+            "rpc_endpoint": rpc_endpoint,
+        }
+
+    raise SolanaRPCError(last_error or "Unknown transfer submission error")
+
+
+async def wait_for_confirmation(
+    signature: str,
+    last_valid_block_height: Optional[int],
+    *,
+    commitment_target: str = DEFAULT_COMMITMENT,
+    timeout_seconds: float = DEFAULT_TIMEOUT_SECONDS,
+) -> Optional[dict]:
+    """
+    Wait for a sent transaction to reach the target commitment.
+    Returns None on timeout or blockhash expiry; raises SolanaRPCError if it failed on-chain.
+    Without last_valid_block_height it waits for the full timeout.
+    """
+    normalized_target = _normalize_commitment(commitment_target)
+    deadline = time.monotonic() + timeout_seconds
+    latest_status: Optional[dict] = None
+    engine = solana_subscriptions.active_engine()
+    try:
+        if engine is None:
+            raise ConnectionError("Solana subscriptions are not active")
+        latest_status = await _wait_via_subscription(
+            engine,
+            signature,
+            normalized_target,
+            last_valid_block_height,
+            timeout_seconds,
+        )
+    except ConnectionError:
+        # Fall back to the shared poller for whatever time budget is left.
+        latest_status = await _confirmations.wait(
+            signature,
+            last_valid_block_height,
+            normalized_target,
+            max(0.0, deadline - time.monotonic()),
+        )
+    if latest_status is None:
+        return None
+    return {
+        "signature": signature,
+        "status": latest_status["status"],
+        "slot": latest_status["slot"],
+        "confirmations": latest_status["confirmations"],
+        "err": latest_status["err"],
+        "commitment_target": normalized_target,
+        "last_valid_block_height": last_valid_block_height,
+        "rpc_endpoint": _pool.primary.url,
+    }
+
+
+async def _wait_via_subscription(
+    engine: "solana_subscriptions.SubscriptionEngine",
+    signature: str,
+    commitment_target: str,
+    last_valid_block_height: Optional[int],
+    timeout_seconds: float,
+) -> Optional[dict]:
+    try:
+        subscription_id, notified = await engine.subscribe_signature(signature, commitment_target)
+    except asyncio.TimeoutError:
+        raise ConnectionError("Solana websocket did not acknowledge signatureSubscribe")
+
+    try:
+        # The transaction may have landed before the subscription was registered.
+        status = await _signature_status_if_reachable(signature)
+        if status is None or (
+            not status["err"] and not commitment_satisfied(status["status"], commitment_target)
+        ):
+            notification = await _wait_for_notification(
+                notified, last_valid_block_height, timeout_seconds
+            )
+            if notification is None:
+                # Final check in case the notification was lost.
+                status = await _signature_status_if_reachable(signature)
+            else:
+                status = {
+                    "status": commitment_target,
+                    "slot": notification["slot"],
+                    "confirmations": None,
+                    "err": notification["err"],
                 }
+    finally:
+        await engine.unsubscribe_signature(subscription_id)
+
+    if status is None:
+        return None
+    if status["err"]:
+        raise SolanaRPCError(f"Transaction {signature} failed: {status['err']}")
+    if commitment_satisfied(status["status"], commitment_target):
+        return status
+    return None
+
+
+async def _signature_status_if_reachable(signature: str) -> Optional[dict]:
+    """The signature's status, or None when the RPC could not be asked right now."""
+    try:
+        return (await _fetch_signature_statuses([signature]))[signature]
+    except SolanaRPCError as exc:
+        logger.warning("Signature status check for %s failed: %s", signature, exc.detail)
+        return None
+
+
+async def _wait_for_notification(
+    notified: asyncio.Future,
+    last_valid_block_height: Optional[int],
+    timeout_seconds: float,
+) -> Optional[dict]:
+    """
+    The signature notification, or None on timeout or once the blockhash has
+    expired (checked every MAX_POLL_SECONDS, like the confirmation poller).
+    """
+    deadline = time.monotonic() + timeout_seconds
+    while True:
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            return None
+        if last_valid_block_height is not None:
+            remaining = min(remaining, MAX_POLL_SECONDS)
+        try:
+            return await asyncio.wait_for(asyncio.shield(notified), remaining)
+        except asyncio.TimeoutError:
+            pass
+        if last_valid_block_height is None:
+            continue
+        try:
+            current_height = (await _pool.read(lambda rpc: rpc.get_block_height()))[0].value
+        except Exception:
+            continue
+        if current_height > last_valid_block_height:
+            return None
+
+
+async def blockhash_expired(last_valid_block_height: Optional[int]) -> bool:
+    """
+    True once the chain is past last_valid_block_height, so a transaction built
+    on that blockhash can no longer land. False when that is unknown.
+    """
+    if last_valid_block_height is None:
+        return False
+    try:
+        current_height = (await _pool.read(lambda rpc: rpc.get_block_height()))[0].value
+    except Exception:
+        return False
+    return current_height > last_valid_block_height
+
 
+async def wait_for_status_change(
+    signature_b58: str,
+    known_status: str,
+    timeout_seconds: float,
+) -> dict:
+    """
+    Hold until the signature's status differs from known_status, it fails, or the
+    timeout runs out, then return its current status. Waits for a commitment ride
+    the shared subscription or confirmation poller, so each signature is watched
+    once; waits for an unknown signature to appear poll its status.
+    """
+    status = await get_transaction_status(signature_b58)
+    next_commitment = _NEXT_COMMITMENT.get(known_status)
+    if status["status"] != known_status or status["err"] or next_commitment is None:
+        return status
+    if known_status == "not_found":
+        # "not_found" has no place in the commitment order (it would count as
+        # already processed), so wait for the signature to show up instead.
+        return await _wait_for_signature_to_appear(signature_b58, timeout_seconds)
+    try:
+        await wait_for_confirmation(
+            signature_b58,
+            None,
+            commitment_target=next_commitment,
+            timeout_seconds=timeout_seconds,
+        )
+    except SolanaRPCError:
+        pass  # Failed on-chain; the fresh status below carries the error.
+    return (await _fetch_signature_statuses([signature_b58]))[signature_b58]
+
+
+async def _wait_for_signature_to_appear(signature_b58: str, timeout_seconds: float) -> dict:
+    """Poll until the RPC knows the signature or the timeout runs out; returns its status."""
+    deadline = time.monotonic() + timeout_seconds
+    interval = DEFAULT_POLL_SECONDS
+    while True:
+        await asyncio.sleep(max(0.0, min(interval, deadline - time.monotonic())))
+        status = (await _fetch_signature_statuses([signature_b58]))[signature_b58]
+        if status["status"] != "not_found" or time.monotonic() >= deadline:
+            return status
+        interval = min(interval * 1.5, MAX_POLL_SECONDS)
+
+
+async def watch_account(public_key_b58: str) -> Optional[int]:
+    """
+    Subscribe to pushed updates for an address.
+    Returns its change counter, or None when push updates are unavailable.
+    """
+    engine = solana_subscriptions.active_engine()
+    if engine is None or not await engine.subscribe_account(public_key_b58):
+        return None
+    return _account_change_marker(public_key_b58)
+
+
+def _account_change_marker(public_key_b58: str) -> int:
+    marker = _account_change_counters.get(public_key_b58)
+    if marker is None:
+        marker = _account_change_counters[public_key_b58] = next(_account_change_sequence)
+    return marker
+
+
+def on_account_notification(public_key_b58: str, lamports: Optional[int], ws_url: str) -> None:
+    """
+    Handle an accountSubscribe push from the websocket at ws_url; lamports is None
+    when the state is unknown, e.g. after a reconnect or once the address is no
+    longer subscribed.
+    """
+    if lamports is None:
+        _pushed_balances.pop(public_key_b58, None)
+        _account_change_counters.pop(public_key_b58, None)
+    else:
+        _pushed_balances[public_key_b58] = (ws_url, lamports)
+        _account_change_counters[public_key_b58] = next(_account_change_sequence)
+    _balance_cache.invalidate(public_key_b58)
+    _signatures_cache.invalidate_where(lambda cache_key: cache_key[0] == public_key_b58)
+
+
+class ConfirmationMultiplexer:
+    """
+    Tracks every in-flight signature in the process and polls them together.
+    Each tick costs one batched getSignatureStatuses plus one getBlockHeight,
+    no matter how many settlements are waiting. The tick interval backs off
+    while nothing changes and snaps back when a waiter resolves or arrives.
+    """
+
+    def __init__(self, min_interval: float, max_interval: float):
+        self._min_interval = min_interval
+        self._max_interval = max_interval
+        self._interval = min_interval
+        self._waiters: dict[str, list[tuple[str, Optional[int], asyncio.Future]]] = {}
+        self._task: Optional[asyncio.Task] = None
+        self._wakeup: Optional[asyncio.Event] = None
+
+    def in_flight(self) -> int:
+        return len(self._waiters)
+
+    async def wait(
+        self,
+        signature: str,
+        last_valid_block_height: Optional[int],
+        commitment_target: str,
+        timeout_seconds: float,
+    ) -> Optional[dict]:
+        future = asyncio.get_running_loop().create_future()
+        entry = (commitment_target, last_valid_block_height, future)
+        self._waiters.setdefault(signature, []).append(entry)
+        self._ensure_running()
+        if self._interval > self._min_interval:
+            self._interval = self._min_interval
+            self._wakeup.set()
+
+        try:
+            return await asyncio.wait_for(asyncio.shield(future), timeout_seconds)
+        except asyncio.TimeoutError:
+            return None
+        finally:
+            entries = self._waiters.get(signature)
+            if entries and entry in entries:
+                entries.remove(entry)
+                if not entries:
+                    self._waiters.pop(signature, None)
+
+    def _ensure_running(self) -> None:
+        loop = asyncio.get_running_loop()
+        if self._task and not self._task.done() and self._task.get_loop() is loop:
+            return
+        self._interval = self._min_interval
+        self._wakeup = asyncio.Event()
+        self._task = loop.create_task(self._run())
+
+    async def _run(self) -> None:
+        while self._waiters:
+            self._wakeup.clear()
             try:
-                current_height = client.get_block_height().value
-                if current_height > last_valid_block_height:
-                    break
-            except Exception:
-                # If block-height fetch fails transiently, continue polling by time budget.
+                await asyncio.wait_for(self._wakeup.wait(), self._interval)
+                # Woken by a new waiter: give a burst of submissions one shared tick.
+                await asyncio.sleep(self._min_interval)
+            except asyncio.TimeoutError:
                 pass
+            if self._waiters:
+                await self._tick()
+
+    async def _tick(self) -> None:
+        signatures = list(self._waiters)
+        try:
+            statuses = await _fetch_signature_statuses(signatures)
+        except Exception:
+            statuses = {}
+        try:
+            current_height: Optional[int] = (
+                await _pool.read(lambda rpc: rpc.get_block_height())
+            )[0].value
+        except Exception:
+            # If block-height fetch fails transiently, waiters fall back to their time budget.
+            current_height = None
+
+        progressed = False
+        for signature in signatures:
+            status = statuses.get(signature)
+            for commitment_target, last_valid_block_height, future in self._waiters.get(signature, []):
+                if future.done():
+                    continue
+                if status and status["err"]:
+                    future.set_exception(
+                        SolanaRPCError(f"Transaction {signature} failed: {status['err']}")
+                    )
+                elif status and commitment_satisfied(status["status"], commitment_target):
+                    future.set_result(dict(status))
+                elif (
+                    current_height is not None
+                    and last_valid_block_height is not None
+                    and current_height > last_valid_block_height
+                ):
+                    future.set_result(None)
+                else:
+                    continue
+                progressed = True
+
+        if progressed:
+            self._interval = self._min_interval
+        else:
+            self._interval = min(self._interval * 1.5, self._max_interval)
+
+
+_confirmations = ConfirmationMultiplexer(DEFAULT_POLL_SECONDS, MAX_POLL_SECONDS)
+
+
+async def send_transfer_with_confirmation(
+    from_secret_key_b58: str,
+    to_public_key_b58: str,
+    amount_lamports: int,
+    *,
+    commitment_target: str = DEFAULT_COMMITMENT,
+    timeout_seconds: float = DEFAULT_TIMEOUT_SECONDS,
+    max_send_retries: int = DEFAULT_SEND_RETRIES,
+) -> dict:
+    """Sign, send, and wait for a transfer to reach a target commitment."""
+    from_kp = _restore_keypair(from_secret_key_b58)
+    to_pubkey = _parse_pubkey(to_public_key_b58)
+    normalized_target = _normalize_commitment(commitment_target)
 
-            time.sleep(poll_seconds)
+    last_error: Optional[str] = None
 
-        if latest_status and latest_status.get("err"):
-            raise SolanaRPCError(
-                f"Transaction {signature} failed: {latest_status['err']}"
+    for attempt in range(max_send_retries + 1):
+        try:
+            signature, last_valid_block_height, rpc_endpoint = await _sign_and_send(
+                from_kp, to_pubkey, amount_lamports, normalized_target
             )
+        except (InvalidAddressError, SolanaRPCError):
+            raise
+        except Exception as e:
+            last_error = str(e)
+            if attempt >= max_send_retries:
+                raise SolanaRPCError(last_error)
+            continue
+
+        confirmation = await wait_for_confirmation(
+            signature,
+            last_valid_block_height,
+            commitment_target=normalized_target,
+            timeout_seconds=timeout_seconds,
+        )
+        if confirmation:
+            confirmation["rpc_endpoint"] = rpc_endpoint
+            return confirmation
+
         last_error = (
             f"Transaction {signature} did not reach {normalized_target} before "
             "timeout or blockhash expiry"
@@ -299,13 +841,13 @@ def send_transfer_with_confirmation(
     raise SolanaRPCError(last_error or "Unknown transfer confirmation error")
 
 
-def send_transfer(
+async def send_transfer(
     from_secret_key_b58: str,
     to_public_key_b58: str,
     amount_lamports: int,
 ) -> str:
     """Compatibility wrapper that returns only the confirmed signature."""
-    result = send_transfer_with_confirmation(
+    result = await send_transfer_with_confirmation(
         from_secret_key_b58,
         to_public_key_b58,
         amount_lamports,
@@ -313,40 +855,38 @@ def send_transfer(
     return result["signature"]
 
 
-def infer_system_transfer_sender(
-    signature_b58: str,
-    destination_public_key_b58: str,
-) -> Optional[str]:
-    """Best-effort parse of a signature to find source wallet that funded destination."""
-    _parse_pubkey(destination_public_key_b58)
-
-    payload = {
-        "jsonrpc": "2.0",
-        "id": 1,
-        "method": "getTransaction",
-        "params": [
-            signature_b58,
-            {"encoding": "jsonParsed", "maxSupportedTransactionVersion": 0},
-        ],
-    }
+async def _fetch_parsed_transaction(signature_b58: str, commitment: str) -> Optional[dict]:
     try:
-        response = _rpc_http_client.post(settings.solana_rpc_url, json=payload)
-        response.raise_for_status()
-        body = response.json()
+        signature = Signature.from_string(signature_b58)
     except Exception:
-        return None
-
-    tx_result = body.get("result") if isinstance(body, dict) else None
-    if not isinstance(tx_result, dict):
-        return None
-
+        raise InvalidAddressError(signature_b58)
+    response, _ = await _pool.read(
+        lambda rpc: rpc.get_transaction(
+            signature,
+            encoding="jsonParsed",
+            commitment=commitment,
+            max_supported_transaction_version=0,
+        )
+    )
+    # _transfer_facts reads the jsonParsed result as the RPC sends it.
+    body = json.loads(response.to_json())
+    result = body.get("result") if isinstance(body, dict) else None
+    return result if isinstance(result, dict) else None
+
+
+def _transfer_facts(signature_b58: str, tx_result: dict) -> dict:
+    """Extract system transfers and signers from a jsonParsed getTransaction result."""
+    facts = {
+        "signature": signature_b58,
+        "slot": tx_result.get("slot"),
+        "block_time": tx_result.get("blockTime"),
+        "transfers": [],
+        "signers": [],
+    }
     tx = tx_result.get("transaction")
-    if not isinstance(tx, dict):
-        return None
-
-    message = tx.get("message")
+    message = tx.get("message") if isinstance(tx, dict) else None
     if not isinstance(message, dict):
-        return None
+        return facts
 
     instructions: list[dict] = []
     raw_instructions = message.get("instructions")
@@ -371,33 +911,84 @@ def infer_system_transfer_sender(
         info = parsed.get("info")
         if not isinstance(info, dict):
             continue
+        source = info.get("source")
         destination = info.get("destination")
-        if destination != destination_public_key_b58:
+        if not isinstance(source, str) or not isinstance(destination, str):
             continue
-
-        source = info.get("source")
-        if isinstance(source, str):
-            try:
-                _parse_pubkey(source)
-                return source
-            except InvalidAddressError:
-                continue
+        try:
+            _parse_pubkey(source)
+        except InvalidAddressError:
+            continue
+        lamports = info.get("lamports")
+        facts["transfers"].append(
+            {
+                "source": source,
+                "destination": destination,
+                "lamports": lamports if isinstance(lamports, int) else None,
+            }
+        )
 
     account_keys = message.get("accountKeys")
     if isinstance(account_keys, list):
         for key in account_keys:
-            if not isinstance(key, dict):
+            if not isinstance(key, dict) or not key.get("signer"):
                 continue
-            source = key.get("pubkey")
-            if (
-                isinstance(source, str)
-                and source != destination_public_key_b58
-                and bool(key.get("signer"))
-            ):
-                try:
-                    _parse_pubkey(source)
-                    return source
-                except InvalidAddressError:
-                    continue
+            signer = key.get("pubkey")
+            if not isinstance(signer, str):
+                continue
+            try:
+                _parse_pubkey(signer)
+            except InvalidAddressError:
+                continue
+            facts["signers"].append(signer)
+
+    return facts
+
+
+async def get_transfer_facts(signature_b58: str) -> Optional[dict]:
+    """
+    Parsed transfer facts for a transaction, or None if it cannot be found.
+    Finalized transactions are served from (and written to) the on-disk cache.
+    """
+    if _tx_facts is not None:
+        cached = await _tx_facts.get(signature_b58)
+        if cached is not None:
+            return cached
+
+    for commitment in ("finalized", "confirmed"):
+        tx_result = await _rpc_flights.do(
+            ("getTransaction", signature_b58, commitment),
+            lambda: _fetch_parsed_transaction(signature_b58, commitment),
+        )
+        if tx_result is None:
+            continue
+        facts = _transfer_facts(signature_b58, tx_result)
+        if commitment == "finalized" and _tx_facts is not None:
+            await _tx_facts.put(facts)
+        return facts
+    return None
+
+
+async def infer_system_transfer_sender(
+    signature_b58: str,
+    destination_public_key_b58: str,
+) -> Optional[str]:
+    """Best-effort parse of a signature to find source wallet that funded destination."""
+    _parse_pubkey(destination_public_key_b58)
+
+    try:
+        facts = await get_transfer_facts(signature_b58)
+    except Exception:
+        return None
+    if facts is None:
+        return None
+
+    for item in facts["transfers"]:
+        if item["destination"] == destination_public_key_b58:
+            return item["source"]
+
+    for signer in facts["signers"]:
+        if signer != destination_public_key_b58:
+            return signer
 
     return None
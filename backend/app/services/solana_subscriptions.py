@@ -0,0 +1,347 @@
+"""
+Solana PubSub subscription engine.
+
+Multiplexes signatureSubscribe and accountSubscribe over one websocket per
+RPC endpoint. Account subscriptions survive reconnects (they are re-sent on
+every new connection); signature waiters are failed with ConnectionError when
+the socket drops so callers can fall back to polling.
+"""
+
+import asyncio
+import itertools
+import json
+import logging
+from collections import OrderedDict
+from typing import Callable, Optional
+
+import websockets
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+# (address, lamports or None when the state is unknown, ws_url of the engine)
+AccountCallback = Callable[[str, Optional[int], str], None]
+
+_REQUEST_TIMEOUT_SECONDS = 5.0
+_RECONNECT_MIN_SECONDS = 0.5
+_RECONNECT_MAX_SECONDS = 30.0
+
+
+def ws_url_from_rpc_url(rpc_url: str) -> str:
+    if rpc_url.startswith("https://"):
+        return "wss://" + rpc_url[len("https://") :]
+    if rpc_url.startswith("http://"):
+        return "ws://" + rpc_url[len("http://") :]
+    return rpc_url
+
+
+class SubscriptionEngine:
+    def __init__(
+        self,
+        ws_url: str,
+        *,
+        max_account_subscriptions: int = 1000,
+        account_commitment: str = "confirmed",
+    ):
+        self.ws_url = ws_url
+        self._max_account_subscriptions = max(1, max_account_subscriptions)
+        self._account_commitment = account_commitment
+        self._ids = itertools.count(1)
+        self._ws = None
+        self._connected = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+        self._pending_requests: dict[int, tuple[asyncio.Future, Callable[[int], None]]] = {}
+        self._signature_subs: dict[int, asyncio.Future] = {}
+        self._account_subs: dict[int, str] = {}
+        # address -> subscription id (None until the server acknowledges it)
+        self._accounts: OrderedDict[str, Optional[int]] = OrderedDict()
+        self._account_callback: Optional[AccountCallback] = None
+
+    @property
+    def connected(self) -> bool:
+        return self._ws is not None and self._connected.is_set()
+
+    def start(self, account_callback: Optional[AccountCallback] = None) -> None:
+        self._account_callback = account_callback
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        self._drop_connection()
+
+    async def wait_connected(self, timeout: float) -> bool:
+        try:
+            await asyncio.wait_for(self._connected.wait(), timeout)
+        except asyncio.TimeoutError:
+            return False
+        return True
+
+    async def subscribe_signature(self, signature: str, commitment: str) -> tuple[int, asyncio.Future]:
+        """
+        Subscribe to one signatureNotification at the given commitment.
+        The returned future resolves to {"slot", "err"}, or raises ConnectionError
+        if the socket drops first.
+        """
+        future = asyncio.get_running_loop().create_future()
+
+        def _register(subscription_id: int) -> None:
+            self._signature_subs[subscription_id] = future
+
+        subscription_id = await self._request(
+            "signatureSubscribe",
+            [signature, {"commitment": commitment}],
+            _register,
+        )
+        return subscription_id, future
+
+    async def unsubscribe_signature(self, subscription_id: int) -> None:
+        # The server drops signature subscriptions itself once they fire.
+        if self._signature_subs.pop(subscription_id, None) is not None:
+            await self._unsubscribe("signatureUnsubscribe", subscription_id)
+
+    async def subscribe_account(self, address: str) -> bool:
+        """Ensure an account subscription exists. Returns True once it is live."""
+        if address in self._accounts:
+            self._accounts.move_to_end(address)
+            return self.connected and self._accounts[address] is not None
+
+        self._accounts[address] = None
+        while len(self._accounts) > self._max_account_subscriptions:
+            oldest, oldest_id = self._accounts.popitem(last=False)
+            if oldest_id is not None:
+                self._account_subs.pop(oldest_id, None)
+                await self._unsubscribe("accountUnsubscribe", oldest_id)
+            # Nothing is pushed for it any more, so whatever was pushed is stale.
+            self._notify_account(oldest, None)
+
+        if not self.connected:
+            return False
+        try:
+            await self._subscribe_account(address)
+        except (ConnectionError, asyncio.TimeoutError):
+            return False
+        return True
+
+    def is_watching(self, address: str) -> bool:
+        return self.connected and self._accounts.get(address) is not None
+
+    async def _subscribe_account(self, address: str) -> None:
+        def _register(subscription_id: int) -> None:
+            if address in self._accounts:
+                self._accounts[address] = subscription_id
+                self._account_subs[subscription_id] = address
+
+        await self._request(
+            "accountSubscribe",
+            [address, {"encoding": "base64", "commitment": self._account_commitment}],
+            _register,
+        )
+
+    async def _request(
+        self,
+        method: str,
+        params: list,
+        on_result: Callable[[int], None],
+    ) -> int:
+        ws = self._ws
+        if ws is None:
+            raise ConnectionError("Solana websocket is not connected")
+        request_id = next(self._ids)
+        future = asyncio.get_running_loop().create_future()
+        # The reader registers the subscription before dispatching any later
+        # message, so a notification can never race ahead of its handler.
+        self._pending_requests[request_id] = (future, on_result)
+        try:
+            await ws.send(
+                json.dumps({"jsonrpc": "2.0", "id": request_id, "method": method, "params": params})
+            )
+            return await asyncio.wait_for(future, _REQUEST_TIMEOUT_SECONDS)
+        except websockets.ConnectionClosed as exc:
+            raise ConnectionError(str(exc)) from exc
+        finally:
+            self._pending_requests.pop(request_id, None)
+
+    async def _unsubscribe(self, method: str, subscription_id: int) -> None:
+        ws = self._ws
+        if ws is None:
+            return
+        try:
+            await ws.send(
+                json.dumps(
+                    {
+                        "jsonrpc": "2.0",
+                        "id": next(self._ids),
+                        "method": method,
+                        "params": [subscription_id],
+                    }
+                )
+            )
+        except Exception:
+            pass
+
+    async def _run(self) -> None:
+        delay = _RECONNECT_MIN_SECONDS
+        while True:
+            try:
+                async with websockets.connect(self.ws_url, open_timeout=_REQUEST_TIMEOUT_SECONDS) as ws:
+                    self._ws = ws
+                    self._connected.set()
+                    delay = _RECONNECT_MIN_SECONDS
+                    resubscribe = asyncio.create_task(self._resubscribe_accounts())
+                    try:
+                        async for message in ws:
+                            self._dispatch(message)
+                    finally:
+                        resubscribe.cancel()
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:
+                logger.warning("Solana websocket %s disconnected: %s", self.ws_url, exc)
+            self._drop_connection()
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, _RECONNECT_MAX_SECONDS)
+
+    async def _resubscribe_accounts(self) -> None:
+        for address in list(self._accounts):
+            self._accounts[address] = None
+            try:
+                await self._subscribe_account(address)
+            except (ConnectionError, asyncio.TimeoutError):
+                return
+            # Updates may have been missed while disconnected.
+            self._notify_account(address, None)
+
+    def _drop_connection(self) -> None:
+        self._ws = None
+        self._connected.clear()
+        for future, _ in self._pending_requests.values():
+            if not future.done():
+                future.set_exception(ConnectionError("Solana websocket disconnected"))
+        self._pending_requests.clear()
+        for future in self._signature_subs.values():
+            if not future.done():
+                future.set_exception(ConnectionError("Solana websocket disconnected"))
+        self._signature_subs.clear()
+        self._account_subs.clear()
+        for address in self._accounts:
+            self._accounts[address] = None
+
+    def _dispatch(self, raw: str) -> None:
+        try:
+            message = json.loads(raw)
+        except ValueError:
+            return
+        if not isinstance(message, dict):
+            return
+
+        request_id = message.get("id")
+        if request_id is not None:
+            pending = self._pending_requests.get(request_id)
+            if not pending:
+                return
+            future, on_result = pending
+            if future.done():
+                return
+            if "error" in message:
+                future.set_exception(ConnectionError(str(message["error"])))
+                return
+            subscription_id = message.get("result")
+            if isinstance(subscription_id, int):
+                on_result(subscription_id)
+            future.set_result(subscription_id)
+            return
+
+        method = message.get("method")
+        params = message.get("params")
+        if not isinstance(params, dict):
+            return
+        subscription_id = params.get("subscription")
+        result = params.get("result") if isinstance(params.get("result"), dict) else {}
+        context = result.get("context") if isinstance(result.get("context"), dict) else {}
+        value = result.get("value")
+
+        if method == "signatureNotification":
+            future = self._signature_subs.pop(subscription_id, None)
+            if future is None or future.done():
+                return
+            err = value.get("err") if isinstance(value, dict) else None
+            future.set_result({"slot": context.get("slot"), "err": str(err) if err else None})
+        elif method == "accountNotification":
+            address = self._account_subs.get(subscription_id)
+            if address is None:
+                return
+            lamports = value.get("lamports") if isinstance(value, dict) else None
+            self._notify_account(address, lamports if isinstance(lamports, int) else None)
+
+    def _notify_account(self, address: str, lamports: Optional[int]) -> None:
+        if self._account_callback is None:
+            return
+        try:
+            self._account_callback(address, lamports, self.ws_url)
+        except Exception:
+            logger.exception("Account notification handler failed for %s", address)
+
+
+# One engine per RPC endpoint, keyed by the endpoint's HTTP URL.
+_engines: dict[str, SubscriptionEngine] = {}
+_ranked_rpc_urls: Optional[Callable[[], list[str]]] = None
+
+
+def active_engine() -> Optional[SubscriptionEngine]:
+    """
+    The connected engine of the best-ranked RPC endpoint, so subscriptions
+    follow the pool's failover; None when subscriptions are off or all down.
+    """
+    order = _ranked_rpc_urls() if _ranked_rpc_urls is not None else list(_engines)
+    for rpc_url in order:
+        engine = _engines.get(rpc_url)
+        if engine is not None and engine.connected:
+            return engine
+    return None
+
+
+async def start(
+    rpc_urls: list[str],
+    account_callback: Optional[AccountCallback] = None,
+    ranked_rpc_urls: Optional[Callable[[], list[str]]] = None,
+) -> None:
+    """
+    Open a websocket per RPC endpoint. settings.solana_ws_url overrides the
+    socket of settings.solana_rpc_url; the others are derived from their URL.
+    ranked_rpc_urls orders the endpoints for active_engine (pool order otherwise).
+    """
+    global _ranked_rpc_urls
+    if not settings.solana_subscriptions_enabled:
+        return
+    _ranked_rpc_urls = ranked_rpc_urls
+    for rpc_url in dict.fromkeys(rpc_urls):
+        if rpc_url == settings.solana_rpc_url and settings.solana_ws_url:
+            ws_url = settings.solana_ws_url
+        else:
+            ws_url = ws_url_from_rpc_url(rpc_url)
+        engine = _engines[rpc_url] = SubscriptionEngine(
+            ws_url,
+            max_account_subscriptions=settings.solana_ws_max_account_subscriptions,
+        )
+        engine.start(account_callback)
+    connected = await asyncio.gather(
+        *(engine.wait_connected(_REQUEST_TIMEOUT_SECONDS) for engine in _engines.values())
+    )
+    for engine, is_connected in zip(_engines.values(), connected):
+        if not is_connected:
+            logger.warning(
+                "Solana websocket %s not reachable yet; polling until it connects", engine.ws_url
+            )
+
+
+async def stop() -> None:
+    global _ranked_rpc_urls
+    engines = list(_engines.values())
+    _engines.clear()
+    _ranked_rpc_urls = None
+    await asyncio.gather(*(engine.stop() for engine in engines))
@@ -0,0 +1,161 @@
+"""
+Disk-backed cache of transfer facts from finalized Solana transactions.
+
+A finalized transaction never changes, so its parsed system transfers
+(source, destination, lamports), signers, slot and block time are kept in a
+small SQLite file keyed by signature. The file is bounded: once it holds more
+than max_entries rows, the least recently used ones are deleted. Lookups and
+writes run in a worker thread so they never block the event loop, and a hit
+only notes its time in memory; the notes are written in one batch before the
+next eviction, or once enough pile up.
+"""
+
+import asyncio
+import json
+import sqlite3
+from pathlib import Path
+from threading import Lock
+import time
+from typing import Optional
+
+from app import cache
+
+_BACKEND_DIR = Path(__file__).resolve().parents[2]
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS tx_facts (
+    signature TEXT PRIMARY KEY,
+    slot INTEGER,
+    block_time INTEGER,
+    transfers TEXT NOT NULL,
+    signers TEXT NOT NULL,
+    last_used REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS tx_facts_last_used ON tx_facts (last_used);
+"""
+
+_TOUCH_BATCH_SIZE = 256
+
+
+class TransactionFactsCache:
+    def __init__(self, path: str, max_entries: int):
+        resolved = Path(path)
+        # Relative paths are anchored at the backend directory, like the .env files.
+        self.path = resolved if resolved.is_absolute() else _BACKEND_DIR / resolved
+        self.max_entries = max(1, int(max_entries))
+        self._lock = Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+        self._count = 0
+        # signature -> last hit time not yet written to last_used
+        self._touched: dict[str, float] = {}
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        cache.register("solana_tx_facts", self)
+
+    def _connection(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(str(self.path), check_same_thread=False, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.executescript(_SCHEMA)
+            self._count = conn.execute("SELECT COUNT(*) FROM tx_facts").fetchone()[0]
+            self._conn = conn
+        return self._conn
+
+    async def get(self, signature: str) -> Optional[dict]:
+        return await asyncio.to_thread(self._get, signature)
+
+    async def put(self, facts: dict) -> None:
+        await asyncio.to_thread(self._put, facts)
+
+    async def aclose(self) -> None:
+        await asyncio.to_thread(self._close)
+
+    def _get(self, signature: str) -> Optional[dict]:
+        with self._lock:
+            conn = self._connection()
+            row = conn.execute(
+                "SELECT slot, block_time, transfers, signers FROM tx_facts WHERE signature = ?",
+                (signature,),
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._touched[signature] = time.time()
+            if len(self._touched) >= _TOUCH_BATCH_SIZE:
+                self._write_touches(conn)
+        slot, block_time, transfers, signers = row
+        return {
+            "signature": signature,
+            "slot": slot,
+            "block_time": block_time,
+            "transfers": json.loads(transfers),
+            "signers": json.loads(signers),
+        }
+
+    def _put(self, facts: dict) -> None:
+        with self._lock:
+            conn = self._connection()
+            # Eviction below goes by last_used, so it has to see every hit.
+            self._write_touches(conn)
+            exists = conn.execute(
+                "SELECT 1 FROM tx_facts WHERE signature = ?",
+                (facts["signature"],),
+            ).fetchone()
+            conn.execute(
+                "INSERT OR REPLACE INTO tx_facts "
+                "(signature, slot, block_time, transfers, signers, last_used) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (
+                    facts["signature"],
+                    facts.get("slot"),
+                    facts.get("block_time"),
+                    json.dumps(facts.get("transfers") or []),
+                    json.dumps(facts.get("signers") or []),
+                    time.time(),
+                ),
+            )
+            if exists is None:
+                self._count += 1
+            overflow = self._count - self.max_entries
+            if overflow > 0:
+                conn.execute(
+                    "DELETE FROM tx_facts WHERE signature IN "
+                    "(SELECT signature FROM tx_facts ORDER BY last_used LIMIT ?)",
+                    (overflow,),
+                )
+                self._count -= overflow
+                self.evictions += overflow
+
+    def _write_touches(self, conn: sqlite3.Connection) -> None:
+        """Write the pending hit times in one transaction; call with self._lock held."""
+        if not self._touched:
+            return
+        touched = [(used_at, signature) for signature, used_at in self._touched.items()]
+        self._touched.clear()
+        conn.execute("BEGIN")
+        try:
+            conn.executemany("UPDATE tx_facts SET last_used = ? WHERE signature = ?", touched)
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+
+    def _close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._write_touches(self._conn)
+                self._conn.close()
+                self._conn = None
+
+    def stats(self) -> dict:
+        return {
+            "size": self._count,
+            "max_size": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
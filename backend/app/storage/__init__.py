@@ -0,0 +1,72 @@
+"""
+Storage backends behind app.store.
+
+app.store formats documents, memoizes them per request and coalesces reads; a
+backend only runs the named functions below and returns raw documents shaped
+like Convex's: "_id" (str), "_creationTime" (epoch ms), fields that are unset
+are absent, and timestamps are epoch ms. The names are the Convex
+"module:function" paths, so the Convex deployment is the reference
+implementation. A failed call raises RuntimeError; a compare-and-swap miss in
+convex_escrows:update raises one whose message starts with "VersionConflict".
+Escrow documents never carry secret_key except through getSigningKey; the
+escrow reads take a "view" or "full" projection (see convex_escrows.ts).
+"""
+
+from typing import Optional, Protocol
+
+QUERIES = frozenset({
+    "convex_escrows:get",
+    "convex_escrows:getSigningKey",
+    "convex_escrows:getByPublicId",
+    "convex_escrows:getByInviteHash",
+    "convex_escrows:listPage",
+    "convex_escrows:statusCounts",
+    "convex_transactions:listByEscrow",
+    "convex_transactions:getBySignature",
+    "convex_transactions:getByIntent",
+    "convex_transactions:latestOfType",
+    "convex_dispute_chat:listByEscrow",
+    "convex_ratings:listByEscrow",
+    "convex_ratings:getByEscrowAndUsers",
+})
+
+MUTATIONS = frozenset({
+    "convex_escrows:insert",
+    "convex_escrows:update",
+    "convex_escrows:updateWithTransaction",
+    "convex_escrows:setFundingScan",
+    "convex_escrows:backfillDerived",
+    "convex_transactions:insert",
+    "convex_transactions:updateStatus",
+    "convex_transactions:update",
+    "convex_transactions:upsertMany",
+    "convex_dispute_chat:insert",
+    "convex_dispute_chat:generateUploadUrl",
+    "convex_ratings:upsert",
+})
+
+
+class StorageBackend(Protocol):
+    async def query(self, function: str, args: dict):
+        """Run a read-only function from QUERIES."""
+        ...
+
+    async def mutation(self, function: str, args: dict):
+        """Run a function from MUTATIONS atomically."""
+        ...
+
+    async def aclose(self) -> None:
+        ...
+
+
+def create_backend(name: str, sqlite_path: Optional[str] = None) -> StorageBackend:
+    """Build the backend selected by the store_backend setting."""
+    if name == "convex":
+        from app.storage.convex import ConvexBackend
+
+        return ConvexBackend()
+    if name == "sqlite":
+        from app.storage.sqlite import SqliteBackend
+
+        return SqliteBackend(sqlite_path or "escrow_store.db")
+    raise RuntimeError(f"Unknown STORE_BACKEND {name!r}; expected 'convex' or 'sqlite'")
@@ -0,0 +1,67 @@
+"""
+Convex storage backend: runs the store functions over the Convex HTTP API
+with one pooled async HTTP client.
+"""
+
+import os
+from pathlib import Path
+
+import httpx
+from dotenv import load_dotenv
+
+from app.config import settings
+
+_BACKEND_DIR = Path(__file__).resolve().parents[2]
+_HTTP_TIMEOUT = httpx.Timeout(timeout=10.0, connect=3.0)
+
+
+class ConvexBackend:
+    def __init__(self):
+        load_dotenv(_BACKEND_DIR / ".env")
+        load_dotenv(_BACKEND_DIR / ".env.local")
+        url = os.getenv("NEXT_PUBLIC_CONVEX_URL") or os.getenv("CONVEX_URL")
+        if not url:
+            raise RuntimeError("Set NEXT_PUBLIC_CONVEX_URL or CONVEX_URL in backend/.env.local")
+        self.api = url.rstrip("/")
+        self.internal_key = (settings.convex_internal_api_key or "").strip()
+        if not self.internal_key:
+            raise RuntimeError("Set CONVEX_INTERNAL_API_KEY in backend/.env.local")
+        self.client = httpx.AsyncClient(timeout=_HTTP_TIMEOUT)
+
+    async def query(self, function: str, args: dict):
+        return await self._call("query", function, args)
+
+    async def mutation(self, function: str, args: dict):
+        return await self._call("mutation", function, args)
+
+    async def aclose(self) -> None:
+        await self.client.aclose()
+
+    async def _call(self, kind: str, function: str, args: dict):
+        r = await self.client.post(
+            f"{self.api}/api/{kind}",
+            json={"path": function, "args": {**args, "internal_key": self.internal_key}},
+        )
+        r.raise_for_status()
+        data = r.json()
+        if data.get("status") != "success":
+            raise RuntimeError(_convex_error_message(kind, function, data))
+        return data["value"]
+
+
+def _convex_error_message(kind: str, function: str, data: dict) -> str:
+    base = f"Convex {kind} error in {function}: {data}"
+    error_message = str(data.get("errorMessage", ""))
+    mismatch_markers = (
+        "Could not find public function",
+        "ArgumentValidationError",
+        "Object contains extra field",
+        "Value does not match validator",
+    )
+    if any(marker in error_message for marker in mismatch_markers):
+        return (
+            f"{base}\nDeployment/function mismatch detected. "
+            "Run `npx convex dev` or `npx convex deploy` for this project and ensure "
+            "the backend env points to that deployment URL."
+        )
+    return base
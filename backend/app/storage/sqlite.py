@@ -0,0 +1,646 @@
+"""
+Embedded SQLite storage backend for single-node deployments and load tests.
+
+Each document is stored as JSON, and the fields the store functions look up
+or order by are copied into indexed columns. Every call is then one or two
+indexed statements against a local file instead of an HTTP round trip to
+Convex. Calls run in worker threads, so a write or a busy wait never blocks
+the event loop. Mutations share one connection and run one at a time, each
+as a single transaction, which keeps participant rows and status counts in
+step with their escrow the same way the Convex mutations do. Queries use a connection per
+worker thread and, with the database in WAL mode, read a consistent
+snapshot alongside the writer instead of queueing behind it.
+"""
+
+import asyncio
+import json
+from pathlib import Path
+import secrets
+import sqlite3
+from threading import Lock, local
+import time
+from typing import Optional
+
+_BACKEND_DIR = Path(__file__).resolve().parents[2]
+
+# Same bounds as convex_escrows:listPage.
+_MAX_PAGE_SIZE = 200
+_TOTAL_COUNT_CAP = 1000
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS escrows (
+    id TEXT PRIMARY KEY,
+    creation_time REAL NOT NULL,
+    updated_at REAL NOT NULL,
+    public_id TEXT NOT NULL,
+    public_key TEXT NOT NULL,
+    status TEXT NOT NULL,
+    invite_token_hash TEXT,
+    doc TEXT NOT NULL
+);
+CREATE UNIQUE INDEX IF NOT EXISTS escrows_public_id ON escrows (public_id);
+CREATE INDEX IF NOT EXISTS escrows_public_key ON escrows (public_key);
+CREATE INDEX IF NOT EXISTS escrows_invite_token_hash ON escrows (invite_token_hash);
+CREATE INDEX IF NOT EXISTS escrows_updated_at ON escrows (updated_at, creation_time);
+CREATE INDEX IF NOT EXISTS escrows_status_updated_at ON escrows (status, updated_at, creation_time);
+
+CREATE TABLE IF NOT EXISTS escrow_participants (
+    escrow_id TEXT NOT NULL,
+    user_id TEXT NOT NULL,
+    roles TEXT NOT NULL,
+    status TEXT NOT NULL,
+    updated_at REAL NOT NULL,
+    creation_time REAL NOT NULL,
+    PRIMARY KEY (escrow_id, user_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS participants_user_updated_at
+    ON escrow_participants (user_id, updated_at, creation_time);
+CREATE INDEX IF NOT EXISTS participants_user_status_updated_at
+    ON escrow_participants (user_id, status, updated_at, creation_time);
+
+CREATE TABLE IF NOT EXISTS escrow_status_counts (
+    scope TEXT NOT NULL,
+    status TEXT NOT NULL,
+    count INTEGER NOT NULL,
+    PRIMARY KEY (scope, status)
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS transactions (
+    id TEXT PRIMARY KEY,
+    creation_time REAL NOT NULL,
+    escrow_id TEXT NOT NULL,
+    signature TEXT NOT NULL,
+    tx_type TEXT NOT NULL,
+    intent_hash TEXT,
+    doc TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS transactions_escrow_id ON transactions (escrow_id, creation_time);
+CREATE INDEX IF NOT EXISTS transactions_escrow_id_tx_type
+    ON transactions (escrow_id, tx_type, creation_time);
+CREATE INDEX IF NOT EXISTS transactions_signature ON transactions (signature, creation_time);
+CREATE INDEX IF NOT EXISTS transactions_intent_hash ON transactions (intent_hash, creation_time);
+
+CREATE TABLE IF NOT EXISTS dispute_messages (
+    id TEXT PRIMARY KEY,
+    creation_time REAL NOT NULL,
+    escrow_id TEXT NOT NULL,
+    doc TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS dispute_messages_escrow_id
+    ON dispute_messages (escrow_id, creation_time);
+
+CREATE TABLE IF NOT EXISTS escrow_ratings (
+    id TEXT PRIMARY KEY,
+    creation_time REAL NOT NULL,
+    escrow_id TEXT NOT NULL,
+    from_user_id TEXT NOT NULL,
+    to_user_id TEXT NOT NULL,
+    doc TEXT NOT NULL
+);
+CREATE UNIQUE INDEX IF NOT EXISTS escrow_ratings_escrow_from_to
+    ON escrow_ratings (escrow_id, from_user_id, to_user_id);
+"""
+
+# Document fields copied into columns of each table, besides id and creation_time.
+_COLUMNS = {
+    "escrows": ("updated_at", "public_id", "public_key", "status", "invite_token_hash"),
+    "transactions": ("escrow_id", "signature", "tx_type", "intent_hash"),
+    "dispute_messages": ("escrow_id",),
+    "escrow_ratings": ("escrow_id", "from_user_id", "to_user_id"),
+}
+
+# Same set as convex_transactions:upsertMany.
+_UPSERT_PATCHABLE_FIELDS = frozenset({
+    "status",
+    "raw_error",
+    "memo",
+    "amount_lamports",
+    "from_address",
+    "to_address",
+    "commitment_target",
+    "last_valid_block_height",
+    "rpc_endpoint",
+})
+
+# What each convex_escrows read projection leaves out (see convex_escrows.ts).
+_PROJECTION_OMITTED_FIELDS = {
+    "full": ("secret_key",),
+    "view": ("secret_key", "join_token_hash", "invite_token_hash"),
+}
+
+# Scopes of the escrow_status_counts rows, as in convex_escrows.ts.
+_GLOBAL_COUNT_SCOPE = "all"
+_USER_COUNT_SCOPE = "user:{}"
+
+_PARTICIPANT_FIELDS = (
+    ("creator_user_id", "creator"),
+    ("payer_user_id", "payer"),
+    ("payee_user_id", "payee"),
+)
+
+
+class SqliteBackend:
+    def __init__(self, path: str):
+        resolved = Path(path)
+        # Relative paths are anchored at the backend directory, like the .env files.
+        self.path = resolved if resolved.is_absolute() else _BACKEND_DIR / resolved
+        self._lock = Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+        self._readers = local()
+        self._reader_conns: list[sqlite3.Connection] = []
+        self._last_time = 0.0
+        self._queries = {
+            "convex_escrows:get": self._get_escrow,
+            "convex_escrows:getSigningKey": self._get_escrow_signing_key,
+            "convex_escrows:getByPublicId": self._get_escrow_by_public_id,
+            "convex_escrows:getByInviteHash": self._get_escrow_by_invite_hash,
+            "convex_escrows:listPage": self._list_escrow_page,
+            "convex_escrows:statusCounts": self._escrow_status_counts,
+            "convex_transactions:listByEscrow": self._list_transactions,
+            "convex_transactions:getBySignature": self._get_transaction_by_signature,
+            "convex_transactions:getByIntent": self._get_transaction_by_intent,
+            "convex_transactions:latestOfType": self._latest_transaction_of_type,
+            "convex_dispute_chat:listByEscrow": self._list_dispute_messages,
+            "convex_ratings:listByEscrow": self._list_ratings,
+            "convex_ratings:getByEscrowAndUsers": self._get_rating_by_users,
+        }
+        self._mutations = {
+            "convex_escrows:insert": self._insert_escrow,
+            "convex_escrows:update": self._update_escrow,
+            "convex_escrows:updateWithTransaction": self._update_escrow_with_transaction,
+            "convex_escrows:setFundingScan": self._set_funding_scan,
+            "convex_escrows:backfillDerived": self._backfill_escrow_derived,
+            "convex_transactions:insert": self._insert_transaction,
+            "convex_transactions:updateStatus": self._update_transaction_status,
+            "convex_transactions:update": self._update_transaction,
+            "convex_transactions:upsertMany": self._upsert_transactions,
+            "convex_dispute_chat:insert": self._insert_dispute_message,
+            "convex_dispute_chat:generateUploadUrl": self._generate_upload_url,
+            "convex_ratings:upsert": self._upsert_rating,
+        }
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(str(self.path), check_same_thread=False, isolation_level=None)
+        conn.execute("PRAGMA busy_timeout=5000")
+        return conn
+
+    def _connection(self) -> sqlite3.Connection:
+        """The writer connection; call with self._lock held."""
+        if self._conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            conn = self._connect()
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.executescript(_SCHEMA)
+            self._conn = conn
+        return self._conn
+
+    def _reader(self) -> sqlite3.Connection:
+        """This worker thread's read connection, opened once the schema exists."""
+        conn = getattr(self._readers, "conn", None)
+        if conn is None:
+            with self._lock:
+                self._connection()
+                conn = self._connect()
+                conn.execute("PRAGMA query_only=ON")
+                self._reader_conns.append(conn)
+            self._readers.conn = conn
+        return conn
+
+    async def query(self, function: str, args: dict):
+        handler = self._queries.get(function)
+        if handler is None:
+            raise RuntimeError(f"SQLite store has no query {function}")
+        return await asyncio.to_thread(self._run_query, handler, args)
+
+    async def mutation(self, function: str, args: dict):
+        handler = self._mutations.get(function)
+        if handler is None:
+            raise RuntimeError(f"SQLite store has no mutation {function}")
+        return await asyncio.to_thread(self._run_mutation, handler, args)
+
+    def _run_query(self, handler, args: dict):
+        conn = self._reader()
+        # One read transaction, so a query with several statements sees one snapshot.
+        conn.execute("BEGIN")
+        try:
+            return handler(conn, args)
+        finally:
+            conn.execute("COMMIT")
+
+    def _run_mutation(self, handler, args: dict):
+        with self._lock:
+            conn = self._connection()
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                result = handler(conn, args)
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+            conn.execute("COMMIT")
+            return result
+
+    async def aclose(self) -> None:
+        with self._lock:
+            for conn in self._reader_conns:
+                conn.close()
+            self._reader_conns.clear()
+            self._readers = local()
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    def _now(self) -> float:
+        """Epoch ms, strictly increasing so creation times order rows like Convex's."""
+        now = time.time() * 1000
+        self._last_time = now if now > self._last_time else self._last_time + 0.001
+        return self._last_time
+
+    # ── Escrows ──────────────────────────────────────────────────────────────
+
+    def _escrow_doc(self, conn: sqlite3.Connection, escrow_id: str) -> Optional[dict]:
+        return _one(conn, "SELECT id, creation_time, doc FROM escrows WHERE id = ?", (escrow_id,))
+
+    def _get_escrow(self, conn: sqlite3.Connection, args: dict) -> Optional[dict]:
+        return _project(self._escrow_doc(conn, args["id"]), args.get("projection"))
+
+    def _get_escrow_signing_key(self, conn: sqlite3.Connection, args: dict) -> Optional[str]:
+        escrow = self._escrow_doc(conn, args["id"])
+        return escrow.get("secret_key") if escrow else None
+
+    def _get_escrow_by_public_id(self, conn: sqlite3.Connection, args: dict) -> Optional[dict]:
+        escrow = _one(
+            conn,
+            "SELECT id, creation_time, doc FROM escrows WHERE public_id = ?",
+            (args["public_id"],),
+        )
+        return _project(escrow, args.get("projection"))
+
+    def _get_escrow_by_invite_hash(self, conn: sqlite3.Connection, args: dict) -> Optional[dict]:
+        escrow = _one(
+            conn,
+            "SELECT id, creation_time, doc FROM escrows WHERE invite_token_hash = ? LIMIT 1",
+            (args["invite_token_hash"],),
+        )
+        return _project(escrow, args.get("projection"))
+
+    def _list_escrow_page(self, conn: sqlite3.Connection, args: dict) -> dict:
+        limit = max(1, min(int(args["limit"]), _MAX_PAGE_SIZE))
+        if args.get("mine_only") and args.get("actor_user_id"):
+            # Participant rows carry the escrow's updated_at and creation time,
+            # so "my escrows" is one range of the participant index.
+            rows_from = "escrow_participants p JOIN escrows e ON e.id = p.escrow_id"
+            count_from = "escrow_participants p"
+            position = "p"
+            where, params = ["p.user_id = ?"], [args["actor_user_id"]]
+        else:
+            rows_from = count_from = "escrows e"
+            position = "e"
+            where, params = [], []
+        if args.get("status_filter"):
+            where.append(f"{position}.status = ?")
+            params.append(args["status_filter"])
+
+        page_where, page_params = list(where), list(params)
+        cursor = args.get("cursor")
+        if cursor:
+            page_where.append(f"({position}.updated_at, {position}.creation_time) < (?, ?)")
+            page_params += [cursor["updated_at"], cursor["creation_time"]]
+        docs = _all(
+            conn,
+            f"SELECT e.id, e.creation_time, e.doc FROM {rows_from} {_where(page_where)} "
+            f"ORDER BY {position}.updated_at DESC, {position}.creation_time DESC LIMIT ?",
+            (*page_params, limit + 1),
+        )
+        page = [_project(doc, args.get("projection")) for doc in docs[:limit]]
+        next_cursor = None
+        if len(docs) > limit:
+            last = page[-1]
+            next_cursor = {"updated_at": last["updated_at"], "creation_time": last["_creationTime"]}
+
+        total = None
+        total_exact = True
+        if args.get("include_total"):
+            counted = conn.execute(
+                f"SELECT COUNT(*) FROM (SELECT 1 FROM {count_from} {_where(where)} LIMIT ?)",
+                (*params, _TOTAL_COUNT_CAP + 1),
+            ).fetchone()[0]
+            total_exact = counted <= _TOTAL_COUNT_CAP
+            total = min(counted, _TOTAL_COUNT_CAP)
+        return {"items": page, "next_cursor": next_cursor, "total": total, "total_exact": total_exact}
+
+    def _escrow_status_counts(self, conn: sqlite3.Connection, args: dict) -> dict:
+        user_id = args.get("user_id")
+        scope = _USER_COUNT_SCOPE.format(user_id) if user_id is not None else _GLOBAL_COUNT_SCOPE
+        rows = conn.execute(
+            "SELECT status, count FROM escrow_status_counts WHERE scope = ? AND count > 0",
+            (scope,),
+        )
+        return dict(rows.fetchall())
+
+    def _insert_escrow(self, conn: sqlite3.Connection, args: dict) -> dict:
+        now = self._now()
+        escrow = _save(conn, "escrows", {**args, "_id": _new_id(), "_creationTime": now, "updated_at": now})
+        _sync_derived(conn, escrow, None)
+        return _project(escrow)
+
+    def _update_escrow(self, conn: sqlite3.Connection, args: dict) -> Optional[dict]:
+        escrow = self._escrow_doc(conn, args["id"])
+        if escrow is None:
+            return None
+        version = escrow.get("version", 0)
+        expected_version = args.get("expected_version")
+        if expected_version is not None and version != expected_version:
+            raise RuntimeError(
+                f"VersionConflict: escrow {args['id']} is at version {version}, "
+                f"expected {expected_version}"
+            )
+        previous_status = escrow["status"]
+        escrow.update(args["updates"])
+        escrow["version"] = version + 1
+        escrow["updated_at"] = self._now()
+        escrow = _save(conn, "escrows", escrow)
+        _sync_derived(conn, escrow, previous_status)
+        return _project(escrow)
+
+    def _update_escrow_with_transaction(self, conn: sqlite3.Connection, args: dict) -> dict:
+        escrow = self._update_escrow(conn, args)
+        if escrow is None:
+            return {"escrow": None, "transaction": None}
+        transaction = None
+        if args.get("insert_transaction"):
+            transaction = self._insert_transaction(
+                conn, {**args["insert_transaction"], "escrow_id": args["id"]}
+            )
+        elif args.get("update_transaction"):
+            transaction = self._update_transaction(conn, args["update_transaction"])
+        return {"escrow": escrow, "transaction": transaction}
+
+    def _set_funding_scan(self, conn: sqlite3.Connection, args: dict) -> None:
+        escrow = self._escrow_doc(conn, args["id"])
+        if escrow is None:
+            return None
+        escrow["funding_signature_cursor"] = args.get("cursor")
+        escrow["funding_signature_resume_before"] = args.get("resume_before")
+        escrow["funding_signature_resume_cursor"] = args.get("resume_cursor")
+        _save(conn, "escrows", escrow)
+        return None
+
+    def _backfill_escrow_derived(self, conn: sqlite3.Connection, args: dict) -> dict:
+        # Participant rows are written with every escrow here, but a database
+        # from before the status counts existed has none, so recount once and
+        # write the rows that differ. Idempotent, and done in a single batch.
+        expected = {
+            (_GLOBAL_COUNT_SCOPE, status): count
+            for status, count in conn.execute("SELECT status, COUNT(*) FROM escrows GROUP BY status")
+        }
+        expected.update(
+            ((_USER_COUNT_SCOPE.format(user_id), status), count)
+            for user_id, status, count in conn.execute(
+                "SELECT user_id, status, COUNT(*) FROM escrow_participants GROUP BY user_id, status"
+            )
+        )
+        stored = {
+            (scope, status): count
+            for scope, status, count in conn.execute(
+                "SELECT scope, status, count FROM escrow_status_counts WHERE count > 0"
+            )
+        }
+        changed = {
+            key: expected.get(key, 0)
+            for key in expected.keys() | stored.keys()
+            if expected.get(key, 0) != stored.get(key, 0)
+        }
+        conn.executemany(
+            "INSERT OR REPLACE INTO escrow_status_counts (scope, status, count) VALUES (?, ?, ?)",
+            [(scope, status, count) for (scope, status), count in changed.items()],
+        )
+        return {"written": len(changed), "cursor": None}
+
+    # ── Transactions ─────────────────────────────────────────────────────────
+
+    def _list_transactions(self, conn: sqlite3.Connection, args: dict) -> list[dict]:
+        return _all(
+            conn,
+            "SELECT id, creation_time, doc FROM transactions WHERE escrow_id = ? "
+            "ORDER BY creation_time DESC",
+            (args["escrow_id"],),
+        )
+
+    def _get_transaction_by_signature(self, conn: sqlite3.Connection, args: dict) -> Optional[dict]:
+        return _one(
+            conn,
+            "SELECT id, creation_time, doc FROM transactions WHERE signature = ? "
+            "ORDER BY creation_time LIMIT 1",
+            (args["signature"],),
+        )
+
+    def _get_transaction_by_intent(self, conn: sqlite3.Connection, args: dict) -> Optional[dict]:
+        return _one(
+            conn,
+            "SELECT id, creation_time, doc FROM transactions "
+            "WHERE intent_hash = ? AND escrow_id = ? AND tx_type = ? "
+            "ORDER BY creation_time DESC LIMIT 1",
+            (args["intent_hash"], args["escrow_id"], args["tx_type"]),
+        )
+
+    def _latest_transaction_of_type(self, conn: sqlite3.Connection, args: dict) -> Optional[dict]:
+        return _one(
+            conn,
+            "SELECT id, creation_time, doc FROM transactions WHERE escrow_id = ? AND tx_type = ? "
+            "ORDER BY creation_time DESC LIMIT 1",
+            (args["escrow_id"], args["tx_type"]),
+        )
+
+    def _insert_transaction(self, conn: sqlite3.Connection, args: dict) -> dict:
+        return _save(conn, "transactions", {**args, "_id": _new_id(), "_creationTime": self._now()})
+
+    def _update_transaction_status(self, conn: sqlite3.Connection, args: dict) -> Optional[dict]:
+        return self._update_transaction(
+            conn,
+            {"signature": args["signature"], "updates": {"status": args["status"]}},
+        )
+
+    def _update_transaction(self, conn: sqlite3.Connection, args: dict) -> Optional[dict]:
+        tx = self._get_transaction_by_signature(conn, args)
+        if tx is None:
+            return None
+        tx.update(args["updates"])
+        return _save(conn, "transactions", tx)
+
+    def _upsert_transactions(self, conn: sqlite3.Connection, args: dict) -> list[dict]:
+        update_fields = [f for f in args["update_fields"] if f in _UPSERT_PATCHABLE_FIELDS]
+        results = []
+        for item in args["items"]:
+            existing = _one(
+                conn,
+                "SELECT id, creation_time, doc FROM transactions "
+                "WHERE signature = ? AND escrow_id = ? ORDER BY creation_time LIMIT 1",
+                (item["signature"], args["escrow_id"]),
+            )
+            if existing is None:
+                tx = self._insert_transaction(conn, {**item, "escrow_id": args["escrow_id"]})
+                results.append({"doc": tx, "written": True})
+                continue
+            changes = {
+                field: item[field]
+                for field in update_fields
+                if item.get(field) is not None and item[field] != existing.get(field)
+            }
+            if changes:
+                existing = _save(conn, "transactions", {**existing, **changes})
+            results.append({"doc": existing, "written": bool(changes)})
+        return results
+
+    # ── Dispute chat ─────────────────────────────────────────────────────────
+
+    def _list_dispute_messages(self, conn: sqlite3.Connection, args: dict) -> list[dict]:
+        messages = _all(
+            conn,
+            "SELECT id, creation_time, doc FROM dispute_messages WHERE escrow_id = ? "
+            "ORDER BY creation_time",
+            (args["escrow_id"],),
+        )
+        for message in messages:
+            # Attachments live in Convex file storage, which has no local equivalent.
+            message["attachments"] = [
+                {**attachment, "storage_url": None}
+                for attachment in message.get("attachments") or []
+            ]
+        return messages
+
+    def _insert_dispute_message(self, conn: sqlite3.Connection, args: dict) -> dict:
+        now = self._now()
+        return _save(
+            conn,
+            "dispute_messages",
+            {**args, "_id": _new_id(), "_creationTime": now, "created_at": now},
+        )
+
+    def _generate_upload_url(self, conn: sqlite3.Connection, args: dict) -> str:
+        raise RuntimeError("Dispute attachment uploads need the Convex store backend")
+
+    # ── Ratings ──────────────────────────────────────────────────────────────
+
+    def _list_ratings(self, conn: sqlite3.Connection, args: dict) -> list[dict]:
+        ratings = _all(
+            conn,
+            "SELECT id, creation_time, doc FROM escrow_ratings WHERE escrow_id = ?",
+            (args["escrow_id"],),
+        )
+        ratings.sort(key=lambda r: r.get("updated_at") or r["_creationTime"], reverse=True)
+        return ratings
+
+    def _get_rating_by_users(self, conn: sqlite3.Connection, args: dict) -> Optional[dict]:
+        return _one(
+            conn,
+            "SELECT id, creation_time, doc FROM escrow_ratings "
+            "WHERE escrow_id = ? AND from_user_id = ? AND to_user_id = ?",
+            (args["escrow_id"], args["from_user_id"], args["to_user_id"]),
+        )
+
+    def _upsert_rating(self, conn: sqlite3.Connection, args: dict) -> dict:
+        now = self._now()
+        rating = self._get_rating_by_users(conn, args)
+        if rating is None:
+            rating = {**args, "_id": _new_id(), "_creationTime": now, "created_at": now}
+        rating.update(score=args["score"], comment=args.get("comment"), updated_at=now)
+        return _save(conn, "escrow_ratings", rating)
+
+
+def _new_id() -> str:
+    return secrets.token_hex(16)
+
+
+def _where(conditions: list[str]) -> str:
+    return f"WHERE {' AND '.join(conditions)}" if conditions else ""
+
+
+def _doc(row) -> dict:
+    doc_id, creation_time, body = row
+    return {**json.loads(body), "_id": doc_id, "_creationTime": creation_time}
+
+
+def _one(conn: sqlite3.Connection, sql: str, params: tuple) -> Optional[dict]:
+    row = conn.execute(sql, params).fetchone()
+    return _doc(row) if row is not None else None
+
+
+def _all(conn: sqlite3.Connection, sql: str, params: tuple) -> list[dict]:
+    return [_doc(row) for row in conn.execute(sql, params).fetchall()]
+
+
+def _save(conn: sqlite3.Connection, table: str, doc: dict) -> dict:
+    """Insert or replace a document; returns it as a read would (unset fields absent)."""
+    body = {k: v for k, v in doc.items() if v is not None and not k.startswith("_")}
+    columns = _COLUMNS[table]
+    names = ("id", "creation_time", *columns, "doc")
+    conn.execute(
+        f"INSERT OR REPLACE INTO {table} ({', '.join(names)}) "
+        f"VALUES ({', '.join('?' * len(names))})",
+        (
+            doc["_id"],
+            doc["_creationTime"],
+            *(body.get(column) for column in columns),
+            json.dumps(body, separators=(",", ":")),
+        ),
+    )
+    return {**body, "_id": doc["_id"], "_creationTime": doc["_creationTime"]}
+
+
+def _project(escrow: Optional[dict], projection: Optional[str] = None) -> Optional[dict]:
+    if escrow is None:
+        return None
+    omitted = _PROJECTION_OMITTED_FIELDS[projection or "full"]
+    return {key: value for key, value in escrow.items() if key not in omitted}
+
+
+def _sync_derived(conn: sqlite3.Connection, escrow: dict, previous_status: Optional[str]) -> None:
+    """
+    Rewrite the escrow's participant rows, one per user with every role they
+    hold, and move its per-user and global status counts from what the old rows
+    and previous_status (None for a new escrow) counted to the escrow as it is.
+    """
+    roles: dict[str, list[str]] = {}
+    for field, role in _PARTICIPANT_FIELDS:
+        user_id = escrow.get(field)
+        if user_id:
+            roles.setdefault(user_id, []).append(role)
+
+    deltas: dict[tuple[str, str], int] = {}
+
+    def count(scope: str, status: str, delta: int) -> None:
+        deltas[(scope, status)] = deltas.get((scope, status), 0) + delta
+
+    if previous_status is not None:
+        count(_GLOBAL_COUNT_SCOPE, previous_status, -1)
+    count(_GLOBAL_COUNT_SCOPE, escrow["status"], 1)
+    for user_id, status in conn.execute(
+        "SELECT user_id, status FROM escrow_participants WHERE escrow_id = ?", (escrow["_id"],)
+    ).fetchall():
+        count(_USER_COUNT_SCOPE.format(user_id), status, -1)
+    for user_id in roles:
+        count(_USER_COUNT_SCOPE.format(user_id), escrow["status"], 1)
+    conn.executemany(
+        "INSERT INTO escrow_status_counts (scope, status, count) VALUES (?, ?, max(0, ?)) "
+        "ON CONFLICT (scope, status) DO UPDATE SET count = max(0, count + ?)",
+        [(scope, status, delta, delta) for (scope, status), delta in deltas.items() if delta],
+    )
+
+    conn.execute("DELETE FROM escrow_participants WHERE escrow_id = ?", (escrow["_id"],))
+    conn.executemany(
+        "INSERT INTO escrow_participants "
+        "(escrow_id, user_id, roles, status, updated_at, creation_time) "
+        "VALUES (?, ?, ?, ?, ?, ?)",
+        [
+            (
+                escrow["_id"],
+                user_id,
+                json.dumps(user_roles),
+                escrow["status"],
+                escrow["updated_at"],
+                escrow["_creationTime"],
+            )
+            for user_id, user_roles in roles.items()
+        ],
+    )
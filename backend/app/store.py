@@ -1,33 +1,23 @@
 """
-Convex-backed data store for escrows and transactions.
-Replaces the in-memory store with Convex HTTP API calls.
+Data store for escrows and transactions.
+All store functions are coroutines over the storage backend selected by the
+store_backend setting (Convex over HTTP, or embedded SQLite; see app.storage).
 """
 
+import asyncio
 import base64
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
 import json
-import os
 import secrets
 from datetime import datetime, timezone
-from pathlib import Path
-from typing import Optional
-
-import httpx
-from dotenv import load_dotenv
+from typing import AsyncIterator, Callable, Optional
 
+from app.cache import SingleFlight, TTLCache
 from app.config import settings
+from app.exceptions import EscrowVersionConflictError
+from app.storage import create_backend
 
-_BACKEND_DIR = Path(__file__).resolve().parents[1]
-load_dotenv(_BACKEND_DIR / ".env")
-load_dotenv(_BACKEND_DIR / ".env.local")
-
-CONVEX_URL = os.getenv("NEXT_PUBLIC_CONVEX_URL") or os.getenv("CONVEX_URL")
-if not CONVEX_URL:
-    raise RuntimeError("Set NEXT_PUBLIC_CONVEX_URL or CONVEX_URL in backend/.env.local")
-
-CONVEX_API = CONVEX_URL.rstrip("/")
-CONVEX_INTERNAL_API_KEY = (settings.convex_internal_api_key or "").strip()
-if not CONVEX_INTERNAL_API_KEY:
-    raise RuntimeError("Set CONVEX_INTERNAL_API_KEY in backend/.env.local")
 _ESCROW_META_PREFIX = "__ssmeta_v1__:"
 _ESCROW_INSERT_FIELDS = {
     "public_key",
@@ -72,9 +62,35 @@ _ESCROW_META_FIELDS = {
     "dispute_reason",
     "version",
 }
-
-_HTTP_TIMEOUT = httpx.Timeout(timeout=10.0, connect=3.0)
-_HTTP_CLIENT = httpx.Client(timeout=_HTTP_TIMEOUT)
+# Escrow reads take a projection. Neither carries the encrypted secret_key
+# (see get_escrow_signing_key); "view", for listings and polling, also leaves
+# out the token hashes that "full" reads use to check join and invite tokens.
+_VIEW_OMITTED_FIELDS = ("join_token_hash", "invite_token_hash")
+
+_backend = create_backend(settings.store_backend, settings.store_sqlite_path)
+_query_flights = SingleFlight("store_queries")
+# Read-through cache of formatted escrows by (projection, id), with public_id
+# and invite hash aliases to the id. Writes made here refresh it; the short TTL bounds how long
+# a write from another process can go unseen. Reads behind a decision or a
+# write pass fresh=True to skip it.
+_escrow_cache = TTLCache(
+    "store_escrows",
+    settings.store_escrow_cache_max_entries,
+    settings.store_escrow_cache_ttl_seconds,
+)
+_escrow_ids = TTLCache(
+    "store_escrow_ids",
+    settings.store_escrow_cache_max_entries,
+    settings.store_escrow_cache_ttl_seconds,
+)
+# Bumped before every mutation so queries issued after a write never join a
+# query that was already in flight before it.
+_write_generation = 0
+
+
+async def aclose() -> None:
+    """Close the storage backend (called from the app lifespan)."""
+    await _backend.aclose()
 
 
 def _clean_args(args: Optional[dict]) -> dict:
@@ -83,24 +99,6 @@ def _clean_args(args: Optional[dict]) -> dict:
     return {k: v for k, v in args.items() if v is not None}
 
 
-def _convex_error_message(kind: str, function: str, data: dict) -> str:
-    base = f"Convex {kind} error in {function}: {data}"
-    error_message = str(data.get("errorMessage", ""))
-    mismatch_markers = (
-        "Could not find public function",
-        "ArgumentValidationError",
-        "Object contains extra field",
-        "Value does not match validator",
-    )
-    if any(marker in error_message for marker in mismatch_markers):
-        return (
-            f"{base}\nDeployment/function mismatch detected. "
-            "Run `npx convex dev` or `npx convex deploy` for this project and ensure "
-            "the backend env points to that deployment URL."
-        )
-    return base
-
-
 def _is_missing_function_error(exc: Exception) -> bool:
     text = str(exc)
     return (
@@ -136,74 +134,17 @@ def _decode_escrow_label(raw_label: Optional[str]) -> tuple[Optional[str], dict]
     return label, meta
 
 
-def _query_escrow_list_page(
-    *,
-    status_filter: Optional[str] = None,
-    limit: int = 200,
-    offset: int = 0,
-) -> tuple[int, list[dict]]:
-    args = {"limit": int(limit), "offset": int(offset)}
-    if status_filter:
-        args["status_filter"] = status_filter
-
-    result = _query("convex_escrows:list", args)
-    if isinstance(result, dict) and "items" in result:
-        items = result.get("items") or []
-        total = int(result.get("total", len(items)))
-        return total, list(items)
-    if isinstance(result, list):
-        return len(result), result
-    return 0, []
-
-
-def _list_all_escrow_docs(status_filter: Optional[str] = None) -> list[dict]:
-    batch = 200
-    offset = 0
-    docs: list[dict] = []
-
-    while True:
-        total, items = _query_escrow_list_page(
-            status_filter=status_filter,
-            limit=batch,
-            offset=offset,
-        )
-        if not items:
-            break
-        docs.extend(items)
-        offset += len(items)
-        if len(items) < batch:
-            break
-        if total and offset >= total:
-            break
-    return docs
-
-
-def _query(function: str, args: Optional[dict] = None):
+async def _query(function: str, args: Optional[dict] = None):
+    """Run a store query, sharing the result with identical concurrent queries."""
     payload_args = _clean_args(args)
-    payload_args["internal_key"] = CONVEX_INTERNAL_API_KEY
-    r = _HTTP_CLIENT.post(
-        f"{CONVEX_API}/api/query",
-        json={"path": function, "args": payload_args},
-    )
-    r.raise_for_status()
-    data = r.json()
-    if data.get("status") != "success":
-        raise RuntimeError(_convex_error_message("query", function, data))
-    return data["value"]
+    key = (function, _write_generation, json.dumps(payload_args, sort_keys=True, default=str))
+    return await _query_flights.do(key, lambda: _backend.query(function, payload_args))
 
 
-def _mutation(function: str, args: Optional[dict] = None):
-    payload_args = _clean_args(args)
-    payload_args["internal_key"] = CONVEX_INTERNAL_API_KEY
-    r = _HTTP_CLIENT.post(
-        f"{CONVEX_API}/api/mutation",
-        json={"path": function, "args": payload_args},
-    )
-    r.raise_for_status()
-    data = r.json()
-    if data.get("status") != "success":
-        raise RuntimeError(_convex_error_message("mutation", function, data))
-    return data["value"]
+async def _mutation(function: str, args: Optional[dict] = None):
+    global _write_generation
+    _write_generation += 1
+    return await _backend.mutation(function, _clean_args(args))
 
 
 def _to_datetime(ts) -> datetime:
@@ -238,14 +179,13 @@ def _generate_public_id() -> str:
     return secrets.token_urlsafe(12)
 
 
-def _format_escrow(doc: dict) -> dict:
+def _format_escrow(doc: dict, projection: str = "full") -> dict:
     if doc is None:
         return None
-    return {
+    escrow = {
         "id": doc["_id"],
         "public_id": doc.get("public_id", ""),
         "public_key": doc["public_key"],
-        "secret_key": doc["secret_key"],
         "label": doc.get("label"),
         "recipient_address": doc.get("recipient_address"),
         "sender_address": doc.get("sender_address"),
@@ -270,10 +210,18 @@ def _format_escrow(doc: dict) -> dict:
         "last_intent_hash": doc.get("last_intent_hash"),
         "settled_signature": doc.get("settled_signature"),
         "failure_reason": doc.get("failure_reason"),
+        "funding_signature_cursor": doc.get("funding_signature_cursor"),
+        "funding_signature_resume_before": doc.get("funding_signature_resume_before"),
+        "funding_signature_resume_cursor": doc.get("funding_signature_resume_cursor"),
         "version": doc.get("version", 0),
         "created_at": _to_datetime(doc.get("_creationTime")),
         "updated_at": _to_datetime(doc.get("updated_at") or doc.get("_creationTime")),
     }
+    return _view_of(escrow) if projection == "view" else escrow
+
+
+def _view_of(escrow: dict) -> dict:
+    return {key: value for key, value in escrow.items() if key not in _VIEW_OMITTED_FIELDS}
 
 
 def _format_transaction(doc: dict) -> dict:
@@ -352,9 +300,217 @@ def _prepare_escrow_updates(updates: dict) -> dict:
     return converted
 
 
+# ── Request-scoped session ────────────────────────────────────────────────────
+
+_MISSING = object()
+
+
+class Session:
+    """
+    Identity map and unit of work for one request.
+
+    Escrows (by id and public_id) and transactions (by signature and per escrow)
+    read through the session are memoized, and writes refresh the memoized
+    copies. Escrow patches queued with defer_escrow_update are merged into the
+    next update of that escrow, or written as one mutation on commit. Only the
+    task that opened the session uses it, so tasks spawned during the request
+    never read a copy that is going stale behind them.
+    """
+
+    def __init__(self, on_escrow_flushed: Optional[Callable[[dict], None]] = None):
+        self.owner = asyncio.current_task()
+        self.open = True
+        self.on_escrow_flushed = on_escrow_flushed
+        self.escrows: dict[str, dict] = {}
+        self.escrow_ids_by_public_id: dict[str, str] = {}
+        # Escrows whose memoized copy came from the escrow cache, not the backend.
+        self.cached_escrow_ids: set[str] = set()
+        self.transactions: dict[str, Optional[dict]] = {}
+        self.transaction_lists: dict[str, list[dict]] = {}
+        self.pending_escrow_updates: dict[str, dict] = {}
+        # The version each queued patch was made against, once it is known.
+        self.pending_escrow_versions: dict[str, int] = {}
+
+    def remember_escrow(self, escrow: dict, from_cache: bool = False) -> None:
+        pending = self.pending_escrow_updates.get(escrow["id"])
+        if pending:
+            escrow.update(pending)
+        self.escrows[escrow["id"]] = escrow
+        self.escrow_ids_by_public_id[escrow["public_id"]] = escrow["id"]
+        if from_cache:
+            self.cached_escrow_ids.add(escrow["id"])
+        else:
+            self.cached_escrow_ids.discard(escrow["id"])
+
+    def has_escrow(self, escrow_id: Optional[str], fresh: bool = False) -> bool:
+        if escrow_id not in self.escrows:
+            return False
+        return not (fresh and escrow_id in self.cached_escrow_ids)
+
+    def remember_transaction(self, tx: dict) -> None:
+        self.transactions[tx["signature"]] = tx
+        txs = self.transaction_lists.get(tx["escrow_id"])
+        if txs is None:
+            return
+        for index, existing in enumerate(txs):
+            if existing["signature"] == tx["signature"]:
+                txs[index] = tx
+                return
+        txs.insert(0, tx)  # lists are kept newest first
+
+    def forget_escrow(self, escrow_id: str) -> None:
+        escrow = self.escrows.pop(escrow_id, None)
+        if escrow is not None:
+            self.escrow_ids_by_public_id.pop(escrow["public_id"], None)
+
+    def forget_transaction(self, signature: str, escrow_id: Optional[str]) -> None:
+        self.transactions.pop(signature, None)
+        if escrow_id is not None:
+            self.transaction_lists.pop(escrow_id, None)
+
+    async def commit(self) -> None:
+        """
+        Write every queued escrow patch, one mutation per escrow, at the version
+        the request read; EscrowVersionConflictError if the escrow moved since.
+        """
+        for escrow_id in list(self.pending_escrow_updates):
+            expected_version = self.pending_escrow_versions.get(escrow_id)
+            if expected_version is None and escrow_id in self.escrows:
+                expected_version = self.escrows[escrow_id]["version"]
+            updated = await update_escrow(escrow_id, {}, expected_version)
+            if updated and self.on_escrow_flushed is not None:
+                self.on_escrow_flushed(updated)
+
+
+_current_session: ContextVar[Optional[Session]] = ContextVar("store_session", default=None)
+
+
+def _active_session() -> Optional[Session]:
+    current = _current_session.get()
+    if current is None or not current.open:
+        return None
+    try:
+        task = asyncio.current_task()
+    except RuntimeError:
+        return None
+    return current if task is current.owner else None
+
+
+def _spawned_session() -> Optional[Session]:
+    """The open session of the request that spawned this task, if it is not the owner."""
+    current = _current_session.get()
+    if current is None or not current.open or _active_session() is current:
+        return None
+    return current
+
+
+@asynccontextmanager
+async def session(
+    on_escrow_flushed: Optional[Callable[[dict], None]] = None,
+) -> AsyncIterator[Session]:
+    """
+    Open a request-scoped session, or join the one this task already has open.
+    Queued escrow patches are committed when the outermost block exits cleanly
+    and dropped if it raises.
+    """
+    current = _active_session()
+    if current is not None:
+        yield current
+        return
+    new_session = Session(on_escrow_flushed)
+    token = _current_session.set(new_session)
+    try:
+        yield new_session
+        await new_session.commit()
+    finally:
+        new_session.open = False
+        _current_session.reset(token)
+
+
+def defer_escrow_update(escrow_id: str, updates: dict) -> bool:
+    """
+    Queue an escrow patch on the current session; the memoized copy reflects it
+    immediately. Returns False, queueing nothing, when no session is open.
+    """
+    current = _active_session()
+    if current is None:
+        return False
+    # None values are never written (see _prepare_escrow_updates), so don't queue them.
+    updates = {k: v for k, v in updates.items() if v is not None}
+    if updates:
+        current.pending_escrow_updates.setdefault(escrow_id, {}).update(updates)
+        escrow = current.escrows.get(escrow_id)
+        if escrow is not None:
+            current.pending_escrow_versions.setdefault(escrow_id, escrow["version"])
+            escrow.update(updates)
+    return True
+
+
+def _copy(value):
+    if isinstance(value, list):
+        return [dict(item) for item in value]
+    return dict(value) if value is not None else None
+
+
+# ── Escrow read cache ─────────────────────────────────────────────────────────
+
+def _escrow_stamp(escrow: dict) -> tuple:
+    return (escrow.get("version", 0), escrow["updated_at"])
+
+
+def _cache_escrow(escrow: dict, projection: str = "full") -> None:
+    """
+    Cache a copy of the escrow under its projection, unless a newer version is
+    already cached there. A full copy refreshes the view as well.
+    """
+    copies = {"view": _view_of(escrow)}
+    if projection == "full":
+        copies["full"] = dict(escrow)
+    for name, copy in copies.items():
+        cached = _escrow_cache.peek((name, escrow["id"]))
+        if cached is None or _escrow_stamp(cached) <= _escrow_stamp(escrow):
+            _escrow_cache.set((name, escrow["id"]), copy)
+    _escrow_ids.set(("public_id", escrow["public_id"]), escrow["id"])
+    if escrow.get("invite_token_hash"):
+        _escrow_ids.set(("invite_token_hash", escrow["invite_token_hash"]), escrow["id"])
+
+
+def _forget_cached_escrow(escrow_id: str) -> None:
+    _escrow_cache.invalidate(("full", escrow_id))
+    _escrow_cache.invalidate(("view", escrow_id))
+
+
+def _cached_escrow_by(field: str, value: str, projection: str = "full") -> Optional[dict]:
+    escrow_id = _escrow_ids.get((field, value))
+    escrow = _escrow_cache.get((projection, escrow_id)) if escrow_id is not None else None
+    # The alias can outlive the value, e.g. after an invite token is replaced.
+    return escrow if escrow is not None and escrow.get(field) == value else None
+
+
+async def _read_escrow(
+    current: Optional[Session],
+    cached: Optional[dict],
+    function: str,
+    args: dict,
+    projection: str = "full",
+) -> Optional[dict]:
+    if cached is not None:
+        escrow = dict(cached)
+    else:
+        doc = await _query(function, {**args, "projection": projection})
+        if not doc:
+            return None
+        escrow = _format_escrow(doc, projection)
+        _cache_escrow(escrow, projection)
+    if current is None:
+        return escrow
+    current.remember_escrow(escrow, from_cache=cached is not None)
+    return _copy(escrow)
+
+
 # ── Escrow functions ──────────────────────────────────────────────────────────
 
-def insert_escrow(data: dict) -> dict:
+async def insert_escrow(data: dict) -> dict:
     public_id = _generate_public_id()
 
     insert_args = {
@@ -380,55 +536,287 @@ def insert_escrow(data: dict) -> dict:
     if data.get("payee_user_id"):
         insert_args["payee_user_id"] = data["payee_user_id"]
 
-    doc = _mutation("convex_escrows:insert", insert_args)
-    return _format_escrow(doc)
+    doc = await _mutation("convex_escrows:insert", insert_args)
+    escrow = _format_escrow(doc)
+    _cache_escrow(escrow)
+    current = _active_session()
+    if current is not None:
+        current.remember_escrow(escrow)
+        return _copy(escrow)
+    return escrow
+
+
+async def get_escrow(
+    escrow_id: str,
+    fresh: bool = False,
+    projection: str = "full",
+) -> Optional[dict]:
+    """
+    The escrow, possibly from the escrow cache. Pass fresh=True when a write or
+    an authorization decision depends on the result, and projection="view" when
+    the token hashes are not needed. Inside a session reads are always full,
+    since the session memoizes one copy per escrow.
+    """
+    current = _active_session()
+    if current is not None:
+        projection = "full"
+        if current.has_escrow(escrow_id, fresh):
+            return _copy(current.escrows[escrow_id])
+    cached = None if fresh else _escrow_cache.get((projection, escrow_id))
+    return await _read_escrow(
+        current, cached, "convex_escrows:get", {"id": escrow_id}, projection
+    )
 
 
-def get_escrow(escrow_id: str) -> Optional[dict]:
-    doc = _query("convex_escrows:get", {"id": escrow_id})
-    return _format_escrow(doc) if doc else None
+async def get_escrow_by_public_id(
+    public_id: str,
+    fresh: bool = False,
+    projection: str = "full",
+) -> Optional[dict]:
+    current = _active_session()
+    if current is not None:
+        projection = "full"
+        escrow_id = current.escrow_ids_by_public_id.get(public_id)
+        if current.has_escrow(escrow_id, fresh):
+            return _copy(current.escrows[escrow_id])
+    cached = None if fresh else _cached_escrow_by("public_id", public_id, projection)
+    return await _read_escrow(
+        current, cached, "convex_escrows:getByPublicId", {"public_id": public_id}, projection
+    )
 
 
-def get_escrow_by_public_id(public_id: str) -> Optional[dict]:
-    doc = _query("convex_escrows:getByPublicId", {"public_id": public_id})
-    return _format_escrow(doc) if doc else None
+async def get_escrow_by_invite_hash(invite_token_hash: str, fresh: bool = False) -> Optional[dict]:
+    cached = None if fresh else _cached_escrow_by("invite_token_hash", invite_token_hash)
+    return await _read_escrow(
+        None,
+        cached,
+        "convex_escrows:getByInviteHash",
+        {"invite_token_hash": invite_token_hash},
+    )
 
 
-def get_escrow_by_invite_hash(invite_token_hash: str) -> Optional[dict]:
-    doc = _query("convex_escrows:getByInviteHash", {"invite_token_hash": invite_token_hash})
-    return _format_escrow(doc) if doc else None
+async def get_escrow_signing_key(escrow_id: str) -> Optional[str]:
+    """
+    The escrow's encrypted secret key, or None for an unknown escrow. Only
+    settlement should call this; the result is never cached or memoized.
+    """
+    return await _query("convex_escrows:getSigningKey", {"id": escrow_id})
 
 
-def list_escrows(
+async def list_escrows(
     status_filter: Optional[str] = None,
     limit: int = 50,
-    offset: int = 0,
+    cursor: Optional[str] = None,
     actor_user_id: Optional[str] = None,
     mine_only: bool = False,
-) -> tuple[int, list[dict]]:
-    result = _query("convex_escrows:list", {
+    include_total: bool = True,
+    projection: str = "view",
+) -> dict:
+    """
+    One page of escrows, most recently updated first, using keyset pagination.
+    Returns items, next_cursor (None on the last page) and, when include_total
+    is set, a total that is exact unless total_exact is False.
+    Raises ValueError for a cursor that was not produced here.
+    """
+    result = await _query("convex_escrows:listPage", {
         "status_filter": status_filter,
         "limit": limit,
-        "offset": offset,
+        "cursor": _decode_page_cursor(cursor) if cursor else None,
         "actor_user_id": actor_user_id,
         "mine_only": mine_only,
+        "include_total": include_total,
+        "projection": projection,
     })
-    return result["total"], [_format_escrow(e) for e in result["items"]]
+    next_cursor = result.get("next_cursor")
+    return {
+        "items": [_format_escrow(e, projection) for e in result["items"]],
+        "next_cursor": _encode_page_cursor(next_cursor) if next_cursor else None,
+        "total": result.get("total"),
+        "total_exact": result.get("total_exact", True),
+    }
+
 
+async def get_escrow_status_counts(user_id: Optional[str] = None) -> dict[str, int]:
+    """Escrow counts by status for one participant, or across all escrows."""
+    return await _query("convex_escrows:statusCounts", {"user_id": user_id})
 
-def update_escrow(escrow_id: str, updates: dict) -> Optional[dict]:
-    clean = _prepare_escrow_updates(updates)
+
+async def backfill_escrow_derived() -> int:
+    """
+    Create or repair participant rows and status counts for every escrow;
+    returns rows written.
+    """
+    written = 0
+    cursor = None
+    while True:
+        result = await _mutation("convex_escrows:backfillDerived", {"cursor": cursor})
+        written += result["written"]
+        cursor = result["cursor"]
+        if not cursor:
+            return written
+
+
+def _encode_page_cursor(position: dict) -> str:
+    raw = json.dumps(
+        [position["updated_at"], position["creation_time"]],
+        separators=(",", ":"),
+    )
+    return base64.urlsafe_b64encode(raw.encode("ascii")).decode("ascii").rstrip("=")
+
+
+def _decode_page_cursor(cursor: str) -> dict:
+    padded = cursor + ("=" * ((4 - len(cursor) % 4) % 4))
+    try:
+        updated_at, creation_time = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        return {"updated_at": float(updated_at), "creation_time": float(creation_time)}
+    except Exception:
+        raise ValueError("Invalid escrow list cursor")
+
+
+async def update_escrow(
+    escrow_id: str,
+    updates: dict,
+    expected_version: Optional[int] = None,
+) -> Optional[dict]:
+    """
+    Patch an escrow and bump its version. With expected_version the patch only
+    applies if the escrow is still at that version; otherwise
+    EscrowVersionConflictError is raised.
+    """
+    clean = _take_escrow_updates(escrow_id, updates)
     if not clean:
-        return get_escrow(escrow_id)
-    doc = _mutation("convex_escrows:update", {"id": escrow_id, "updates": clean})
-    return _format_escrow(doc) if doc else None
+        return await get_escrow(escrow_id)
+    doc = await _escrow_mutation(
+        escrow_id,
+        expected_version,
+        "convex_escrows:update",
+        {"id": escrow_id, "updates": clean, "expected_version": expected_version},
+    )
+    return _remember_escrow_write(escrow_id, doc)
+
+
+async def update_escrow_and_transaction(
+    escrow_id: str,
+    updates: dict,
+    *,
+    new_transaction: Optional[dict] = None,
+    transaction_signature: Optional[str] = None,
+    transaction_updates: Optional[dict] = None,
+    expected_version: Optional[int] = None,
+) -> tuple[Optional[dict], Optional[dict]]:
+    """
+    Patch an escrow and either insert new_transaction or patch the transaction
+    with transaction_signature, in one atomic mutation. Returns the escrow and
+    the transaction (None if the signature is unknown); expected_version works
+    as in update_escrow.
+    """
+    args: dict = {
+        "id": escrow_id,
+        "updates": _take_escrow_updates(escrow_id, updates),
+        "expected_version": expected_version,
+    }
+    if new_transaction is not None:
+        args["insert_transaction"] = _transaction_insert_args(new_transaction)
+    elif transaction_signature is not None:
+        args["update_transaction"] = {
+            "signature": transaction_signature,
+            "updates": _clean_args(transaction_updates),
+        }
+    result = await _escrow_mutation(
+        escrow_id, expected_version, "convex_escrows:updateWithTransaction", args
+    )
+    escrow = _remember_escrow_write(escrow_id, result["escrow"])
+    tx = result.get("transaction")
+    return escrow, _remember_transaction_write(_format_transaction(tx)) if tx else None
+
+
+async def set_escrow_funding_scan(
+    escrow_id: str,
+    cursor: Optional[str],
+    resume_before: Optional[str] = None,
+    resume_cursor: Optional[str] = None,
+) -> None:
+    """
+    Record the funding signature scan position: the cursor, and while a backlog
+    is being drained, where to resume and the cursor to take once it is. Unlike update_escrow this does
+    not bump the version or updated_at, so it never causes a version conflict
+    and is not a change anyone waiting on the escrow sees.
+    """
+    await _mutation(
+        "convex_escrows:setFundingScan",
+        {
+            "id": escrow_id,
+            "cursor": cursor,
+            "resume_before": resume_before,
+            "resume_cursor": resume_cursor,
+        },
+    )
+    # The version stamp does not move, so cached copies could not be told apart.
+    _forget_cached_escrow(escrow_id)
+    current = _active_session()
+    if current is not None and escrow_id in current.escrows:
+        current.escrows[escrow_id].update(
+            funding_signature_cursor=cursor,
+            funding_signature_resume_before=resume_before,
+            funding_signature_resume_cursor=resume_cursor,
+        )
+
+
+def _take_escrow_updates(escrow_id: str, updates: dict) -> dict:
+    """The patch with any updates queued on the session merged in, ready to send."""
+    current = _active_session()
+    if current is not None and escrow_id in current.pending_escrow_updates:
+        updates = {**current.pending_escrow_updates.pop(escrow_id), **updates}
+        current.pending_escrow_versions.pop(escrow_id, None)
+    return _prepare_escrow_updates(updates)
+
+
+async def _escrow_mutation(
+    escrow_id: str,
+    expected_version: Optional[int],
+    function: str,
+    args: dict,
+):
+    try:
+        return await _mutation(function, args)
+    except RuntimeError as exc:
+        if "VersionConflict" in str(exc):
+            _forget_cached_escrow(escrow_id)
+            current = _active_session()
+            if current is not None:
+                current.forget_escrow(escrow_id)
+            raise EscrowVersionConflictError(escrow_id, expected_version)
+        raise
+
+
+def _remember_escrow_write(escrow_id: str, doc: Optional[dict]) -> Optional[dict]:
+    if not doc:
+        _forget_cached_escrow(escrow_id)
+        return None
+    escrow = _format_escrow(doc)
+    _cache_escrow(escrow)
+    current = _active_session()
+    if current is not None:
+        current.remember_escrow(escrow)
+        return _copy(escrow)
+    spawned = _spawned_session()
+    if spawned is not None:
+        spawned.forget_escrow(escrow_id)
+    return escrow
 
 
 # ── Transaction functions ─────────────────────────────────────────────────────
 
-def insert_transaction(data: dict) -> dict:
-    doc = _mutation("convex_transactions:insert", {
+async def insert_transaction(data: dict) -> dict:
+    doc = await _mutation("convex_transactions:insert", {
         "escrow_id": data["escrow_id"],
+        **_transaction_insert_args(data),
+    })
+    return _remember_transaction_write(_format_transaction(doc))
+
+
+def _transaction_insert_args(data: dict) -> dict:
+    return _clean_args({
         "signature": data["signature"],
         "tx_type": data["tx_type"],
         "amount_lamports": data.get("amount_lamports"),
@@ -442,43 +830,145 @@ def insert_transaction(data: dict) -> dict:
         "raw_error": data.get("raw_error"),
         "memo": data.get("memo"),
     })
-    return _format_transaction(doc)
 
 
-def list_transactions(escrow_id: str) -> list[dict]:
-    docs = _query("convex_transactions:listByEscrow", {"escrow_id": escrow_id})
-    return [_format_transaction(t) for t in docs]
+async def upsert_transactions(
+    escrow_id: str,
+    items: list[dict],
+    update_fields: tuple[str, ...] = ("status", "raw_error", "memo"),
+) -> tuple[list[dict], list[dict]]:
+    """
+    In one mutation, insert the items whose signature the escrow has no
+    transaction for, and patch the update_fields that changed on the rest
+    (None leaves a field alone). Returns the merged rows in item order, and
+    the subset that was inserted or patched.
+    """
+    if not items:
+        return [], []
+    results = await _mutation("convex_transactions:upsertMany", {
+        "escrow_id": escrow_id,
+        "items": [_transaction_insert_args(item) for item in items],
+        "update_fields": list(update_fields),
+    })
+    rows: list[dict] = []
+    written: list[dict] = []
+    for result in results:
+        tx = _format_transaction(result["doc"])
+        if result["written"]:
+            tx = _remember_transaction_write(tx)
+            written.append(tx)
+        else:
+            tx = _remember_transaction_read(tx)
+        rows.append(tx)
+    return rows, written
+
+
+async def list_transactions(escrow_id: str) -> list[dict]:
+    current = _active_session()
+    if current is not None and escrow_id in current.transaction_lists:
+        return _copy(current.transaction_lists[escrow_id])
+    docs = await _query("convex_transactions:listByEscrow", {"escrow_id": escrow_id})
+    txs = [_format_transaction(t) for t in docs]
+    if current is not None:
+        current.transaction_lists[escrow_id] = txs
+        for tx in txs:
+            current.transactions[tx["signature"]] = tx
+        return _copy(txs)
+    return txs
+
+
+async def get_transaction_by_signature(signature: str) -> Optional[dict]:
+    current = _active_session()
+    if current is not None:
+        cached = current.transactions.get(signature, _MISSING)
+        if cached is not _MISSING:
+            return _copy(cached)
+    doc = await _query("convex_transactions:getBySignature", {"signature": signature})
+    tx = _format_transaction(doc) if doc else None
+    if current is not None:
+        # Misses are remembered too; insert_transaction replaces them.
+        current.transactions[signature] = tx
+        return _copy(tx)
+    return tx
+
+
+async def get_transaction_by_intent(
+    escrow_id: str,
+    tx_type: str,
+    intent_hash: str,
+) -> Optional[dict]:
+    """Newest transaction of this type recorded for the intent, via the intent hash index."""
+    current = _active_session()
+    if current is not None and escrow_id in current.transaction_lists:
+        for tx in current.transaction_lists[escrow_id]:
+            if tx["tx_type"] == tx_type and tx.get("intent_hash") == intent_hash:
+                return _copy(tx)
+        return None
+    doc = await _query(
+        "convex_transactions:getByIntent",
+        {"escrow_id": escrow_id, "tx_type": tx_type, "intent_hash": intent_hash},
+    )
+    return _remember_transaction_read(_format_transaction(doc)) if doc else None
 
 
-def get_transaction_by_signature(signature: str) -> Optional[dict]:
-    doc = _query("convex_transactions:getBySignature", {"signature": signature})
-    return _format_transaction(doc) if doc else None
+async def latest_transaction_of_type(escrow_id: str, tx_type: str) -> Optional[dict]:
+    """Newest transaction of this type for the escrow, via the (escrow_id, tx_type) index."""
+    current = _active_session()
+    if current is not None and escrow_id in current.transaction_lists:
+        for tx in current.transaction_lists[escrow_id]:
+            if tx["tx_type"] == tx_type:
+                return _copy(tx)
+        return None
+    doc = await _query(
+        "convex_transactions:latestOfType",
+        {"escrow_id": escrow_id, "tx_type": tx_type},
+    )
+    return _remember_transaction_read(_format_transaction(doc)) if doc else None
 
 
-def update_transaction_status(signature: str, status: str) -> Optional[dict]:
-    doc = _mutation("convex_transactions:updateStatus", {
+async def update_transaction_status(signature: str, status: str) -> Optional[dict]:
+    doc = await _mutation("convex_transactions:updateStatus", {
         "signature": signature,
         "status": status,
     })
-    return _format_transaction(doc) if doc else None
+    return _remember_transaction_write(_format_transaction(doc)) if doc else None
 
 
-def update_transaction(signature: str, updates: dict) -> Optional[dict]:
+async def update_transaction(signature: str, updates: dict) -> Optional[dict]:
     clean = {k: v for k, v in updates.items() if v is not None}
-    doc = _mutation("convex_transactions:update", {
+    doc = await _mutation("convex_transactions:update", {
         "signature": signature,
         "updates": clean,
     })
-    return _format_transaction(doc) if doc else None
+    return _remember_transaction_write(_format_transaction(doc)) if doc else None
+
+
+def _remember_transaction_read(tx: dict) -> dict:
+    current = _active_session()
+    if current is None:
+        return tx
+    current.transactions[tx["signature"]] = tx
+    return _copy(tx)
+
+
+def _remember_transaction_write(tx: dict) -> dict:
+    current = _active_session()
+    if current is not None:
+        current.remember_transaction(tx)
+        return _copy(tx)
+    spawned = _spawned_session()
+    if spawned is not None:
+        spawned.forget_transaction(tx["signature"], tx["escrow_id"])
+    return tx
 
 
-def list_dispute_messages(escrow_id: str) -> list[dict]:
-    docs = _query("convex_dispute_chat:listByEscrow", {"escrow_id": escrow_id})
+async def list_dispute_messages(escrow_id: str) -> list[dict]:
+    docs = await _query("convex_dispute_chat:listByEscrow", {"escrow_id": escrow_id})
     return [_format_dispute_message(doc) for doc in docs]
 
 
-def insert_dispute_message(data: dict) -> dict:
-    doc = _mutation(
+async def insert_dispute_message(data: dict) -> dict:
+    doc = await _mutation(
         "convex_dispute_chat:insert",
         {
             "escrow_id": data["escrow_id"],
@@ -491,17 +981,17 @@ def insert_dispute_message(data: dict) -> dict:
     return _format_dispute_message(doc)
 
 
-def generate_dispute_upload_url() -> str:
-    return _mutation("convex_dispute_chat:generateUploadUrl", {})
+async def generate_dispute_upload_url() -> str:
+    return await _mutation("convex_dispute_chat:generateUploadUrl", {})
 
 
-def list_ratings(escrow_id: str) -> list[dict]:
-    docs = _query("convex_ratings:listByEscrow", {"escrow_id": escrow_id})
+async def list_ratings(escrow_id: str) -> list[dict]:
+    docs = await _query("convex_ratings:listByEscrow", {"escrow_id": escrow_id})
     return [_format_rating(doc) for doc in docs]
 
 
-def get_rating_by_users(escrow_id: str, from_user_id: str, to_user_id: str) -> Optional[dict]:
-    doc = _query(
+async def get_rating_by_users(escrow_id: str, from_user_id: str, to_user_id: str) -> Optional[dict]:
+    doc = await _query(
         "convex_ratings:getByEscrowAndUsers",
         {
             "escrow_id": escrow_id,
@@ -512,14 +1002,14 @@ def get_rating_by_users(escrow_id: str, from_user_id: str, to_user_id: str) -> O
     return _format_rating(doc) if doc else None
 
 
-def upsert_rating(
+async def upsert_rating(
     escrow_id: str,
     from_user_id: str,
     to_user_id: str,
     score: int,
     comment: Optional[str] = None,
 ) -> dict:
-    doc = _mutation(
+    doc = await _mutation(
         "convex_ratings:upsert",
         {
             "escrow_id": escrow_id,
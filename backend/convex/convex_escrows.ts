@@ -1,6 +1,177 @@
-import { mutation, query } from "./_generated/server";
+import { mutation, query, MutationCtx, QueryCtx } from "./_generated/server";
+import { Doc, Id } from "./_generated/dataModel";
 import { v } from "convex/values";
 import { assertInternalKey } from "./_internalAuth";
+import { transactionFields, transactionUpdates } from "./convex_transactions";
+
+// Position of the last row on a page. Indexes order ties on updated_at by
+// _creationTime, so that is the tiebreaker rather than _id.
+const pageCursor = v.object({ updated_at: v.number(), creation_time: v.number() });
+type PageCursor = { updated_at: number; creation_time: number };
+// An index name plus the equality prefix that selects one range of it.
+type IndexRange = [string, [string, string][]];
+type PagedTable = "escrows" | "escrow_participants";
+
+const MAX_PAGE_SIZE = 200;
+// Totals are counted up to this many rows; beyond it they are reported as estimates.
+const TOTAL_COUNT_CAP = 1000;
+const BACKFILL_BATCH_SIZE = 100;
+
+// Escrow reads return a projection: "full" is every field but the encrypted
+// secret_key, "view" (listings and polling) also drops the token hashes. The
+// key itself is only returned by getSigningKey.
+const projectionArg = v.optional(v.union(v.literal("view"), v.literal("full")));
+type Projection = "view" | "full";
+
+function project(escrow: Doc<"escrows">, projection: Projection = "full") {
+  const { secret_key: _secretKey, ...full } = escrow;
+  if (projection === "full") return full;
+  const { join_token_hash: _joinTokenHash, invite_token_hash: _inviteTokenHash, ...view } = full;
+  return view;
+}
+
+function cursorOf(row: Doc<PagedTable>): PageCursor {
+  return { updated_at: row.updated_at ?? 0, creation_time: row._creationTime };
+}
+
+// Up to `limit` rows from one index range, newest first, strictly after `after`.
+async function takeAfter<T extends PagedTable>(
+  ctx: QueryCtx,
+  table: T,
+  [index, prefix]: IndexRange,
+  after: PageCursor | null,
+  limit: number
+): Promise<Doc<T>[]> {
+  // Index names and fields are chosen at runtime, which the generated types can't express.
+  const eqPrefix = (q: any) => prefix.reduce((acc, [field, value]) => acc.eq(field, value), q);
+  const scan = (range: (q: any) => any) =>
+    ctx.db
+      .query(table)
+      .withIndex(index as any, range)
+      .order("desc");
+
+  if (after === null) {
+    return await scan(eqPrefix).take(limit);
+  }
+  const tied = await scan((q) =>
+    eqPrefix(q).eq("updated_at", after.updated_at).lt("_creationTime", after.creation_time)
+  ).take(limit);
+  if (tied.length >= limit) {
+    return tied;
+  }
+  const older = await scan((q) => eqPrefix(q).lt("updated_at", after.updated_at)).take(
+    limit - tied.length
+  );
+  return [...tied, ...older];
+}
+
+async function pageOf<T extends PagedTable>(
+  ctx: QueryCtx,
+  table: T,
+  range: IndexRange,
+  after: PageCursor | null,
+  limit: number,
+  includeTotal: boolean
+) {
+  const rows = await takeAfter(ctx, table, range, after, limit + 1);
+  const page = rows.slice(0, limit);
+  const next_cursor = rows.length > limit ? cursorOf(page[page.length - 1]) : null;
+  let total: number | null = null;
+  let total_exact = true;
+  if (includeTotal) {
+    const counted = (await takeAfter(ctx, table, range, null, TOTAL_COUNT_CAP + 1)).length;
+    total_exact = counted <= TOTAL_COUNT_CAP;
+    total = Math.min(counted, TOTAL_COUNT_CAP);
+  }
+  return { rows: page, next_cursor, total, total_exact };
+}
+
+const GLOBAL_COUNT_SCOPE = "all";
+
+function userCountScope(userId: string): string {
+  return `user:${userId}`;
+}
+
+async function adjustStatusCount(
+  ctx: MutationCtx,
+  scope: string,
+  status: string,
+  delta: number
+): Promise<void> {
+  const row = await ctx.db
+    .query("escrow_status_counts")
+    .withIndex("by_scope_and_status", (q) => q.eq("scope", scope).eq("status", status))
+    .first();
+  if (row) {
+    await ctx.db.patch(row._id, { count: Math.max(0, row.count + delta) });
+  } else if (delta > 0) {
+    await ctx.db.insert("escrow_status_counts", { scope, status, count: delta });
+  }
+}
+
+// Bring everything derived from an escrow in step with it: one
+// escrow_participants row per (escrow, user) and the per-user and global status
+// counts. Each participant row and escrow.counted_status record what has been
+// counted, so calling this again is a no-op. Returns the number of rows written.
+async function syncDerived(ctx: MutationCtx, escrow: Doc<"escrows">): Promise<number> {
+  const roles = new Map<string, string[]>();
+  const addRole = (userId: string | undefined, role: string) => {
+    if (userId) roles.set(userId, [...(roles.get(userId) ?? []), role]);
+  };
+  addRole(escrow.creator_user_id, "creator");
+  addRole(escrow.payer_user_id, "payer");
+  addRole(escrow.payee_user_id, "payee");
+  const updated_at = escrow.updated_at ?? escrow._creationTime;
+
+  let written = 0;
+  const existing = await ctx.db
+    .query("escrow_participants")
+    .withIndex("by_escrow", (q) => q.eq("escrow_id", escrow._id))
+    .collect();
+  for (const row of existing) {
+    const userRoles = roles.get(row.user_id);
+    roles.delete(row.user_id);
+    if (!userRoles) {
+      await ctx.db.delete(row._id);
+      await adjustStatusCount(ctx, userCountScope(row.user_id), row.status, -1);
+      written++;
+      continue;
+    }
+    if (row.status !== escrow.status) {
+      await adjustStatusCount(ctx, userCountScope(row.user_id), row.status, -1);
+      await adjustStatusCount(ctx, userCountScope(row.user_id), escrow.status, 1);
+    }
+    if (
+      row.status !== escrow.status ||
+      row.updated_at !== updated_at ||
+      row.roles.join() !== userRoles.join()
+    ) {
+      await ctx.db.patch(row._id, { roles: userRoles, status: escrow.status, updated_at });
+      written++;
+    }
+  }
+  for (const [user_id, userRoles] of roles) {
+    await ctx.db.insert("escrow_participants", {
+      escrow_id: escrow._id,
+      user_id,
+      roles: userRoles,
+      status: escrow.status,
+      updated_at,
+    });
+    await adjustStatusCount(ctx, userCountScope(user_id), escrow.status, 1);
+    written++;
+  }
+
+  if (escrow.counted_status !== escrow.status) {
+    if (escrow.counted_status !== undefined) {
+      await adjustStatusCount(ctx, GLOBAL_COUNT_SCOPE, escrow.counted_status, -1);
+    }
+    await adjustStatusCount(ctx, GLOBAL_COUNT_SCOPE, escrow.status, 1);
+    await ctx.db.patch(escrow._id, { counted_status: escrow.status });
+    written++;
+  }
+  return written;
+}
 
 export const insert = mutation({
   args: {
@@ -29,134 +200,255 @@ export const insert = mutation({
     const { internal_key: _internalKey, ...escrow } = args;
     const now = Date.now();
     const id = await ctx.db.insert("escrows", { ...escrow, updated_at: now });
-    return await ctx.db.get(id);
+    const inserted = (await ctx.db.get(id))!;
+    await syncDerived(ctx, inserted);
+    return project(inserted);
   },
 });
 
 export const get = query({
+  args: { internal_key: v.string(), id: v.id("escrows"), projection: projectionArg },
+  handler: async (ctx, args) => {
+    assertInternalKey(args.internal_key);
+    const escrow = await ctx.db.get(args.id);
+    return escrow && project(escrow, args.projection);
+  },
+});
+
+// The encrypted key that signs transfers out of the escrow; read only to settle.
+export const getSigningKey = query({
   args: { internal_key: v.string(), id: v.id("escrows") },
   handler: async (ctx, args) => {
     assertInternalKey(args.internal_key);
-    return await ctx.db.get(args.id);
+    const escrow = await ctx.db.get(args.id);
+    return escrow?.secret_key ?? null;
   },
 });
 
 export const getByPublicId = query({
-  args: { internal_key: v.string(), public_id: v.string() },
+  args: { internal_key: v.string(), public_id: v.string(), projection: projectionArg },
   handler: async (ctx, args) => {
     assertInternalKey(args.internal_key);
-    return await ctx.db
+    const escrow = await ctx.db
       .query("escrows")
       .withIndex("by_public_id", (q) => q.eq("public_id", args.public_id))
       .first();
+    return escrow && project(escrow, args.projection);
   },
 });
 
 export const getByInviteHash = query({
-  args: { internal_key: v.string(), invite_token_hash: v.string() },
+  args: {
+    internal_key: v.string(),
+    invite_token_hash: v.string(),
+    projection: projectionArg,
+  },
   handler: async (ctx, args) => {
     assertInternalKey(args.internal_key);
-    return await ctx.db
+    const escrow = await ctx.db
       .query("escrows")
       .withIndex("by_invite_token_hash", (q) =>
         q.eq("invite_token_hash", args.invite_token_hash)
       )
       .first();
+    return escrow && project(escrow, args.projection);
   },
 });
 
-export const list = query({
+export const listPage = query({
   args: {
     internal_key: v.string(),
     status_filter: v.optional(v.string()),
     limit: v.number(),
-    offset: v.number(),
+    cursor: v.optional(pageCursor),
     actor_user_id: v.optional(v.string()),
     mine_only: v.optional(v.boolean()),
+    include_total: v.optional(v.boolean()),
+    projection: projectionArg,
   },
   handler: async (ctx, args) => {
     assertInternalKey(args.internal_key);
-    let results;
+    const limit = Math.max(1, Math.min(args.limit, MAX_PAGE_SIZE));
+    const after = args.cursor ?? null;
+    const includeTotal = args.include_total ?? false;
+    const status = args.status_filter;
 
     if (args.mine_only && args.actor_user_id) {
+      // "My escrows" is one range of the participant index; the cursor is a participant row position.
       const actor = args.actor_user_id;
-      const [created, paying, payee] = await Promise.all([
-        ctx.db
-          .query("escrows")
-          .withIndex("by_creator", (q) => q.eq("creator_user_id", actor))
-          .collect(),
-        ctx.db
-          .query("escrows")
-          .withIndex("by_payer", (q) => q.eq("payer_user_id", actor))
-          .collect(),
-        ctx.db
-          .query("escrows")
-          .withIndex("by_payee", (q) => q.eq("payee_user_id", actor))
-          .collect(),
-      ]);
-
-      const merged = [...created, ...paying, ...payee];
-      const deduped = new Map(merged.map((e) => [e._id, e]));
-      results = Array.from(deduped.values());
-      if (args.status_filter) {
-        results = results.filter((e) => e.status === args.status_filter);
-      }
-    } else if (args.status_filter) {
-      results = await ctx.db
-        .query("escrows")
-        .withIndex("by_status", (q) => q.eq("status", args.status_filter!))
-        .collect();
-    } else {
-      results = await ctx.db.query("escrows").collect();
+      const range: IndexRange = status
+        ? ["by_user_status_and_updated_at", [["user_id", actor], ["status", status]]]
+        : ["by_user_and_updated_at", [["user_id", actor]]];
+      const { rows, ...rest } = await pageOf(
+        ctx, "escrow_participants", range, after, limit, includeTotal
+      );
+      const escrows = await Promise.all(rows.map((row) => ctx.db.get(row.escrow_id)));
+      const items = escrows
+        .filter((e): e is Doc<"escrows"> => e !== null)
+        .map((e) => project(e, args.projection));
+      return { items, ...rest };
     }
 
-    results.sort(
-      (a, b) =>
-        (b.updated_at ?? b._creationTime) - (a.updated_at ?? a._creationTime)
-    );
+    const range: IndexRange = status
+      ? ["by_status_and_updated_at", [["status", status]]]
+      : ["by_updated_at", []];
+    const { rows, ...rest } = await pageOf(ctx, "escrows", range, after, limit, includeTotal);
+    return { items: rows.map((e) => project(e, args.projection)), ...rest };
+  },
+});
 
-    const total = results.length;
-    const page = results.slice(args.offset, args.offset + args.limit);
-    return { total, items: page };
+// Create or repair participant rows and status counts for escrows written before
+// they existed. Idempotent; call repeatedly with the returned cursor until done.
+export const backfillDerived = mutation({
+  args: { internal_key: v.string(), cursor: v.optional(v.string()) },
+  handler: async (ctx, args) => {
+    assertInternalKey(args.internal_key);
+    const result = await ctx.db
+      .query("escrows")
+      .paginate({ numItems: BACKFILL_BATCH_SIZE, cursor: args.cursor ?? null });
+    let written = 0;
+    for (const escrow of result.page) {
+      written += await syncDerived(ctx, escrow);
+    }
+    return { written, cursor: result.isDone ? null : result.continueCursor };
+  },
+});
+
+export const statusCounts = query({
+  args: { internal_key: v.string(), user_id: v.optional(v.string()) },
+  handler: async (ctx, args) => {
+    assertInternalKey(args.internal_key);
+    const scope = args.user_id !== undefined ? userCountScope(args.user_id) : GLOBAL_COUNT_SCOPE;
+    const rows = await ctx.db
+      .query("escrow_status_counts")
+      .withIndex("by_scope_and_status", (q) => q.eq("scope", scope))
+      .collect();
+    return Object.fromEntries(rows.filter((row) => row.count > 0).map((row) => [row.status, row.count]));
   },
 });
 
+const escrowUpdates = v.object({
+  label: v.optional(v.string()),
+  recipient_address: v.optional(v.string()),
+  sender_address: v.optional(v.string()),
+  expected_amount_lamports: v.optional(v.number()),
+  status: v.optional(v.string()),
+  creator_user_id: v.optional(v.string()),
+  payer_user_id: v.optional(v.string()),
+  payee_user_id: v.optional(v.string()),
+  sender_claimed_at: v.optional(v.number()),
+  recipient_claimed_at: v.optional(v.number()),
+  join_token_hash: v.optional(v.string()),
+  join_expires_at: v.optional(v.number()),
+  invite_token_hash: v.optional(v.string()),
+  invite_expires_at: v.optional(v.number()),
+  invite_used_at: v.optional(v.number()),
+  accepted_at: v.optional(v.number()),
+  funded_at: v.optional(v.number()),
+  service_marked_complete_at: v.optional(v.number()),
+  disputed_at: v.optional(v.number()),
+  dispute_reason: v.optional(v.string()),
+  finalize_nonce: v.optional(v.number()),
+  last_intent_hash: v.optional(v.string()),
+  settled_signature: v.optional(v.string()),
+  failure_reason: v.optional(v.string()),
+});
+
+// Patch an escrow and bump its version. With expectedVersion, reject the patch
+// unless the escrow is still at that version (compare-and-swap).
+async function patchEscrow(
+  ctx: MutationCtx,
+  id: Id<"escrows">,
+  updates: Partial<Doc<"escrows">>,
+  expectedVersion: number | undefined
+): Promise<Doc<"escrows"> | null> {
+  const escrow = await ctx.db.get(id);
+  if (!escrow) return null;
+  const version = escrow.version ?? 0;
+  if (expectedVersion !== undefined && version !== expectedVersion) {
+    throw new Error(
+      `VersionConflict: escrow ${id} is at version ${version}, expected ${expectedVersion}`
+    );
+  }
+  await ctx.db.patch(id, { ...updates, version: version + 1, updated_at: Date.now() });
+  const updated = (await ctx.db.get(id))!;
+  await syncDerived(ctx, updated);
+  return updated;
+}
+
 export const update = mutation({
   args: {
     internal_key: v.string(),
     id: v.id("escrows"),
-    updates: v.object({
-      label: v.optional(v.string()),
-      recipient_address: v.optional(v.string()),
-      sender_address: v.optional(v.string()),
-      expected_amount_lamports: v.optional(v.number()),
-      status: v.optional(v.string()),
-      creator_user_id: v.optional(v.string()),
-      payer_user_id: v.optional(v.string()),
-      payee_user_id: v.optional(v.string()),
-      sender_claimed_at: v.optional(v.number()),
-      recipient_claimed_at: v.optional(v.number()),
-      join_token_hash: v.optional(v.string()),
-      join_expires_at: v.optional(v.number()),
-      invite_token_hash: v.optional(v.string()),
-      invite_expires_at: v.optional(v.number()),
-      invite_used_at: v.optional(v.number()),
-      accepted_at: v.optional(v.number()),
-      funded_at: v.optional(v.number()),
-      service_marked_complete_at: v.optional(v.number()),
-      disputed_at: v.optional(v.number()),
-      dispute_reason: v.optional(v.string()),
-      finalize_nonce: v.optional(v.number()),
-      last_intent_hash: v.optional(v.string()),
-      settled_signature: v.optional(v.string()),
-      failure_reason: v.optional(v.string()),
-      version: v.optional(v.number()),
-    }),
+    updates: escrowUpdates,
+    expected_version: v.optional(v.number()),
   },
   handler: async (ctx, args) => {
     assertInternalKey(args.internal_key);
-    const now = Date.now();
-    await ctx.db.patch(args.id, { ...args.updates, updated_at: now });
-    return await ctx.db.get(args.id);
+    const escrow = await patchEscrow(ctx, args.id, args.updates, args.expected_version);
+    return escrow && project(escrow);
+  },
+});
+
+// Record how far the funding signature scan got. This is bookkeeping, not an
+// escrow change: version and updated_at stay put, so it never conflicts with a
+// compare-and-swap write. Omitted fields are cleared.
+export const setFundingScan = mutation({
+  args: {
+    internal_key: v.string(),
+    id: v.id("escrows"),
+    cursor: v.optional(v.string()),
+    resume_before: v.optional(v.string()),
+    resume_cursor: v.optional(v.string()),
+  },
+  handler: async (ctx, args) => {
+    assertInternalKey(args.internal_key);
+    if (!(await ctx.db.get(args.id))) return null;
+    await ctx.db.patch(args.id, {
+      funding_signature_cursor: args.cursor,
+      funding_signature_resume_before: args.resume_before,
+      funding_signature_resume_cursor: args.resume_cursor,
+    });
+    return null;
+  },
+});
+
+// An escrow patch plus a transaction insert or patch in one transaction, so a
+// settlement never lands on the escrow without its transaction record.
+export const updateWithTransaction = mutation({
+  args: {
+    internal_key: v.string(),
+    id: v.id("escrows"),
+    updates: escrowUpdates,
+    expected_version: v.optional(v.number()),
+    insert_transaction: v.optional(v.object(transactionFields)),
+    update_transaction: v.optional(
+      v.object({ signature: v.string(), updates: transactionUpdates })
+    ),
+  },
+  handler: async (ctx, args) => {
+    assertInternalKey(args.internal_key);
+    const escrow = await patchEscrow(ctx, args.id, args.updates, args.expected_version);
+    if (!escrow) return { escrow: null, transaction: null };
+
+    let transaction: Doc<"transactions"> | null = null;
+    if (args.insert_transaction) {
+      const id = await ctx.db.insert("transactions", {
+        ...args.insert_transaction,
+        escrow_id: args.id,
+      });
+      transaction = await ctx.db.get(id);
+    } else if (args.update_transaction) {
+      const { signature, updates } = args.update_transaction;
+      const existing = await ctx.db
+        .query("transactions")
+        .withIndex("by_signature", (q) => q.eq("signature", signature))
+        .first();
+      if (existing) {
+        await ctx.db.patch(existing._id, updates);
+        transaction = await ctx.db.get(existing._id);
+      }
+    }
+    return { escrow: project(escrow), transaction };
   },
 });
@@ -1,23 +1,43 @@
 import { mutation, query } from "./_generated/server";
+import { Doc } from "./_generated/dataModel";
 import { v } from "convex/values";
 import { assertInternalKey } from "./_internalAuth";
 
+// Shared with convex_escrows:updateWithTransaction.
+export const transactionFields = {
+  signature: v.string(),
+  tx_type: v.string(),
+  amount_lamports: v.optional(v.number()),
+  from_address: v.optional(v.string()),
+  to_address: v.optional(v.string()),
+  status: v.string(),
+  intent_hash: v.optional(v.string()),
+  commitment_target: v.optional(v.string()),
+  last_valid_block_height: v.optional(v.number()),
+  rpc_endpoint: v.optional(v.string()),
+  raw_error: v.optional(v.string()),
+  memo: v.optional(v.string()),
+};
+
+export const transactionUpdates = v.object({
+  tx_type: v.optional(v.string()),
+  amount_lamports: v.optional(v.number()),
+  from_address: v.optional(v.string()),
+  to_address: v.optional(v.string()),
+  status: v.optional(v.string()),
+  intent_hash: v.optional(v.string()),
+  commitment_target: v.optional(v.string()),
+  last_valid_block_height: v.optional(v.number()),
+  rpc_endpoint: v.optional(v.string()),
+  raw_error: v.optional(v.string()),
+  memo: v.optional(v.string()),
+});
+
 export const insert = mutation({
   args: {
     internal_key: v.string(),
     escrow_id: v.id("escrows"),
-    signature: v.string(),
-    tx_type: v.string(),
-    amount_lamports: v.optional(v.number()),
-    from_address: v.optional(v.string()),
-    to_address: v.optional(v.string()),
-    status: v.string(),
-    intent_hash: v.optional(v.string()),
-    commitment_target: v.optional(v.string()),
-    last_valid_block_height: v.optional(v.number()),
-    rpc_endpoint: v.optional(v.string()),
-    raw_error: v.optional(v.string()),
-    memo: v.optional(v.string()),
+    ...transactionFields,
   },
   handler: async (ctx, args) => {
     assertInternalKey(args.internal_key);
@@ -39,6 +59,99 @@ export const listByEscrow = query({
   },
 });
 
+// Fields upsertMany may patch on a transaction that already exists.
+const UPSERT_PATCHABLE_FIELDS = new Set([
+  "status",
+  "raw_error",
+  "memo",
+  "amount_lamports",
+  "from_address",
+  "to_address",
+  "commitment_target",
+  "last_valid_block_height",
+  "rpc_endpoint",
+]);
+
+// Insert each item whose signature the escrow doesn't have yet; on existing
+// rows patch only the update_fields whose values changed. Returns every row,
+// in item order, with whether this call wrote it.
+export const upsertMany = mutation({
+  args: {
+    internal_key: v.string(),
+    escrow_id: v.id("escrows"),
+    items: v.array(v.object(transactionFields)),
+    update_fields: v.array(v.string()),
+  },
+  handler: async (ctx, args) => {
+    assertInternalKey(args.internal_key);
+    const updateFields = args.update_fields.filter((field) => UPSERT_PATCHABLE_FIELDS.has(field));
+    const results: { doc: Doc<"transactions">; written: boolean }[] = [];
+    for (const item of args.items) {
+      const existing = await ctx.db
+        .query("transactions")
+        .withIndex("by_signature", (q) => q.eq("signature", item.signature))
+        .filter((q) => q.eq(q.field("escrow_id"), args.escrow_id))
+        .first();
+      if (!existing) {
+        const id = await ctx.db.insert("transactions", { ...item, escrow_id: args.escrow_id });
+        results.push({ doc: (await ctx.db.get(id))!, written: true });
+        continue;
+      }
+      const changes: Record<string, unknown> = {};
+      for (const field of updateFields) {
+        const value = (item as Record<string, unknown>)[field];
+        if (value !== undefined && value !== (existing as Record<string, unknown>)[field]) {
+          changes[field] = value;
+        }
+      }
+      if (Object.keys(changes).length === 0) {
+        results.push({ doc: existing, written: false });
+        continue;
+      }
+      await ctx.db.patch(existing._id, changes);
+      results.push({ doc: (await ctx.db.get(existing._id))!, written: true });
+    }
+    return results;
+  },
+});
+
+export const getByIntent = query({
+  args: {
+    internal_key: v.string(),
+    escrow_id: v.id("escrows"),
+    tx_type: v.string(),
+    intent_hash: v.string(),
+  },
+  handler: async (ctx, args) => {
+    assertInternalKey(args.internal_key);
+    return await ctx.db
+      .query("transactions")
+      .withIndex("by_intent_hash", (q) => q.eq("intent_hash", args.intent_hash))
+      .filter((q) =>
+        q.and(
+          q.eq(q.field("escrow_id"), args.escrow_id),
+          q.eq(q.field("tx_type"), args.tx_type)
+        )
+      )
+      .order("desc")
+      .first();
+  },
+});
+
+export const latestOfType = query({
+  args: { internal_key: v.string(), escrow_id: v.id("escrows"), tx_type: v.string() },
+  handler: async (ctx, args) => {
+    assertInternalKey(args.internal_key);
+    return await ctx.db
+      .query("transactions")
+      .withIndex("by_escrow_id_and_tx_type", (q) =>
+        q.eq("escrow_id", args.escrow_id).eq("tx_type", args.tx_type)
+      )
+      .order("desc")
+      .first();
+  },
+});
+
 export const getBySignature = query({
   args: { internal_key: v.string(), signature: v.string() },
   handler: async (ctx, args) => {
@@ -68,19 +181,7 @@ export const update = mutation({
   args: {
     internal_key: v.string(),
     signature: v.string(),
-    updates: v.object({
-      tx_type: v.optional(v.string()),
-      amount_lamports: v.optional(v.number()),
-      from_address: v.optional(v.string()),
-      to_address: v.optional(v.string()),
-      status: v.optional(v.string()),
-      intent_hash: v.optional(v.string()),
-      commitment_target: v.optional(v.string()),
-      last_valid_block_height: v.optional(v.number()),
-      rpc_endpoint: v.optional(v.string()),
-      raw_error: v.optional(v.string()),
-      memo: v.optional(v.string()),
-    }),
+    updates: transactionUpdates,
   },
   handler: async (ctx, args) => {
     assertInternalKey(args.internal_key);
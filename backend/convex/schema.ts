@@ -37,6 +37,11 @@ export default defineSchema({
     last_intent_hash: v.optional(v.string()),
     settled_signature: v.optional(v.string()),
     failure_reason: v.optional(v.string()),
+    funding_signature_cursor: v.optional(v.string()),
+    funding_signature_resume_before: v.optional(v.string()),
+    funding_signature_resume_cursor: v.optional(v.string()),
+    // Status currently reflected in the global escrow_status_counts row.
+    counted_status: v.optional(v.string()),
     version: v.number(),
     updated_at: v.optional(v.number()),
   })
@@ -46,7 +51,31 @@ export default defineSchema({
     .index("by_creator", ["creator_user_id"])
     .index("by_payer", ["payer_user_id"])
     .index("by_payee", ["payee_user_id"])
-    .index("by_invite_token_hash", ["invite_token_hash"]),
+    .index("by_invite_token_hash", ["invite_token_hash"])
+    // Keyset pagination (convex_escrows:listPage), newest updated_at first.
+    .index("by_updated_at", ["updated_at"])
+    .index("by_status_and_updated_at", ["status", "updated_at"]),
+
+  // One row per (escrow, participant user), kept in step with the escrow by
+  // convex_escrows insert/update so "my escrows" is a single index range.
+  escrow_participants: defineTable({
+    escrow_id: v.id("escrows"),
+    user_id: v.string(),
+    roles: v.array(v.string()), // creator, payer, payee
+    status: v.string(),
+    updated_at: v.number(),
+  })
+    .index("by_escrow", ["escrow_id"])
+    .index("by_user_and_updated_at", ["user_id", "updated_at"])
+    .index("by_user_status_and_updated_at", ["user_id", "status", "updated_at"]),
+
+  // Escrow counts per status for each user ("user:<id>") and overall ("all"),
+  // adjusted by the same mutations that write escrows.
+  escrow_status_counts: defineTable({
+    scope: v.string(),
+    status: v.string(),
+    count: v.number(),
+  }).index("by_scope_and_status", ["scope", "status"]),
 
   transactions: defineTable({
     escrow_id: v.id("escrows"),
@@ -64,6 +93,7 @@ export default defineSchema({
     memo: v.optional(v.string()),
   })
     .index("by_escrow_id", ["escrow_id"])
+    .index("by_escrow_id_and_tx_type", ["escrow_id", "tx_type"])
     .index("by_signature", ["signature"])
     .index("by_intent_hash", ["intent_hash"]),
 
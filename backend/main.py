@@ -18,13 +18,12 @@ if not convex_internal_api_key:
 response = httpx.post(
     f"{convex_url.rstrip('/')}/api/query",
     json={
-        "path": "convex_escrows:list",
+        "path": "convex_escrows:listPage",
         "args": {
             "internal_key": convex_internal_api_key,
-            "status_filter": None,
             "limit": 5,
-            "offset": 0,
             "mine_only": False,
+            "projection": "view",
         },
     },
     timeout=20.0,
@@ -0,0 +1,13 @@
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+# Tests import the app package the way run.py does, from the backend directory.
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+# app.store picks its backend at import time: run it on a throwaway SQLite file,
+# and keep the transaction facts cache off disk unless a test builds its own.
+os.environ.setdefault("STORE_BACKEND", "sqlite")
+os.environ.setdefault("STORE_SQLITE_PATH", str(Path(tempfile.mkdtemp()) / "escrow_store.db"))
+os.environ.setdefault("SOLANA_TX_FACTS_CACHE_PATH", "")
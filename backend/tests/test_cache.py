@@ -0,0 +1,79 @@
+import asyncio
+
+import pytest
+
+from app.cache import SingleFlight
+
+
+class _Call:
+    """A call that blocks until released and counts how often it ran."""
+
+    def __init__(self, result="value"):
+        self.result = result
+        self.runs = 0
+        self.release = None
+
+    async def __call__(self):
+        self.runs += 1
+        await self.release.wait()
+        if isinstance(self.result, Exception):
+            raise self.result
+        return self.result
+
+
+def test_concurrent_calls_with_one_key_share_a_single_run():
+    flights = SingleFlight("test_coalescing")
+    call, other = _Call("a"), _Call("b")
+
+    async def scenario():
+        call.release = other.release = asyncio.Event()
+        waiters = [asyncio.ensure_future(flights.do("key", call)) for _ in range(3)]
+        waiters.append(asyncio.ensure_future(flights.do("other-key", other)))
+        await asyncio.sleep(0)
+        call.release.set()
+        return await asyncio.gather(*waiters)
+
+    assert asyncio.run(scenario()) == ["a", "a", "a", "b"]
+    assert (call.runs, other.runs) == (1, 1)
+    assert flights.stats() == {"in_flight": 0, "calls": 4, "coalesced": 2}
+
+
+def test_a_cancelled_caller_does_not_cancel_the_shared_call():
+    flights = SingleFlight("test_cancellation")
+    call = _Call()
+
+    async def scenario():
+        call.release = asyncio.Event()
+        first = asyncio.ensure_future(flights.do("key", call))
+        second = asyncio.ensure_future(flights.do("key", call))
+        await asyncio.sleep(0)
+        first.cancel()
+        await asyncio.sleep(0)
+        call.release.set()
+        with pytest.raises(asyncio.CancelledError):
+            await first
+        return await second
+
+    assert asyncio.run(scenario()) == "value"
+    assert call.runs == 1
+
+
+def test_errors_reach_every_caller_and_the_next_call_runs_again():
+    flights = SingleFlight("test_errors")
+    failing = _Call(RuntimeError("boom"))
+
+    async def scenario():
+        failing.release = asyncio.Event()
+        waiters = [asyncio.ensure_future(flights.do("key", failing)) for _ in range(2)]
+        await asyncio.sleep(0)
+        failing.release.set()
+        results = await asyncio.gather(*waiters, return_exceptions=True)
+        retry = _Call("recovered")
+        retry.release = asyncio.Event()
+        retry.release.set()
+        return results, await flights.do("key", retry)
+
+    results, retried = asyncio.run(scenario())
+    assert [str(result) for result in results] == ["boom", "boom"]
+    assert failing.runs == 1
+    assert retried == "recovered"
@@ -0,0 +1,148 @@
+import asyncio
+import secrets
+
+import pytest
+
+from app import store
+from app.exceptions import SolanaRPCError
+from app.schemas.transaction import TransactionCreate
+from app.services import escrow_service, solana_service
+
+
+def _run(coro):
+    return asyncio.run(coro)
+
+
+def _insert_release_pending(last_valid_block_height=None):
+    """An escrow in release_pending and its recorded, still pending release."""
+
+    async def setup():
+        escrow = await store.insert_escrow({
+            "public_key": f"key-{secrets.token_hex(4)}",
+            "secret_key": "secret",
+            "creator_user_id": "alice",
+        })
+        escrow = await store.update_escrow(
+            escrow["id"], {"status": "release_pending", "last_intent_hash": "intent"}
+        )
+        tx = await escrow_service.record_transaction(TransactionCreate(
+            escrow_id=escrow["id"],
+            signature=f"sig-{secrets.token_hex(8)}",
+            tx_type="release",
+            status="pending",
+            intent_hash="intent",
+            commitment_target="confirmed",
+            last_valid_block_height=last_valid_block_height,
+        ))
+        return escrow, tx
+
+    return _run(setup())
+
+
+def _confirm(escrow, tx):
+    async def confirm():
+        await escrow_service._confirm_settlement(escrow["id"], tx)
+        return (
+            await store.get_escrow(escrow["id"], fresh=True),
+            await store.get_transaction_by_signature(tx["signature"]),
+        )
+
+    return _run(confirm())
+
+
+@pytest.fixture
+def chain(monkeypatch):
+    """What the confirmer sees: the wait's outcome and whether the blockhash expired."""
+    state = {"outcome": None, "expired": False, "waited_with": []}
+
+    async def wait_for_confirmation(signature, last_valid_block_height, **kwargs):
+        state["waited_with"].append(last_valid_block_height)
+        if isinstance(state["outcome"], Exception):
+            raise state["outcome"]
+        return state["outcome"]
+
+    async def blockhash_expired(last_valid_block_height):
+        return state["expired"]
+
+    monkeypatch.setattr(solana_service, "wait_for_confirmation", wait_for_confirmation)
+    monkeypatch.setattr(solana_service, "blockhash_expired", blockhash_expired)
+    return state
+
+
+def test_confirmed_settlement_releases_the_escrow(chain):
+    escrow, tx = _insert_release_pending(400)
+    chain["outcome"] = {"status": "confirmed"}
+
+    escrow, tx = _confirm(escrow, tx)
+
+    assert escrow["status"] == "released"
+    assert escrow["settled_signature"] == tx["signature"]
+    assert tx["status"] == "confirmed"
+    assert chain["waited_with"] == [400]
+
+
+def test_failed_settlement_reverts_the_escrow(chain):
+    escrow, tx = _insert_release_pending(400)
+    chain["outcome"] = SolanaRPCError("Transaction failed: InsufficientFunds")
+
+    escrow, tx = _confirm(escrow, tx)
+
+    assert escrow["status"] == "open"
+    assert "InsufficientFunds" in escrow["failure_reason"]
+    assert tx["status"] == "failed"
+
+
+def test_expired_blockhash_fails_the_settlement(chain):
+    escrow, tx = _insert_release_pending(400)
+    chain["expired"] = True
+
+    escrow, tx = _confirm(escrow, tx)
+
+    assert escrow["status"] == "open"
+    assert tx["status"] == "failed"
+    assert "blockhash expired" in tx["raw_error"]
+
+
+@pytest.mark.parametrize("last_valid_block_height", [400, None])
+def test_unconfirmed_settlement_stays_pending_without_expiry(chain, last_valid_block_height):
+    escrow, tx = _insert_release_pending(last_valid_block_height)
+
+    escrow, tx = _confirm(escrow, tx)
+
+    # The transfer can still land, so nothing may let a second one go out.
+    assert escrow["status"] == "release_pending"
+    assert tx["status"] == "pending"
+    assert chain["waited_with"] == [last_valid_block_height]
+
+
+def test_confirmer_crash_leaves_the_settlement_pending(chain):
+    escrow, tx = _insert_release_pending(400)
+    chain["outcome"] = ConnectionError("RPC unreachable")
+
+    escrow, tx = _confirm(escrow, tx)
+
+    assert escrow["status"] == "release_pending"
+    assert tx["status"] == "pending"
+
+
+def test_long_poll_returns_an_escrow_settled_during_the_wait(monkeypatch):
+    async def sync_funding_state(escrow):
+        return {"escrow": escrow, "balance_lamports": 0, "funded": False}
+
+    monkeypatch.setattr(escrow_service, "_sync_funding_state", sync_funding_state)
+
+    async def scenario():
+        escrow = await store.insert_escrow({
+            "public_key": f"key-{secrets.token_hex(4)}",
+            "secret_key": "secret",
+            "creator_user_id": "alice",
+        })
+        poll = asyncio.ensure_future(escrow_service.sync_funding(
+            escrow["public_id"], "alice", wait_seconds=5.0, known_version=escrow["version"],
+        ))
+        await asyncio.sleep(0.05)
+        await escrow_service._update_escrow(escrow["id"], {"status": "released"})
+        return await asyncio.wait_for(poll, 2.0)
+
+    result = _run(scenario())
+    assert result["escrow"]["status"] == "released"
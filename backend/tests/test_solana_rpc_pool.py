@@ -0,0 +1,20 @@
+from app.services.solana_rpc_pool import RpcEndpoint, redact_url
+
+
+def test_redact_url_keeps_only_scheme_host_and_port():
+    assert redact_url("https://mainnet.helius-rpc.com/?api-key=secret") == "https://mainnet.helius-rpc.com"
+    assert redact_url("https://user:pw@rpc.example.com:8443/v2/secret") == "https://rpc.example.com:8443"
+    assert redact_url("not a url") == "<redacted>"
+
+
+def test_endpoint_snapshot_leaks_no_url_secrets():
+    endpoint = RpcEndpoint("https://rpc.example.com/v2/secret?api-key=secret")
+    endpoint.mark_failed(ConnectionError(
+        "Client error '429' for url 'https://rpc.example.com/v2/secret?api-key=secret'"
+    ))
+
+    snapshot = endpoint.snapshot()
+
+    assert "secret" not in str(snapshot)
+    assert snapshot["url"] == "https://rpc.example.com"
+    assert snapshot["last_error"] == "Client error '429' for url 'https://rpc.example.com'"
@@ -0,0 +1,230 @@
+import asyncio
+import time
+from types import SimpleNamespace
+
+import pytest
+from solders.pubkey import Pubkey
+from solders.signature import Signature
+
+from app.cache import TTLCache
+from app.services import solana_service, solana_subscriptions
+from app.services.solana_subscriptions import SubscriptionEngine
+
+_NOT_FOUND = {"status": "not_found", "slot": None, "confirmations": None, "err": None}
+_PROCESSED = {"status": "processed", "slot": 10, "confirmations": 0, "err": None}
+
+
+class _FakeRpc:
+    """Answers the batched reads from dicts and records every request."""
+
+    def __init__(self):
+        self.statuses: dict[str, object] = {}
+        self.lamports: dict[str, int] = {}
+        self.calls: list[tuple[str, int]] = []
+
+    async def get_signature_statuses(self, signatures):
+        self.calls.append(("getSignatureStatuses", len(signatures)))
+        return SimpleNamespace(value=[self.statuses.get(str(s)) for s in signatures])
+
+    async def get_multiple_accounts(self, pubkeys):
+        self.calls.append(("getMultipleAccounts", len(pubkeys)))
+        return SimpleNamespace(value=[
+            SimpleNamespace(lamports=self.lamports[str(p)]) if str(p) in self.lamports else None
+            for p in pubkeys
+        ])
+
+
+@pytest.fixture
+def rpc(monkeypatch):
+    fake = _FakeRpc()
+
+    async def read(operation):
+        return await operation(fake), "http://rpc"
+
+    monkeypatch.setattr(solana_service._pool, "read", read)
+    monkeypatch.setattr(solana_service, "_tx_status_cache", TTLCache("test_statuses", 1000, 60))
+    monkeypatch.setattr(solana_service, "_balance_cache", TTLCache("test_balances", 1000, 60))
+    return fake
+
+
+def test_signature_statuses_are_fetched_in_chunks_and_mapped_back(rpc):
+    signatures = [str(Signature.new_unique()) for _ in range(300)]
+    rpc.statuses[signatures[0]] = SimpleNamespace(
+        confirmation_status="TransactionConfirmationStatus.Finalized",
+        slot=12,
+        confirmations=None,
+        err=None,
+    )
+    rpc.statuses[signatures[299]] = SimpleNamespace(
+        confirmation_status="TransactionConfirmationStatus.Processed",
+        slot=13,
+        confirmations=0,
+        err="InstructionError",
+    )
+
+    statuses = asyncio.run(solana_service.get_transaction_statuses(signatures))
+
+    assert rpc.calls == [("getSignatureStatuses", 256), ("getSignatureStatuses", 44)]
+    assert list(statuses) == signatures
+    assert statuses[signatures[0]] == {
+        "status": "finalized", "slot": 12, "confirmations": None, "err": None,
+    }
+    assert statuses[signatures[299]]["status"] == "processed"
+    assert statuses[signatures[299]]["err"] == "InstructionError"
+    assert statuses[signatures[1]]["status"] == "not_found"
+
+
+def test_cached_signature_statuses_are_not_fetched_again(rpc):
+    signatures = [str(Signature.new_unique()) for _ in range(3)]
+    asyncio.run(solana_service.get_transaction_statuses(signatures[:2]))
+
+    asyncio.run(solana_service.get_transaction_statuses([*signatures, signatures[0]]))
+
+    assert rpc.calls == [("getSignatureStatuses", 2), ("getSignatureStatuses", 1)]
+
+
+def test_balances_are_fetched_in_chunks_and_mapped_back(rpc):
+    addresses = [str(Pubkey.new_unique()) for _ in range(150)]
+    for index, address in enumerate(addresses[:149]):
+        rpc.lamports[address] = 1_000 + index
+
+    balances = asyncio.run(solana_service.get_balances([*addresses, addresses[0]]))
+
+    assert rpc.calls == [("getMultipleAccounts", 100), ("getMultipleAccounts", 50)]
+    assert list(balances) == addresses
+    assert balances[addresses[0]] == 1_000
+    assert balances[addresses[120]] == 1_120
+    # An account that does not exist yet holds nothing.
+    assert balances[addresses[149]] == 0
+
+
+def test_cached_balances_are_not_fetched_again(rpc):
+    addresses = [str(Pubkey.new_unique()) for _ in range(3)]
+    rpc.lamports = {address: 5 for address in addresses}
+    asyncio.run(solana_service.get_balances(addresses[:2]))
+
+    balances = asyncio.run(solana_service.get_balances(addresses))
+
+    assert rpc.calls == [("getMultipleAccounts", 2), ("getMultipleAccounts", 1)]
+    assert balances == {address: 5 for address in addresses}
+
+
+@pytest.fixture
+def account_state(monkeypatch):
+    monkeypatch.setattr(solana_service, "_pushed_balances", {})
+    monkeypatch.setattr(solana_service, "_account_change_counters", {})
+
+
+def test_evicted_account_drops_its_pushed_balance_and_marker(account_state):
+    engine = SubscriptionEngine("ws://unused", max_account_subscriptions=1)
+    engine._account_callback = solana_service.on_account_notification
+
+    async def scenario():
+        await engine.subscribe_account("alpha")
+        solana_service.on_account_notification("alpha", 5_000, engine.ws_url)
+        marker = solana_service._account_change_marker("alpha")
+        await engine.subscribe_account("beta")  # evicts alpha
+        return marker
+
+    marker_before = asyncio.run(scenario())
+
+    assert "alpha" not in solana_service._pushed_balances
+    assert "alpha" not in solana_service._account_change_counters
+    # Watching it again must look like a change, so the next funding scan runs.
+    assert solana_service._account_change_marker("alpha") != marker_before
+
+
+def test_account_notifications_replace_the_change_marker(account_state):
+    first = solana_service._account_change_marker("alpha")
+    assert solana_service._account_change_marker("alpha") == first
+
+    solana_service.on_account_notification("alpha", 7, "ws://rpc")
+    assert solana_service._pushed_balances["alpha"] == ("ws://rpc", 7)
+    assert solana_service._account_change_marker("alpha") != first
+
+
+def test_pushed_balance_is_served_only_from_the_active_socket(account_state, rpc, monkeypatch):
+    address = str(Pubkey.new_unique())
+    active = SimpleNamespace(ws_url="ws://active", is_watching=lambda _: True)
+    monkeypatch.setattr(solana_subscriptions, "active_engine", lambda: active)
+    rpc.lamports[address] = 10
+
+    async def get_balance_from_rpc(pubkey):
+        rpc.calls.append(("getBalance", 1))
+        return SimpleNamespace(value=rpc.lamports[str(pubkey)])
+
+    rpc.get_balance = get_balance_from_rpc
+
+    solana_service.on_account_notification(address, 99, "ws://active")
+    assert asyncio.run(solana_service.get_balance(address)) == 99
+    assert rpc.calls == []
+
+    # A push from a socket the pool has failed away from is not trusted.
+    solana_service.on_account_notification(address, 50, "ws://other")
+    assert asyncio.run(solana_service.get_balance(address)) == 10
+    assert rpc.calls == [("getBalance", 1)]
+
+
+def test_subscription_wait_stops_once_the_blockhash_expires(monkeypatch):
+    class Height:
+        value = 500
+
+    async def read(operation):
+        return Height(), "http://rpc"
+
+    monkeypatch.setattr(solana_service._pool, "read", read)
+    monkeypatch.setattr(solana_service, "MAX_POLL_SECONDS", 0.05)
+
+    async def scenario():
+        never_notified = asyncio.get_running_loop().create_future()
+        return await solana_service._wait_for_notification(never_notified, 400, 5.0)
+
+    started = time.monotonic()
+    assert asyncio.run(scenario()) is None
+    assert time.monotonic() - started < 1.0
+
+
+@pytest.fixture
+def statuses(monkeypatch):
+    """Serve signature statuses from a list, one per RPC fetch, repeating the last."""
+    served: list[dict] = []
+    fetches = []
+
+    async def fetch(signatures):
+        fetches.append(time.monotonic())
+        status = served[min(len(fetches) - 1, len(served) - 1)]
+        return {signature: dict(status) for signature in signatures}
+
+    async def get_status(signature):
+        return (await fetch([signature]))[signature]
+
+    monkeypatch.setattr(solana_service, "_fetch_signature_statuses", fetch)
+    monkeypatch.setattr(solana_service, "get_transaction_status", get_status)
+    monkeypatch.setattr(solana_service, "DEFAULT_POLL_SECONDS", 0.05)
+    monkeypatch.setattr(solana_service, "MAX_POLL_SECONDS", 0.05)
+    return served, fetches
+
+
+def test_not_found_long_poll_waits_for_the_timeout(statuses):
+    served, fetches = statuses
+    served.append(_NOT_FOUND)
+
+    started = time.monotonic()
+    result = asyncio.run(solana_service.wait_for_status_change("sig", "not_found", 0.3))
+
+    assert result["status"] == "not_found"
+    assert time.monotonic() - started >= 0.3
+    # One initial read, then polls at the poll interval rather than a tight loop.
+    assert len(fetches) <= 1 + 0.3 / 0.05 + 1
+
+
+def test_not_found_long_poll_returns_once_the_signature_appears(statuses):
+    served, fetches = statuses
+    served += [_NOT_FOUND, _NOT_FOUND, _PROCESSED]
+
+    started = time.monotonic()
+    result = asyncio.run(solana_service.wait_for_status_change("sig", "not_found", 5.0))
+
+    assert result["status"] == "processed"
+    assert time.monotonic() - started < 1.0
+    assert len(fetches) == 3
@@ -0,0 +1,170 @@
+import asyncio
+import itertools
+import json
+
+import pytest
+import websockets
+
+from app.config import settings
+from app.exceptions import SolanaRPCError
+from app.services import solana_service, solana_subscriptions
+from app.services.solana_subscriptions import SubscriptionEngine
+
+
+class _StandInPubSub:
+    """
+    A local Solana PubSub server: acknowledges every subscribe request and,
+    when told to, answers a signatureSubscribe with its notification at once.
+    """
+
+    def __init__(self, signature_result=None):
+        self.signature_result = signature_result
+        self.requests: list[dict] = []
+        self.subscriptions: dict[str, int] = {}  # address or signature -> id
+        self.sockets = []
+        self._ids = itertools.count(100)
+
+    async def handle(self, ws, path=None):
+        self.sockets.append(ws)
+        async for raw in ws:
+            request = json.loads(raw)
+            self.requests.append(request)
+            if not request["method"].endswith("Subscribe"):
+                continue
+            subscription_id = next(self._ids)
+            self.subscriptions[request["params"][0]] = subscription_id
+            await ws.send(json.dumps({"jsonrpc": "2.0", "id": request["id"], "result": subscription_id}))
+            if request["method"] == "signatureSubscribe" and self.signature_result is not None:
+                await self.push(ws, "signatureNotification", subscription_id, {
+                    "context": {"slot": 42}, "value": self.signature_result,
+                })
+
+    async def push(self, ws, method, subscription_id, result):
+        await ws.send(json.dumps({
+            "jsonrpc": "2.0",
+            "method": method,
+            "params": {"subscription": subscription_id, "result": result},
+        }))
+
+    def subscribed(self, method: str) -> list:
+        return [r["params"][0] for r in self.requests if r["method"] == method]
+
+
+async def _serve(pubsub: _StandInPubSub):
+    server = await websockets.serve(pubsub.handle, "127.0.0.1", 0)
+    port = server.sockets[0].getsockname()[1]
+    return server, f"ws://127.0.0.1:{port}"
+
+
+async def _eventually(condition, timeout=2.0):
+    deadline = asyncio.get_running_loop().time() + timeout
+    while not condition():
+        assert asyncio.get_running_loop().time() < deadline, "condition not met in time"
+        await asyncio.sleep(0.01)
+
+
+@pytest.fixture(autouse=True)
+def fast_reconnect(monkeypatch):
+    monkeypatch.setattr(solana_subscriptions, "_RECONNECT_MIN_SECONDS", 0.01)
+
+
+def test_signature_notification_resolves_the_waiter():
+    pubsub = _StandInPubSub(signature_result={"err": None})
+
+    async def scenario():
+        server, ws_url = await _serve(pubsub)
+        engine = SubscriptionEngine(ws_url)
+        engine.start()
+        try:
+            assert await engine.wait_connected(2.0)
+            _, notified = await engine.subscribe_signature("sig-1", "confirmed")
+            return await asyncio.wait_for(notified, 2.0)
+        finally:
+            await engine.stop()
+            server.close()
+
+    assert asyncio.run(scenario()) == {"slot": 42, "err": None}
+    assert pubsub.requests[0]["params"] == ["sig-1", {"commitment": "confirmed"}]
+
+
+def test_dropped_socket_fails_signature_waiters_and_resubscribes_accounts():
+    pubsub = _StandInPubSub()
+    pushes = []
+
+    async def scenario():
+        server, ws_url = await _serve(pubsub)
+        engine = SubscriptionEngine(ws_url)
+        engine.start(lambda address, lamports, source: pushes.append((address, lamports, source)))
+        try:
+            assert await engine.wait_connected(2.0)
+            assert await engine.subscribe_account("escrow-key")
+            await pubsub.push(pubsub.sockets[0], "accountNotification",
+                              pubsub.subscriptions["escrow-key"],
+                              {"context": {"slot": 1}, "value": {"lamports": 2_000}})
+            await _eventually(lambda: pushes)
+            _, notified = await engine.subscribe_signature("sig-1", "confirmed")
+
+            await pubsub.sockets[0].close()
+            with pytest.raises(ConnectionError):
+                await asyncio.wait_for(notified, 2.0)
+            # The account is subscribed again on the new socket.
+            await _eventually(lambda: pubsub.subscribed("accountSubscribe") == ["escrow-key"] * 2)
+            await _eventually(lambda: engine.is_watching("escrow-key"))
+        finally:
+            await engine.stop()
+            server.close()
+
+    asyncio.run(scenario())
+    assert pushes[0][:2] == ("escrow-key", 2_000)
+    # Whatever was pushed before the reconnect is no longer known to be current.
+    assert pushes[-1][:2] == ("escrow-key", None)
+
+
+@pytest.fixture
+def subscriptions_enabled(monkeypatch):
+    monkeypatch.setattr(settings, "solana_subscriptions_enabled", True)
+
+
+def test_each_rpc_endpoint_gets_a_socket_and_the_best_ranked_one_is_used(subscriptions_enabled):
+    order = []
+
+    async def scenario():
+        servers = [await _serve(_StandInPubSub()) for _ in range(2)]
+        rpc_urls = [ws_url.replace("ws://", "http://") for _, ws_url in servers]
+        order[:] = rpc_urls
+        await solana_subscriptions.start(rpc_urls, ranked_rpc_urls=lambda: order)
+        try:
+            first = solana_subscriptions.active_engine()
+            order.reverse()  # the pool now ranks the second endpoint first
+            second = solana_subscriptions.active_engine()
+            return first.ws_url, second.ws_url, [ws_url for _, ws_url in servers]
+        finally:
+            await solana_subscriptions.stop()
+            for server, _ in servers:
+                server.close()
+
+    first, second, ws_urls = asyncio.run(scenario())
+    assert (first, second) == (ws_urls[0], ws_urls[1])
+
+
+def test_confirmation_wait_survives_status_check_errors(subscriptions_enabled, monkeypatch):
+    async def unreachable(signatures):
+        raise SolanaRPCError("connection reset")
+
+    monkeypatch.setattr(solana_service, "_fetch_signature_statuses", unreachable)
+
+    async def wait(pubsub, timeout):
+        server, ws_url = await _serve(pubsub)
+        await solana_subscriptions.start([ws_url.replace("ws://", "http://")])
+        try:
+            return await solana_service.wait_for_confirmation("sig-1", None, timeout_seconds=timeout)
+        finally:
+            await solana_subscriptions.stop()
+            server.close()
+
+    confirmed = asyncio.run(wait(_StandInPubSub(signature_result={"err": None}), 2.0))
+    assert confirmed["status"] == "confirmed"
+    assert confirmed["slot"] == 42
+
+    # No notification and no status either: unknown, not an error.
+    assert asyncio.run(wait(_StandInPubSub(), 0.2)) is None
@@ -0,0 +1,99 @@
+import asyncio
+import json
+import sqlite3
+
+from solders.pubkey import Pubkey
+from solders.rpc.responses import GetTransactionResp
+from solders.signature import Signature
+
+from app.services import solana_service
+from app.services.solana_tx_facts import TransactionFactsCache
+
+_SYSTEM_PROGRAM = "11111111111111111111111111111111"
+
+
+def _facts(signature: str) -> dict:
+    return {
+        "signature": signature,
+        "slot": 7,
+        "block_time": 1_700_000_000,
+        "transfers": [{"source": "a", "destination": "b", "lamports": 5}],
+        "signers": ["a"],
+    }
+
+
+def test_hits_are_written_in_batches_and_keep_entries_from_eviction(tmp_path):
+    facts_cache = TransactionFactsCache(str(tmp_path / "facts.db"), max_entries=2)
+
+    async def scenario():
+        await facts_cache.put(_facts("old"))
+        await facts_cache.put(_facts("new"))
+        assert await facts_cache.get("old") == _facts("old")
+        # A hit is only noted in memory until the next write.
+        with sqlite3.connect(tmp_path / "facts.db") as reader:
+            last_used = dict(reader.execute("SELECT signature, last_used FROM tx_facts"))
+        assert last_used["old"] < last_used["new"]
+
+        await facts_cache.put(_facts("newest"))  # evicts the least recently used
+        found = {sig: await facts_cache.get(sig) is not None for sig in ("old", "new", "newest")}
+        await facts_cache.aclose()
+        return found
+
+    assert asyncio.run(scenario()) == {"old": True, "new": False, "newest": True}
+    assert facts_cache.stats()["evictions"] == 1
+
+
+def _parsed_transfer(signature: str, source: str, destination: str) -> GetTransactionResp:
+    return GetTransactionResp.from_json(json.dumps({"jsonrpc": "2.0", "id": 1, "result": {
+        "slot": 9,
+        "blockTime": 1_700_000_000,
+        "meta": {
+            "err": None, "fee": 5000, "preBalances": [10, 0, 1], "postBalances": [5, 0, 1],
+            "innerInstructions": [], "logMessages": [], "preTokenBalances": [],
+            "postTokenBalances": [], "rewards": [], "status": {"Ok": None},
+        },
+        "transaction": {"signatures": [signature], "message": {
+            "accountKeys": [
+                {"pubkey": source, "signer": True, "writable": True, "source": "transaction"},
+                {"pubkey": destination, "signer": False, "writable": True, "source": "transaction"},
+                {"pubkey": _SYSTEM_PROGRAM, "signer": False, "writable": False, "source": "transaction"},
+            ],
+            "recentBlockhash": "EkSnNWid2cvwEVnVx9aBqawnmiCNiDgp3gUdkDPTKN1N",
+            "instructions": [{
+                "program": "system",
+                "programId": _SYSTEM_PROGRAM,
+                "parsed": {"type": "transfer", "info": {
+                    "source": source, "destination": destination, "lamports": 5,
+                }},
+            }],
+        }},
+    }}))
+
+
+def test_sender_inference_reads_through_the_pool_and_the_facts_cache(tmp_path, monkeypatch):
+    signature = str(Signature.new_unique())
+    source, destination = str(Pubkey.new_unique()), str(Pubkey.new_unique())
+    requests = []
+
+    class Rpc:
+        async def get_transaction(self, tx_sig, encoding, commitment, max_supported_transaction_version):
+            requests.append((str(tx_sig), encoding, commitment))
+            return _parsed_transfer(str(tx_sig), source, destination)
+
+    async def read(operation):
+        return await operation(Rpc()), "http://rpc"
+
+    monkeypatch.setattr(solana_service._pool, "read", read)
+    monkeypatch.setattr(
+        solana_service, "_tx_facts", TransactionFactsCache(str(tmp_path / "facts.db"), 10)
+    )
+
+    async def scenario():
+        first = await solana_service.infer_system_transfer_sender(signature, destination)
+        again = await solana_service.infer_system_transfer_sender(signature, destination)
+        await solana_service._tx_facts.aclose()
+        return first, again
+
+    assert asyncio.run(scenario()) == (source, source)
+    # The finalized transaction was fetched once, then served from the cache.
+    assert requests == [(signature, "jsonParsed", "finalized")]
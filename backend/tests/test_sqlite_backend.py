@@ -0,0 +1,190 @@
+import asyncio
+
+import pytest
+
+from app.storage.sqlite import SqliteBackend
+
+
+@pytest.fixture
+def backend(tmp_path):
+    backend = SqliteBackend(str(tmp_path / "store.db"))
+    yield backend
+    asyncio.run(backend.aclose())
+
+
+def _run(coro):
+    return asyncio.run(coro)
+
+
+def _insert_escrow(backend, public_id, **fields):
+    return _run(backend.mutation("convex_escrows:insert", {
+        "public_id": public_id,
+        "public_key": f"key-{public_id}",
+        "secret_key": f"secret-{public_id}",
+        "status": "open",
+        "creator_user_id": "alice",
+        "finalize_nonce": 0,
+        "version": 0,
+        **fields,
+    }))
+
+
+def _deposit(signature, status="processed", **fields):
+    return {
+        "signature": signature,
+        "tx_type": "deposit",
+        "to_address": "escrow-key",
+        "status": status,
+        "commitment_target": "confirmed",
+        "rpc_endpoint": "http://rpc",
+        **fields,
+    }
+
+
+def test_update_applies_only_at_the_expected_version(backend):
+    escrow = _insert_escrow(backend, "p1")
+
+    updated = _run(backend.mutation("convex_escrows:update", {
+        "id": escrow["_id"], "updates": {"status": "funded"}, "expected_version": 0,
+    }))
+    assert updated["status"] == "funded"
+    assert updated["version"] == 1
+
+    with pytest.raises(RuntimeError, match="^VersionConflict"):
+        _run(backend.mutation("convex_escrows:update", {
+            "id": escrow["_id"], "updates": {"status": "cancelled"}, "expected_version": 0,
+        }))
+    current = _run(backend.query("convex_escrows:get", {"id": escrow["_id"]}))
+    assert current["status"] == "funded"
+    assert current["version"] == 1
+
+
+def test_list_page_walks_every_escrow_once_newest_first(backend):
+    ids = [_insert_escrow(backend, f"p{i}")["_id"] for i in range(7)]
+    # Touching an escrow moves it to the front of the listing.
+    _run(backend.mutation("convex_escrows:update", {"id": ids[2], "updates": {"label": "x"}}))
+
+    seen, cursor = [], None
+    while True:
+        page = _run(backend.query("convex_escrows:listPage", {
+            "limit": 3, "cursor": cursor, "include_total": True,
+        }))
+        assert page["total"] == 7
+        seen += [item["_id"] for item in page["items"]]
+        cursor = page["next_cursor"]
+        if cursor is None:
+            break
+
+    assert seen == [ids[2], *reversed([i for i in ids if i != ids[2]])]
+
+
+def test_list_page_for_a_participant_filters_by_status(backend):
+    mine = _insert_escrow(backend, "p1", payer_user_id="bob")
+    _insert_escrow(backend, "p2")
+    _run(backend.mutation("convex_escrows:update", {"id": mine["_id"], "updates": {"status": "funded"}}))
+
+    page = _run(backend.query("convex_escrows:listPage", {
+        "limit": 10, "actor_user_id": "bob", "mine_only": True, "status_filter": "funded",
+    }))
+    assert [item["_id"] for item in page["items"]] == [mine["_id"]]
+    assert page["next_cursor"] is None
+
+
+def test_status_counts_follow_escrow_writes(backend):
+    first = _insert_escrow(backend, "p1", payer_user_id="bob")
+    _insert_escrow(backend, "p2")
+    _run(backend.mutation("convex_escrows:update", {
+        "id": first["_id"], "updates": {"status": "funded", "payer_user_id": "carol"},
+    }))
+
+    def counts(user_id=None):
+        return _run(backend.query("convex_escrows:statusCounts", {"user_id": user_id}))
+
+    assert counts() == {"open": 1, "funded": 1}
+    assert counts("alice") == {"open": 1, "funded": 1}
+    assert counts("bob") == {}
+    assert counts("carol") == {"funded": 1}
+
+    # A database from before the counter rows is recounted by the backfill.
+    with backend._lock:
+        backend._connection().execute("DELETE FROM escrow_status_counts")
+    assert counts() == {}
+    assert _run(backend.mutation("convex_escrows:backfillDerived", {}))["written"] == 5
+    assert counts() == {"open": 1, "funded": 1} and counts("carol") == {"funded": 1}
+    assert _run(backend.mutation("convex_escrows:backfillDerived", {}))["written"] == 0
+
+
+def test_version_conflict_rolls_back_the_transaction_write(backend):
+    escrow = _insert_escrow(backend, "p1")
+
+    with pytest.raises(RuntimeError, match="^VersionConflict"):
+        _run(backend.mutation("convex_escrows:updateWithTransaction", {
+            "id": escrow["_id"],
+            "updates": {"status": "released"},
+            "expected_version": 3,
+            "insert_transaction": {**_deposit("sig-1"), "tx_type": "release"},
+        }))
+    assert _run(backend.query("convex_transactions:getBySignature", {"signature": "sig-1"})) is None
+
+
+def test_upsert_many_only_writes_changes(backend):
+    escrow_id = _insert_escrow(backend, "p1")["_id"]
+    update_fields = ["status", "raw_error", "memo"]
+
+    first = _run(backend.mutation("convex_transactions:upsertMany", {
+        "escrow_id": escrow_id,
+        "items": [_deposit("sig-1"), _deposit("sig-2")],
+        "update_fields": update_fields,
+    }))
+    assert [result["written"] for result in first] == [True, True]
+
+    again = _run(backend.mutation("convex_transactions:upsertMany", {
+        "escrow_id": escrow_id,
+        "items": [_deposit("sig-1"), _deposit("sig-2", status="confirmed")],
+        "update_fields": update_fields,
+    }))
+    assert [result["written"] for result in again] == [False, True]
+    assert again[1]["doc"]["status"] == "confirmed"
+    assert again[0]["doc"]["_id"] == first[0]["doc"]["_id"]
+
+
+def test_upsert_many_leaves_fields_outside_update_fields_alone(backend):
+    escrow_id = _insert_escrow(backend, "p1")["_id"]
+    _run(backend.mutation("convex_transactions:insert", {
+        **_deposit("sig-1"), "escrow_id": escrow_id, "tx_type": "release",
+    }))
+
+    result = _run(backend.mutation("convex_transactions:upsertMany", {
+        "escrow_id": escrow_id,
+        "items": [_deposit("sig-1")],
+        "update_fields": ["status", "tx_type"],
+    }))
+    assert result[0]["written"] is False
+    assert result[0]["doc"]["tx_type"] == "release"
+
+
+def test_escrow_reads_never_carry_the_secret_key(backend):
+    escrow = _insert_escrow(backend, "p1", join_token_hash="join-hash")
+    assert "secret_key" not in escrow
+
+    full = _run(backend.query("convex_escrows:getByPublicId", {"public_id": "p1"}))
+    view = _run(backend.query("convex_escrows:get", {"id": escrow["_id"], "projection": "view"}))
+    assert "secret_key" not in full and full["join_token_hash"] == "join-hash"
+    assert "secret_key" not in view and "join_token_hash" not in view
+    assert _run(backend.query("convex_escrows:getSigningKey", {"id": escrow["_id"]})) == "secret-p1"
+
+
+def test_funding_scan_position_does_not_bump_the_version(backend):
+    escrow = _insert_escrow(backend, "p1")
+
+    _run(backend.mutation("convex_escrows:setFundingScan", {
+        "id": escrow["_id"], "cursor": "sig-9", "resume_before": "sig-3",
+    }))
+    current = _run(backend.query("convex_escrows:get", {"id": escrow["_id"]}))
+    assert current["funding_signature_cursor"] == "sig-9"
+    assert current["funding_signature_resume_before"] == "sig-3"
+    assert (current["version"], current["updated_at"]) == (escrow["version"], escrow["updated_at"])
+
+    _run(backend.mutation("convex_escrows:setFundingScan", {"id": escrow["_id"], "cursor": "sig-9"}))
+    current = _run(backend.query("convex_escrows:get", {"id": escrow["_id"]}))
+    assert "funding_signature_resume_before" not in current
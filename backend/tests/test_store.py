@@ -0,0 +1,51 @@
+import asyncio
+import secrets
+
+import pytest
+
+from app import store
+from app.exceptions import EscrowVersionConflictError
+
+
+def _run(coro):
+    return asyncio.run(coro)
+
+
+async def _new_escrow() -> dict:
+    return await store.insert_escrow({
+        "public_key": f"key-{secrets.token_hex(4)}",
+        "secret_key": "secret",
+        "creator_user_id": "alice",
+    })
+
+
+def test_session_commit_writes_deferred_patches_at_the_version_read():
+    async def scenario():
+        escrow = await _new_escrow()
+        flushed = []
+        async with store.session(on_escrow_flushed=flushed.append):
+            read = await store.get_escrow(escrow["id"], fresh=True)
+            assert store.defer_escrow_update(escrow["id"], {"sender_address": "sender"})
+            assert read["sender_address"] is None  # callers hold their own copies
+        return escrow, flushed, await store.get_escrow(escrow["id"], fresh=True)
+
+    escrow, flushed, current = _run(scenario())
+    assert current["sender_address"] == "sender"
+    assert current["version"] == escrow["version"] + 1
+    assert [e["version"] for e in flushed] == [current["version"]]
+
+
+def test_session_commit_refuses_to_overwrite_a_concurrent_write():
+    async def scenario():
+        escrow = await _new_escrow()
+        with pytest.raises(EscrowVersionConflictError):
+            async with store.session():
+                await store.get_escrow(escrow["id"], fresh=True)
+                store.defer_escrow_update(escrow["id"], {"sender_address": "sender"})
+                # A task spawned by the request writes outside its session.
+                await asyncio.create_task(store.update_escrow(escrow["id"], {"label": "moved"}))
+        return await store.get_escrow(escrow["id"], fresh=True)
+
+    current = _run(scenario())
+    assert current["label"] == "moved"
+    assert current["sender_address"] is None
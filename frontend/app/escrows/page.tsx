@@ -67,7 +67,7 @@ export default function EscrowsPage() {
             new Date(a.updated_at ?? a.created_at).getTime()
         );
         setEscrows(sorted);
-        setTotal(res.total);
+        setTotal(res.total ?? res.items.length);
         setEffectiveScope(requestedScope);
         setScopeNotice(null);
       } catch {
@@ -82,7 +82,7 @@ export default function EscrowsPage() {
                 new Date(a.updated_at ?? a.created_at).getTime()
             );
             setEscrows(sorted);
-            setTotal(fallback.total);
+            setTotal(fallback.total ?? fallback.items.length);
             setEffectiveScope("mine");
             setScopeNotice("Admin permissions required for all-escrow scope.");
             return;
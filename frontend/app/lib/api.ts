@@ -1,6 +1,7 @@
 import type {
   Escrow,
   EscrowListResponse,
+  EscrowSummaryResponse,
   BalanceResponse,
   ReleaseResponse,
   CancelResponse,
@@ -188,7 +189,7 @@ export async function getEscrowByPublicId(publicId: string): Promise<Escrow> {
 export async function listEscrows(
   status?: EscrowStatus,
   scope: "mine" | "all" = "mine",
-  options?: { limit?: number; offset?: number }
+  options?: { limit?: number; cursor?: string; includeBalances?: boolean }
 ): Promise<EscrowListResponse> {
   const query = new URLSearchParams();
   if (status) query.set("status", status);
@@ -196,13 +197,22 @@ export async function listEscrows(
   if (typeof options?.limit === "number") {
     query.set("limit", String(options.limit));
   }
-  if (typeof options?.offset === "number") {
-    query.set("offset", String(options.offset));
+  if (options?.cursor) {
+    query.set("cursor", options.cursor);
+  }
+  if (options?.includeBalances) {
+    query.set("include_balances", "true");
   }
   const params = query.toString() ? `?${query.toString()}` : "";
   return request<EscrowListResponse>(`/api/v1/escrows/${params}`);
 }
 
+export async function getEscrowSummary(
+  scope: "mine" | "all" = "mine"
+): Promise<EscrowSummaryResponse> {
+  return request<EscrowSummaryResponse>(`/api/v1/escrows/summary?scope=${scope}`);
+}
+
 export async function getBalance(id: string): Promise<BalanceResponse> {
   return request<BalanceResponse>(`/api/v1/escrows/${id}/balance`);
 }
@@ -39,11 +39,20 @@ export interface Escrow {
   updated_at: string;
   join_token?: string | null;
   claim_link?: string | null;
+  balance_lamports?: number | null;
 }
 
 export interface EscrowListResponse {
-  total: number;
   items: Escrow[];
+  next_cursor: string | null;
+  total: number | null;
+  total_exact: boolean;
+}
+
+export interface EscrowSummaryResponse {
+  scope: "mine" | "all";
+  total: number;
+  by_status: Partial<Record<EscrowStatus, number>>;
 }
 
 export interface BalanceResponse {
@@ -79,20 +79,17 @@ async function mapWithConcurrency<T, R>(
 }
 
 async function fetchAllMineEscrows(): Promise<Escrow[]> {
-  let offset = 0;
-  let total = Number.POSITIVE_INFINITY;
+  let cursor: string | undefined;
   const results: Escrow[] = [];
 
-  while (offset < total) {
+  do {
     const page = await listEscrows(undefined, "mine", {
       limit: ESCROW_PAGE_SIZE,
-      offset,
+      cursor,
     });
-    total = page.total;
-    if (!page.items.length) break;
     results.push(...page.items);
-    offset += page.items.length;
-  }
+    cursor = page.next_cursor ?? undefined;
+  } while (cursor);
 
   const uniqueById = new Map<string, Escrow>();
   for (const escrow of results) {